@@ -1,5 +1,9 @@
-from dash import Dash, html, dcc, callback, Output, Input
+from dash import Dash, html, dcc, callback, ctx, Output, Input, State
 import pandas as pd
+import json
+import os
+import threading
+import warnings
 from utils.analysis_utils import (
     plot_player_histogram,
     player_historic_linechart,
@@ -7,6 +11,16 @@ from utils.analysis_utils import (
     plot_scatterplot,
     player_summary
 )
+from utils.expected_points import load_points_table
+from utils.feature_extraction import fantasy_points_seasons
+from utils.jobs import DONE, FINAL_STATES, JobQueue
+from utils.league import League
+from utils.league_db import LeagueDB
+from utils.projections import ProjectionEngine
+from utils.risk import BOARDS, draft_board, risk_metrics
+from utils.scraping_utils import scrape_event_results
+from utils.similarity import CompIndex
+from utils.snapshots import dataset_path
 
 # Initialize the Dash app
 app = Dash(__name__)
@@ -41,10 +55,81 @@ CONTAINER_STYLE = {
     'padding': '20px'
 }
 
-# Load the data
-df = pd.read_csv('data/players_crawled_25_updated2.csv')
+# Load the data (a named snapshot with FANTASY_DG_SNAPSHOT, or a CSV path with FANTASY_DG_DATA)
+if os.environ.get('FANTASY_DG_SNAPSHOT'):
+    DATA_PATH = dataset_path(os.environ['FANTASY_DG_SNAPSHOT'])
+else:
+    DATA_PATH = os.environ.get('FANTASY_DG_DATA', 'data/players_crawled_25_updated2.csv')
+df = pd.read_csv(DATA_PATH)
+
+# Per-player results come from the league database when FANTASY_DG_DB is set,
+# otherwise from blobs decoded once into a compact typed League
+db = LeagueDB(os.environ['FANTASY_DG_DB']) if os.environ.get('FANTASY_DG_DB') else League.from_dataframe(df)
 player_list = sorted(df['Player'].unique())
 
+with open(os.environ.get('FANTASY_DG_POINTS_MAP', 'data/points_map_2025.json')) as f:
+    points_map = json.load(f)
+
+# Seasons the dataset has fantasy_points_YY columns for
+seasons = fantasy_points_seasons(df.columns)
+
+# Career-stage comps index, built in a background thread so neither startup nor
+# the first player selection waits for it; the comps card shows a building
+# state until it is ready
+comps_index = None
+comps_error = None
+
+def build_comps_index():
+    """Build the comps index, recording any failure for the comps card."""
+    global comps_index, comps_error
+    try:
+        comps_index = CompIndex(df, seasons, points_map)
+    except Exception as e:
+        comps_error = f"{type(e).__name__}: {e}"
+
+threading.Thread(target=build_comps_index, daemon=True).start()
+
+# Per-event points distributions over the last two seasons, computed once so the
+# draft board only re-sorts when the risk preference changes
+risk = risk_metrics(df, points_map, seasons[-2:])
+BOARD_LABELS = {
+    'avg': "Average",
+    'floor': "Floor (25th percentile)",
+    'ceiling': "Ceiling (75th percentile)",
+    'risk_adjusted': "Risk-adjusted"
+}
+
+# Live rest-of-season projections need the remaining schedule (FANTASY_DG_SCHEDULE)
+engine = None
+if os.environ.get('FANTASY_DG_SCHEDULE'):
+    points_table = load_points_table(
+        os.environ.get('FANTASY_DG_POINTS_TABLE', 'data/points_table.npz'), points_map
+    )
+    engine = ProjectionEngine(df, pd.read_csv(os.environ['FANTASY_DG_SCHEDULE']),
+                              points_table, points_map)
+
+# Heavy analyses run as background jobs in worker processes (started on the
+# first submit), so callbacks only submit and poll them and player browsing is
+# never blocked
+jobs = JobQueue(os.environ.get('FANTASY_DG_JOBS', 'data/jobs'))
+JOB_TASKS = {'sweep': "Decay / season weight sweep"}
+if engine is not None and os.environ.get('FANTASY_DG_ROSTERS'):
+    JOB_TASKS['trades'] = "Rank trades for the remaining schedule"
+
+def job_args(task):
+    """Arguments of a dashboard job; identical arguments share one cached job."""
+    points_map_file = os.environ.get('FANTASY_DG_POINTS_MAP', 'data/points_map_2025.json')
+    if task == 'trades':
+        return {
+            'dataset_csv': DATA_PATH,
+            'rosters_file': os.environ['FANTASY_DG_ROSTERS'],
+            'events': list(engine.remaining['Tier']),
+            'points_map_file': points_map_file,
+            'points_table_file': os.environ.get('FANTASY_DG_POINTS_TABLE', 'data/points_table.npz')
+        }
+    return {'dataset_csv': DATA_PATH, 'target_years': [max(seasons)],
+            'points_map_file': points_map_file}
+
 # Define the app layout
 app.layout = html.Div([
     # Main container
@@ -78,6 +163,60 @@ app.layout = html.Div([
             ], style={**CARD_STYLE, 'flex': '1'})
         ], style={'display': 'flex', 'marginBottom': '30px'}),
         
+        # Rest-of-season projection card
+        html.Div([
+            html.H3("Rest-of-Season Projection", style={'marginTop': '0'}),
+            html.Div(id='projection-summary'),
+            html.Div([
+                dcc.Input(id='event-id', type='number', placeholder='PDGA event id'),
+                dcc.Input(id='event-name', type='text', placeholder='Event name'),
+                dcc.Dropdown(id='event-tier', options=['ES', 'M', 'XM', 'A'], value='ES',
+                             clearable=False, style={'width': '80px'}),
+                dcc.DatePickerSingle(id='event-date'),
+                html.Button("Load results", id='load-event')
+            ], style={'display': 'flex', 'gap': '10px', 'alignItems': 'center', 'marginTop': '10px'}),
+            html.Div(id='load-event-status', style={'marginTop': '8px', 'color': COLORS['secondary']}),
+            dcc.Store(id='projection-version', data=0)
+        ], style=CARD_STYLE),
+        
+        # Similar players card
+        html.Div([
+            html.H3("Similar Players at the Same Career Stage", style={'marginTop': '0'}),
+            html.Div(id='player-comps'),
+            dcc.Interval(id='comps-poll', interval=1000)
+        ], style=CARD_STYLE),
+        
+        # Draft board card
+        html.Div([
+            html.H3("Draft Board", style={'marginTop': '0'}),
+            html.Div([
+                dcc.Dropdown(id='board-type', options=[{'label': BOARD_LABELS[b], 'value': b} for b in BOARDS],
+                             value='risk_adjusted', clearable=False, style={'width': '250px'}),
+                html.Div([
+                    html.Label("Risk aversion (standard deviations)"),
+                    dcc.Slider(id='risk-aversion', min=-1, max=2, step=0.25, value=1,
+                               marks={v: str(v) for v in range(-1, 3)})
+                ], style={'flex': '1'})
+            ], style={'display': 'flex', 'gap': '20px', 'alignItems': 'center'}),
+            html.Div(id='draft-board', style={'marginTop': '10px'})
+        ], style=CARD_STYLE),
+        
+        # Background analysis card
+        html.Div([
+            html.H3("Background Analysis", style={'marginTop': '0'}),
+            html.Div([
+                dcc.Dropdown(id='job-task', options=[{'label': v, 'value': k} for k, v in JOB_TASKS.items()],
+                             value='sweep', clearable=False, style={'width': '350px'}),
+                html.Button("Run", id='run-job'),
+                html.Button("Cancel", id='cancel-job')
+            ], style={'display': 'flex', 'gap': '10px', 'alignItems': 'center'}),
+            html.Progress(id='job-progress', value='0', max='1', style={'width': '100%', 'marginTop': '10px'}),
+            html.Div(id='job-status', style={'marginTop': '8px', 'color': COLORS['secondary']}),
+            html.Div(id='job-result', style={'marginTop': '10px'}),
+            dcc.Store(id='job-id'),
+            dcc.Interval(id='job-poll', interval=1000, disabled=True)
+        ], style=CARD_STYLE),
+        
         # Graphs section
         html.Div([
             html.H3("Player Performance Visualizations", 
@@ -139,8 +278,8 @@ def update_player_analysis(selected_player):
     ])
     
     # Generate visualizations
-    historic_fig = player_historic_linechart(df, selected_player)
-    scoring_fig = player_scoring_linechart(df, selected_player)
+    historic_fig = player_historic_linechart(df, selected_player, db=db)
+    scoring_fig = player_scoring_linechart(df, selected_player, db=db)
     rating_fig = plot_player_histogram(df, 'composite_rating', selected_player, nbins=45)
     
     # Generate scoring summary
@@ -169,5 +308,147 @@ def update_player_analysis(selected_player):
     
     return summary_div, historic_fig, scoring_fig, rating_fig, scoring_div, scatter_fig
 
+@callback(
+    Output('projection-version', 'data'),
+    Output('load-event-status', 'children'),
+    Input('load-event', 'n_clicks'),
+    State('event-id', 'value'),
+    State('event-name', 'value'),
+    State('event-tier', 'value'),
+    State('event-date', 'date'),
+    State('projection-version', 'data'),
+    prevent_initial_call=True
+)
+def load_event_results(n_clicks, event_id, event_name, tier, date, version):
+    if engine is None:
+        return version, "Set FANTASY_DG_SCHEDULE to enable live projections."
+    if not event_id or not event_name or not date:
+        return version, "Enter the event id, name and date."
+    
+    try:
+        results = scrape_event_results(event_id)
+    except Exception as e:
+        return version, f"Could not load results for event {event_id}: {type(e).__name__}: {e}"
+    
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        try:
+            updated = engine.ingest_event(results, event_name, tier, date)
+        except ValueError as e:
+            return version, f"{e}."
+    notes = ''.join(f" Warning: {w.message}." for w in caught)
+    return version + 1, f"{event_name}: updated {updated} players, {len(engine.remaining)} events remaining.{notes}"
+
+@callback(
+    Output('projection-summary', 'children'),
+    Input('player-dropdown', 'value'),
+    Input('projection-version', 'data')
+)
+def update_projection(selected_player, version):
+    if engine is None:
+        return html.P("Set FANTASY_DG_SCHEDULE to enable live projections.")
+    
+    projection = engine.player(selected_player)
+    rating = 'n/a' if projection['rating'] is None else f"{projection['rating']:.1f}"
+    return html.P([
+        f"Decayed Rating: {rating} (round sd {projection['rating_sigma']:.1f})",
+        html.Br(),
+        f"Points to Date: {projection['points_to_date']:.1f}",
+        html.Br(),
+        f"Projected Remaining ({projection['remaining_events']} events): {projection['ros_points']:.1f}",
+        html.Br(),
+        f"Projected Season Total: {projection['season_points']:.1f}"
+    ])
+
+@callback(
+    Output('player-comps', 'children'),
+    Output('comps-poll', 'disabled'),
+    Input('player-dropdown', 'value'),
+    Input('comps-poll', 'n_intervals')
+)
+def update_comps(selected_player, n_intervals):
+    if comps_error is not None:
+        return html.P(f"Could not build the comps index: {comps_error}"), True
+    if comps_index is None:
+        return html.P("Building the comps index..."), False
+    
+    comps = comps_index.query(selected_player, k=5)
+    if comps is None or len(comps) == 0:
+        return html.P("Not enough rating history to find comps."), True
+    
+    columns = ['Player', 'season', 'tenure', 'rating', 'events', 'next_points', 'distance']
+    header = html.Tr([html.Th(c) for c in columns])
+    rows = [
+        html.Tr([html.Td('-' if pd.isna(row[c]) else row[c]) for c in columns])
+        for _, row in comps.iterrows()
+    ]
+    return html.Table([header] + rows, style={'width': '100%'}), True
+
+@callback(
+    Output('draft-board', 'children'),
+    Input('board-type', 'value'),
+    Input('risk-aversion', 'value'),
+    Input('player-dropdown', 'value')
+)
+def update_draft_board(board, risk_aversion, selected_player):
+    ranked = draft_board(risk, board, risk_aversion, min_events=3)
+    shown = ranked.head(25)
+    if selected_player in ranked['Player'].values and selected_player not in shown['Player'].values:
+        shown = pd.concat([shown, ranked[ranked['Player'] == selected_player]])
+    
+    columns = ['rank', 'Player', 'score', 'events', 'avg', 'sd', 'q10', 'q25', 'q75', 'p_top10', 'consistency']
+    header = html.Tr([html.Th(c) for c in columns])
+    rows = [
+        html.Tr([html.Td('-' if pd.isna(row[c]) else row[c]) for c in columns],
+                style={'fontWeight': 'bold'} if row['Player'] == selected_player else None)
+        for _, row in shown.round(2).iterrows()
+    ]
+    return html.Table([header] + rows, style={'width': '100%'})
+
+@callback(
+    Output('job-id', 'data'),
+    Input('run-job', 'n_clicks'),
+    Input('cancel-job', 'n_clicks'),
+    State('job-task', 'value'),
+    State('job-id', 'data'),
+    prevent_initial_call=True
+)
+def control_job(run_clicks, cancel_clicks, task, job_id):
+    if ctx.triggered_id == 'cancel-job':
+        if job_id:
+            jobs.cancel(job_id)
+        return job_id
+    return jobs.submit(task, **job_args(task))
+
+@callback(
+    Output('job-progress', 'value'),
+    Output('job-status', 'children'),
+    Output('job-result', 'children'),
+    Output('job-poll', 'disabled'),
+    Input('job-poll', 'n_intervals'),
+    Input('job-id', 'data'),
+    prevent_initial_call=True
+)
+def poll_job(n_intervals, job_id):
+    status = jobs.status(job_id) if job_id else None
+    if status is None:
+        return '0', "No job running.", None, True
+    
+    label = JOB_TASKS.get(status['task'], status['task'])
+    text = f"{label}: {status['state']} - {status.get('message', '')} ({status['progress']:.0%})"
+    if status['state'] not in FINAL_STATES:
+        return str(status['progress']), text, None, False
+    if status['state'] != DONE:
+        return str(status['progress']), text, None, True
+    
+    result = jobs.result(job_id).head(10).round(3)
+    columns = list(result.columns)
+    header = html.Tr([html.Th(c) for c in columns])
+    rows = [
+        html.Tr([html.Td('-' if pd.isna(row[c]) else row[c]) for c in columns])
+        for _, row in result.iterrows()
+    ]
+    return '1', text, html.Table([header] + rows, style={'width': '100%'}), True
+
 if __name__ == '__main__':
     app.run(debug=True)
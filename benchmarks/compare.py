@@ -0,0 +1,38 @@
+import argparse
+import json
+
+def load_results(path):
+    """Index a benchmark report's results by (players, stage)."""
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r['players'], r['stage']): r for r in report['results']}
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline', help='JSON results from the baseline commit')
+    parser.add_argument('candidate', help='JSON results from the candidate commit')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                      help='Slowdown ratio reported as a regression')
+
+    args = parser.parse_args()
+
+    base_report, base = load_results(args.baseline)
+    cand_report, cand = load_results(args.candidate)
+    print(f"baseline  {base_report['commit']}\ncandidate {cand_report['commit']}\n")
+    print(f"{'players':>7} {'stage':<26} {'base s':>10} {'cand s':>10} {'ratio':>7} {'mem ratio':>9}")
+
+    regressions = 0
+    for key in sorted(set(base) & set(cand)):
+        b, c = base[key], cand[key]
+        ratio = c['seconds'] / b['seconds'] if b['seconds'] else float('nan')
+        mem_ratio = (c['peak_bytes'] / b['peak_bytes']
+                     if b.get('peak_bytes') and c.get('peak_bytes') else float('nan'))
+        flag = ' <-- regression' if ratio > args.threshold else ''
+        regressions += bool(flag)
+        print(f"{key[0]:>7} {key[1]:<26} {b['seconds']:10.4f} {c['seconds']:10.4f} "
+              f"{ratio:7.2f} {mem_ratio:9.2f}{flag}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_generation import PARALLEL_MIN_PLAYERS, fantasy_points_matrix, parallel_fantasy_points
+from utils.feature_extraction import calculate_fantasy_points
+from .synthetic import generate_league
+
+def timed(fn):
+    """Run fn and return (seconds, result)."""
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def reference_points(stats_data, points_map, years):
+    """Fantasy points with the per-player pandas path calculate_features used before the array kernel."""
+    return np.array([[calculate_fantasy_points(blob, points_map, y) for y in years] for blob in stats_data],
+                    dtype=np.float64)
+
+def tiled_league(dataset, n_players):
+    """A league of n_players repeating a scraped dataset's players, so blobs have real sizes."""
+    repeats = -(-n_players // len(dataset))
+    return pd.concat([dataset] * repeats, ignore_index=True).head(n_players)
+
+def scaling(df, points_map, years, worker_counts, reference=True):
+    """
+    Time fantasy points for one league: the pandas reference, the serial
+    array kernel and a process pool of each size.
+
+    Pools are timed through parallel_fantasy_points directly, bypassing the
+    PARALLEL_MIN_PLAYERS threshold, so the table shows where it pays off.
+
+    Returns:
+        DataFrame with 'players', 'path', 'workers', 'seconds', 'speedup'
+        (over the serial kernel) and 'identical' (to the serial kernel)
+    """
+    stats_data = df['stats_data'].tolist()
+    serial_time, serial = timed(lambda: fantasy_points_matrix(stats_data, points_map, years))
+    rows = [{'path': 'kernel', 'workers': None, 'seconds': serial_time, 'identical': True}]
+    if reference:
+        seconds, points = timed(lambda: reference_points(stats_data, points_map, years))
+        rows.insert(0, {'path': 'pandas', 'workers': None, 'seconds': seconds,
+                        'identical': np.array_equal(points, serial)})
+    for workers in worker_counts:
+        seconds, points = timed(lambda: parallel_fantasy_points(stats_data, points_map, years, workers))
+        rows.append({'path': 'pool', 'workers': workers, 'seconds': seconds,
+                     'identical': np.array_equal(points, serial)})
+
+    table = pd.DataFrame(rows)
+    table.insert(0, 'players', len(df))
+    table['speedup'] = (serial_time / table['seconds']).round(2)
+    table['seconds'] = table['seconds'].round(3)
+    table['workers'] = table['workers'].astype('Int64')
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fantasy point computation from 1 to N cores')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[400, 2000, 10000],
+                      help='League sizes to benchmark')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(),
+                      help='Largest worker count to benchmark')
+    parser.add_argument('--years', nargs='+', type=int, default=[2022, 2023, 2024],
+                      help='Years to calculate points for')
+    parser.add_argument('--skip-reference', action='store_true',
+                      help='Skip the slow per-player pandas path')
+    parser.add_argument('--dataset', type=str,
+                      help='Tile this scraped dataset to each size instead of generating a '
+                           'synthetic league (real players have far longer result histories)')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    dataset = pd.read_csv(args.dataset) if args.dataset else None
+    tables = []
+    for n_players in args.sizes:
+        if dataset is not None:
+            df = tiled_league(dataset, n_players)
+        else:
+            # Round-trip through CSV so blobs are strings, as in a scraped dataset
+            buffer = io.StringIO()
+            generate_league(n_players, years=args.years).to_csv(buffer, index=False)
+            buffer.seek(0)
+            df = pd.read_csv(buffer)
+        tables.append(scaling(df, points_map, args.years, worker_counts,
+                              reference=not args.skip_reference))
+
+    print(pd.concat(tables, ignore_index=True).to_string(index=False))
+    print(f"calculate_features uses a pool for --workers > 1 and at least {PARALLEL_MIN_PLAYERS} players "
+          f"({os.cpu_count()} CPUs here)")
+
+if __name__ == '__main__':
+    main()
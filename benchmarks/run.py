@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis_utils import (
+    player_historic_linechart,
+    player_scoring_linechart,
+    player_summary,
+    plot_player_histogram,
+    plot_scatterplot,
+    ratings_composite
+)
+from utils.dataset_generation import parallel_fantasy_points
+from utils.feature_extraction import calculate_fantasy_points, calculate_composite_scores
+from utils.league import League
+from .synthetic import FIELD_SIZE, generate_league
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+def git_commit():
+    """Return the current git commit hash, or None outside a repository."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(fn, calls=1):
+    """
+    Time a stage and track its peak traced memory.
+
+    Args:
+        fn: Zero-argument callable to run
+        calls: Number of calls fn performs, used for per-call timing
+
+    Returns:
+        Dictionary with 'seconds', 'calls', 'per_call_seconds' and 'peak_bytes'
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': elapsed,
+        'calls': calls,
+        'per_call_seconds': elapsed / calls if calls else None,
+        'peak_bytes': peak
+    }
+
+def load_league(n_players, points_map, data_dir, seed, field_size=FIELD_SIZE):
+    """Generate a synthetic league, caching it as CSV in data_dir."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'league_{n_players}_{seed}_f{field_size}.csv')
+    if not os.path.exists(path):
+        generate_league(n_players, points_map=points_map, seed=seed,
+                        field_size=field_size).to_csv(path, index=False)
+
+    return path, pd.read_csv(path)
+
+def player_analysis(df, db, name):
+    """The work of the dashboard's player analysis callback, without Dash."""
+    return (
+        player_summary(df, 'composite_rating', name),
+        player_historic_linechart(df, name, db=db),
+        player_scoring_linechart(df, name, db=db),
+        plot_player_histogram(df, 'composite_rating', name, nbins=45),
+        player_summary(df, 'fantasy_points_24', name),
+        plot_scatterplot(df, col_x='fantasy_points_24', col_y='composite_rating',
+                         player_name=name, x_reference=50)
+    )
+
+def benchmark_size(n_players, points_map, args):
+    """
+    Run every benchmark stage against one synthetic league.
+
+    Per-player stages (calculate_fantasy_points, ratings_composite,
+    player_summary and player_analysis) are timed over a fixed random sample
+    of players; league-wide stages run over every player.
+
+    Returns:
+        List of result dictionaries, one per stage
+    """
+    results = []
+
+    def record(stage, fn, calls=1):
+        result = {'players': n_players, 'stage': stage, **measure(fn, calls)}
+        results.append(result)
+        print(f"{n_players:>7} {stage:<26} {result['seconds']:10.4f}s "
+              f"{result['peak_bytes'] / 1e6:10.1f} MB")
+
+    start = time.perf_counter()
+    _, df = load_league(n_players, points_map, args.data_dir, args.seed, args.field_size)
+    results.append({'players': n_players, 'stage': 'load_league',
+                    'seconds': time.perf_counter() - start, 'calls': 1,
+                    'per_call_seconds': None, 'peak_bytes': None})
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(n_players, size=min(args.sample, n_players), replace=False)
+    sample_names = df['Player'].iloc[sample].tolist()
+    year = args.years[-1]
+
+    record('calculate_fantasy_points',
+           lambda: [calculate_fantasy_points(df['stats_data'].iloc[i], points_map, year) for i in sample],
+           calls=len(sample))
+    record('parallel_fantasy_points',
+           lambda: parallel_fantasy_points(df['stats_data'], points_map, args.years, args.workers))
+    record('calculate_composite_scores',
+           lambda: calculate_composite_scores(df[['fantasy_points_23', 'fantasy_points_24']].copy()))
+    record('ratings_composite',
+           lambda: [ratings_composite(df, name) for name in sample_names],
+           calls=len(sample))
+    record('player_summary',
+           lambda: [player_summary(df, 'composite_fp', name) for name in sample_names],
+           calls=len(sample))
+
+    # Functions behind the dashboard callback, against the League the app builds
+    db = League.from_dataframe(df)
+    callback_names = sample_names[:args.callback_sample]
+    record('player_analysis',
+           lambda: [player_analysis(df, db, name) for name in callback_names],
+           calls=len(callback_names))
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the fantasy pipeline on synthetic leagues')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                      help='League sizes to benchmark')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--years', nargs='+', type=int, default=[2022, 2023, 2024],
+                      help='Seasons to generate and score')
+    parser.add_argument('--sample', type=int, default=50,
+                      help='Players sampled for per-player stages')
+    parser.add_argument('--callback-sample', type=int, default=5,
+                      help='Players sampled for player_analysis (the dashboard callback)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Worker processes for parallel_fantasy_points')
+    parser.add_argument('--field-size', type=int, default=FIELD_SIZE,
+                      help='Typical entrants per synthetic event')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--data-dir', default='benchmarks/data',
+                      help='Directory for cached synthetic leagues')
+    parser.add_argument('--output', help='Path for the JSON results '
+                      '(defaults to benchmarks/results/<commit>.json)')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    commit = git_commit()
+    results = []
+    for n_players in args.sizes:
+        results.extend(benchmark_size(n_players, points_map, args))
+
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results
+    }
+
+    output = args.output or os.path.join('benchmarks', 'results', f'{commit or "local"}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}")
+
+if __name__ == '__main__':
+    main()
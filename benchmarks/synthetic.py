@@ -0,0 +1,149 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.feature_extraction import points_vector
+
+# Events per season by tier, roughly matching a DGPT calendar
+SEASON_TIERS = ['ES'] * 16 + ['M'] * 4 + ['XM'] + ['A'] * 7
+ROUNDS_BY_TIER = {'ES': 3, 'M': 4, 'XM': 4, 'A': 3}
+
+# Entrants per event, roughly a DGPT MPO field
+FIELD_SIZE = 150
+# Rating points per e-fold of a player's odds of entering an event
+FIELD_RATING_SCALE = 6
+
+def build_schedule(years, seed=0):
+    """
+    Build a synthetic event calendar.
+
+    Args:
+        years: List of seasons
+        seed: Random seed
+
+    Returns:
+        DataFrame with one row per event: 'Tournament', 'Tier', 'Date', 'Rounds'
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for year in years:
+        tiers = rng.permutation(SEASON_TIERS)
+        # Weekly events from late February through October
+        dates = pd.date_range(f'{year}-02-25', periods=len(tiers), freq='7D')
+        for k, (tier, date) in enumerate(zip(tiers, dates)):
+            rows.append({
+                'Tournament': f'Synthetic {tier} Event {year}-{k + 1:02d}',
+                'Tier': tier,
+                'Date': date.strftime('%Y-%m-%d'),
+                'Rounds': ROUNDS_BY_TIER[tier]
+            })
+    return pd.DataFrame(rows)
+
+def generate_league(n_players, years=(2022, 2023, 2024), points_map=None, seed=0,
+                    field_size=FIELD_SIZE):
+    """
+    Generate a synthetic league with the same columns and blob shapes as a
+    scraped dataset such as data/players_25_crawled_sample.csv.
+
+    Each player has a latent rating mean and spread and an activity level.
+    Every event draws a field of about field_size entrants (capped at the
+    league size) without replacement, weighted toward higher rated and more
+    active players, so large leagues look like the PDGA: a touring core plays
+    most events and most players play few or none. Places are ranks of
+    simulated event scores among entrants and round ratings are drawn around
+    the player's mean.
+
+    Args:
+        n_players: Number of players
+        years: Seasons to generate results for
+        points_map: Optional place-to-points mapping used to fill the
+            fantasy_points_YY and composite columns
+        seed: Random seed
+        field_size: Typical entrants per event
+
+    Returns:
+        DataFrame with scalar player columns and JSON-encoded
+        stats_data/ratings_data blobs
+    """
+    rng = np.random.default_rng(seed)
+    schedule = build_schedule(years, seed)
+    n_events = len(schedule)
+
+    mu = rng.normal(975, 25, n_players)
+    sigma = rng.uniform(15, 30, n_players)
+    attend_p = rng.beta(6, 4, n_players)
+
+    # Draw each event's field by weighted sampling without replacement
+    # (Gumbel top-k), then place entrants by simulated event score
+    log_weight = np.log(attend_p) + (mu - mu.max()) / FIELD_RATING_SCALE
+    rounds = schedule['Rounds'].to_numpy()
+    attended = np.zeros((n_players, n_events), dtype=bool)
+    place = np.zeros((n_players, n_events), dtype=np.int32)
+    for e in range(n_events):
+        size = min(n_players, max(1, int(rng.normal(field_size, field_size / 10))))
+        keys = log_weight + rng.gumbel(size=n_players)
+        field = np.argpartition(-keys, size - 1)[:size]
+        score = mu[field] + sigma[field] / np.sqrt(rounds[e]) * rng.standard_normal(size)
+        attended[field, e] = True
+        place[field[np.argsort(-score)], e] = np.arange(1, size + 1)
+
+    players, events = np.nonzero(attended)
+    offsets = np.searchsorted(players, np.arange(n_players + 1))
+
+    tiers = schedule['Tier'].to_numpy()
+    dates = schedule['Date'].to_numpy()
+    names = schedule['Tournament'].to_numpy()
+
+    stats_blobs, ratings_blobs = [], []
+    for i in range(n_players):
+        ev = events[offsets[i]:offsets[i + 1]]
+        stats_blobs.append(json.dumps([{
+            'Place': place[i, ev].astype(str).tolist(),
+            'Tier': tiers[ev].tolist(),
+            'Date': dates[ev].tolist(),
+            'Tournament': names[ev].tolist()
+        }]))
+
+        round_ev = np.repeat(ev, rounds[ev])
+        round_no = np.concatenate([np.arange(1, r + 1) for r in rounds[ev]]) if len(ev) else np.array([], dtype=int)
+        ratings = np.round(mu[i] + sigma[i] * rng.standard_normal(len(round_ev))).astype(int)
+        # PDGA ratings pages list the most recent rounds first
+        ratings_blobs.append(json.dumps([{
+            'Rating': ratings[::-1].astype(str).tolist(),
+            'Date': dates[round_ev][::-1].tolist(),
+            'Tournament': names[round_ev][::-1].tolist(),
+            'Tier': tiers[round_ev][::-1].tolist(),
+            'Round': round_no[::-1].astype(str).tolist()
+        }]))
+
+    df = pd.DataFrame({
+        'Player': [f'Synthetic Player {i:06d}' for i in range(n_players)],
+        'pdga_number': np.arange(100000, 100000 + n_players),
+        'career_events': attended.sum(axis=1) + rng.integers(0, 150, n_players),
+        'join_date': rng.integers(2000, min(years), n_players),
+        'rating_current': np.round(mu),
+        'career_wins': rng.poisson(2, n_players),
+        'career_earnings': np.round(rng.exponential(20000, n_players), 2),
+        'world_rank': np.nan,
+        'stats_data': stats_blobs,
+        'ratings_data': ratings_blobs
+    })
+
+    if points_map is not None:
+        points_vec = points_vector(points_map, n_players + 2)
+        multiplier = np.select([np.isin(tiers, ['M', 'XM']), tiers == 'ES'], [1.5, 1.0], 0.0)
+        event_points = np.where(attended, points_vec[place] * multiplier[None, :], 0.0)
+        season = pd.to_datetime(schedule['Date']).dt.year.to_numpy()
+        for year in years:
+            df[f'fantasy_points_{str(year)[-2:]}'] = event_points[:, season == year].sum(axis=1)
+
+        recent = [f'fantasy_points_{str(year)[-2:]}' for year in sorted(years)[-2:]]
+        df['composite_fp'] = 0.65 * df[recent[-1]] + 0.35 * df[recent[0]]
+        df['composite_percentile'] = np.round(
+            df['composite_fp'].rank(pct=True, method='average') * 100, 1
+        )
+        df['frac_calvin'] = df['composite_fp'] / 3464
+        df['composite_rating'] = np.round(mu + rng.normal(0, 3, n_players), 1)
+
+    return df
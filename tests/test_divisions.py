@@ -0,0 +1,35 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import DATA_DIR
+from utils.divisions import CURRENT_ONLY_COLUMNS, crawl_divisions, load_config, season_dataset
+
+def test_season_dataset_uses_nothing_after_the_season():
+    sample = pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+    df = season_dataset(sample, 2023)
+
+    assert not set(CURRENT_ONLY_COLUMNS) & set(df.columns)
+    for column in ['stats_data', 'ratings_data']:
+        dates = [d for blob in df[column] for d in json.loads(blob)[0]['Date']]
+        assert dates and max(dates) <= '2023-12-31'
+
+    # rating_current is recomputed from 2023's rounds rather than today's rating
+    assert df['rating_current'].notna().all()
+    assert not np.array_equal(df['rating_current'].to_numpy(), sample['rating_current'].to_numpy(dtype=float))
+
+def test_empty_roster_gives_an_empty_frame(tmp_path):
+    roster = tmp_path / 'fpo.csv'
+    pd.DataFrame(columns=['Player', 'pdga_number']).to_csv(roster, index=False)
+    config_path = tmp_path / 'league.json'
+    config_path.write_text(json.dumps({
+        'seasons': [2023, 2024],
+        'rules': {'points_map': os.path.join(DATA_DIR, 'points_map_2025.json')},
+        'divisions': {'FPO': {'players_csv': str(roster)}}
+    }))
+    scraped = crawl_divisions(load_config(str(config_path)))
+    df = scraped['FPO']
+    assert len(df) == 0
+    assert {'Player', 'pdga_number', 'rating_current', 'stats_data', 'ratings_data'} <= set(df.columns)
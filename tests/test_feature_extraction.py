@@ -0,0 +1,24 @@
+import json
+
+from utils.feature_extraction import (
+    MISSING_YEAR,
+    fantasy_points_from_arrays,
+    fantasy_points_seasons,
+    points_vector,
+    stats_to_arrays
+)
+
+def test_fantasy_points_seasons_parses_only_two_digit_years():
+    columns = ['Player', 'fantasy_points_24', 'fantasy_points_total', 'fantasy_points_2024',
+               'fantasy_points_23_adj', 'fantasy_points_22']
+    assert fantasy_points_seasons(columns) == [2022, 2024]
+    assert fantasy_points_seasons(['Player']) == []
+
+def test_stats_to_arrays_skips_missing_dates():
+    # NaN is written as a bare NaN token, as json.dumps does for float('nan')
+    blob = json.dumps([{'Place': ['1', '2', '1'], 'Tier': ['ES', 'ES', 'M'],
+                        'Date': ['2024-04-01', None, float('nan')], 'Tournament': ['A', 'B', 'C']}])
+    place, multiplier, year = stats_to_arrays(blob)
+    assert list(year) == [2024, MISSING_YEAR, MISSING_YEAR]
+    points = fantasy_points_from_arrays(place, multiplier, year, points_vector({'1': 100, '2': 85}), [2024])
+    assert list(points) == [100.0]
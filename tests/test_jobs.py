@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+from conftest import DATA_DIR
+from utils.jobs import FAILED, JobQueue, JobStore
+
+def _hammer(root, job_id, field, n):
+    store = JobStore(root)
+    for k in range(n):
+        store.update(job_id, **{field: k})
+
+def test_concurrent_updates_keep_every_field(tmp_path):
+    root = str(tmp_path)
+    store = JobStore(root)
+    store.write_status('job', {'id': 'job'})
+    processes = [multiprocessing.Process(target=_hammer, args=(root, 'job', f'field{i}', 200))
+                 for i in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    status = store.status('job')
+    assert all(status.get(f'field{i}') == 199 for i in range(4))
+
+def test_pool_starts_on_first_submit(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs'), workers=1)
+    assert queue.executor is None
+    assert not os.path.exists(tmp_path / 'jobs') and queue.store.jobs() == []
+    try:
+        job_id = queue.submit('sweep', dataset_csv=str(tmp_path / 'missing.csv'), target_years=[2024],
+                              points_map_file=os.path.join(DATA_DIR, 'points_map_2025.json'))
+        assert queue.executor is not None
+        queue.futures[job_id].result(timeout=60)
+        assert queue.status(job_id)['state'] == FAILED
+    finally:
+        queue.shutdown()
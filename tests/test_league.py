@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.league import MISSING, League
+from utils.league_db import LeagueDB, load_into_db
+
+def blob(**columns):
+    return json.dumps(columns)
+
+@pytest.fixture
+def league_df():
+    return pd.DataFrame({
+        'Player': ['Ace', 'Birdie'],
+        'pdga_number': [2001, 1001],
+        'rating_current': [1030, 990],
+        'stats_data': [
+            blob(Place=['1', 'DNS', '12', 'DQ'], Tier=['ES', 'M', 'ES', 'A'],
+                 Date=['2024-03-01', '2024-04-01', '2024-05-01', '2024-06-01'],
+                 Tournament=['Open A', 'Major B', 'Open C', 'Open D']),
+            blob(Place=['3', 'DNF', '40'], Tier=['ES', 'ES', 'M'],
+                 Date=['2023-03-01', '2023-07-01', '2024-04-01'],
+                 Tournament=['Open A', 'Open C', 'Major B'])
+        ],
+        'ratings_data': [
+            blob(Rating=['1040', '1012', '1025'], Date=['2024-03-01', '2024-03-02', '2024-05-01'],
+                 Tier=['ES', 'ES', 'ES'], Tournament=['Open A', 'Open A', 'Open C'], Round=['1', '2', '1']),
+            blob(Rating=['985'], Date=['2024-04-01'], Tier=['M'], Tournament=['Major B'], Round=['3'])
+        ]
+    })
+
+@pytest.fixture
+def db(league_df, tmp_path):
+    path = str(tmp_path / 'league.db')
+    load_into_db(league_df, path)
+    db = LeagueDB(path)
+    yield db
+    db.close()
+
+def assert_same(league_frame, db_frame):
+    pd.testing.assert_frame_equal(league_frame.astype(object), db_frame.astype(object), check_dtype=False)
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'tiers': ['M']},
+    {'since': '2024-01-01'},
+    {'until': '2024-04-30'},
+    {'max_place': 12},
+    {'min_rating': 1000},
+    {'players': ['Birdie']}
+])
+def test_results_and_ratings_match_league_db(league_df, db, filters):
+    league = League.from_dataframe(league_df)
+    assert_same(league.results(**filters), db.results(**filters))
+    assert_same(league.ratings(**filters), db.ratings(**filters))
+
+def test_non_numeric_places_keep_their_code(league_df):
+    results = League.from_dataframe(league_df).results()
+    assert set(results['Place']) >= {'DNS', 'DQ', 'DNF'}
+    assert results.loc[results['Place'].isin(['DNS', 'DQ', 'DNF']), 'place'].isna().all()
+
+def test_save_load_round_trip(league_df, tmp_path):
+    league = League.from_dataframe(league_df)
+    path = str(tmp_path / 'league.npz')
+    league.save(path)
+    loaded = League.load(path)
+    pd.testing.assert_frame_equal(loaded.results(), league.results())
+    pd.testing.assert_frame_equal(loaded.ratings(), league.ratings())
+
+def test_missing_dates_and_rounds_are_masked(league_df):
+    league_df.loc[0, 'stats_data'] = blob(Place=['5'], Tier=['ES'], Date=[None], Tournament=['Open A'])
+    league_df.loc[0, 'ratings_data'] = blob(Rating=['1000'], Date=['2024-03-01'], Tier=['ES'],
+                                            Tournament=['Open A'], Round=[None])
+    league = League.from_dataframe(league_df)
+    assert league.round_arrays['round'].dtype == np.int16
+    assert (league.round_arrays['round'] == MISSING).any()
+
+    results = league.results(players=['Ace'])
+    assert results['Date'].tolist() == [None]
+    assert league.results(players=['Ace'], until='2030-01-01').empty
+    assert league.ratings(players=['Ace'])['Round'].tolist() == [None]
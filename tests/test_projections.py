@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.projections import ProjectionEngine
+
+POINTS_MAP = {'1': 100, '2': 85, '3': 75}
+
+def blob(**columns):
+    return json.dumps([columns])
+
+@pytest.fixture
+def engine():
+    df = pd.DataFrame({
+        'Player': ['Ace', 'Birdie'],
+        'pdga_number': [1, 2],
+        'stats_data': [blob(Place=['1'], Tier=['ES'], Date=['2025-03-01'], Tournament=['Open A']),
+                       blob(Place=['2'], Tier=['ES'], Date=['2025-03-01'], Tournament=['Open A'])],
+        'ratings_data': [blob(Rating=['1040', '1030'], Date=['2025-03-01', '2025-03-02'], Tier=['ES', 'ES']),
+                         blob(Rating=['1000', '1010'], Date=['2025-03-01', '2025-03-02'], Tier=['ES', 'ES'])]
+    })
+    schedule = pd.DataFrame({'Tournament': ['DGPT - Discraft Ledgestone Open', 'Open C'], 'Tier': ['ES', 'ES']})
+    mu, sigma = np.arange(900.0, 1100.0, 10.0), np.arange(5.0, 50.0, 5.0)
+    table = {'mu': mu, 'sigma': sigma, 'points': np.tile((mu - 900.0)[:, None] / 2, (1, len(sigma)))}
+    return ProjectionEngine(df, schedule, table, POINTS_MAP, season=2025)
+
+def results(*rows):
+    return pd.DataFrame(rows, columns=['PDGA#', 'Place', 'rating_1'])
+
+def test_scheduled_event_counts_once(engine):
+    field = results(('1', '2', '1050'), ('2', '1', '1020'))
+    assert engine.ingest_event(field, "DGPT+ Discraft's Ledgestone Open presented by GRIPeq", 'ES', '2025-08-01') == 2
+    assert engine.player('Birdie')['points_to_date'] == 85 + 100
+    assert engine.player('Ace')['remaining_events'] == 1
+
+    # The same event under its schedule name is recognized as already ingested
+    assert engine.ingest_event(field, 'DGPT - Discraft Ledgestone Open', 'ES', '2025-08-01') == 0
+    assert engine.player('Birdie')['points_to_date'] == 185
+
+@pytest.mark.parametrize('event, date', [
+    ('Open A', '2025-03-01'),                   # already in the scraped blobs, not scheduled
+    ('Discraft Ledgestone Open', '2024-08-01')  # a past edition of a scheduled event
+])
+def test_unscheduled_or_out_of_season_events_are_rejected(engine, event, date):
+    before = engine.projections()
+    with pytest.raises(ValueError, match='not ingested'):
+        engine.ingest_event(results(('1', '1', '1100')), event, 'ES', date)
+    pd.testing.assert_frame_equal(engine.projections(), before)
+    assert len(engine.remaining) == 2
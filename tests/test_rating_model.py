@@ -0,0 +1,53 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import DATA_DIR
+from utils.rating_model import (
+    FALLBACK_MU,
+    FALLBACK_SIGMA2,
+    FALLBACK_TAU2,
+    fit_rating_model,
+    posterior_draws
+)
+
+def test_single_round_players_use_fallback_prior():
+    df = pd.DataFrame({'ratings_data': [
+        json.dumps({'Rating': [str(r)], 'Date': ['2024-05-01'], 'Tier': ['ES']}) for r in (1000, 1020, 980)
+    ]})
+    fit = fit_rating_model(df)
+    assert fit['prior']['sigma2_scale'] == FALLBACK_SIGMA2
+    assert np.isfinite(fit['mu_mean']).all()
+    assert np.isfinite(fit['sigma_mean']).all()
+
+def ratings(*players):
+    """Frame of players with the given round ratings (all on one date)."""
+    return pd.DataFrame({'ratings_data': [
+        json.dumps({'Rating': [str(r) for r in rounds], 'Date': ['2024-05-01'] * len(rounds),
+                    'Tier': ['ES'] * len(rounds)}) for rounds in players
+    ]})
+
+def test_no_observed_players_use_fixed_prior():
+    fit = fit_rating_model(ratings([], []))
+    assert fit['prior']['mu_mean'] == FALLBACK_MU
+    assert fit['prior']['mu_var'] == FALLBACK_TAU2
+    assert np.allclose(fit['mu_mean'], FALLBACK_MU)
+    assert np.allclose(fit['mu_var'], FALLBACK_TAU2)
+
+def test_one_observed_player_uses_fixed_prior_variance():
+    fit = fit_rating_model(ratings([1000, 1020, 1010], []))
+    assert fit['prior']['mu_mean'] == 1010
+    assert fit['prior']['mu_var'] == FALLBACK_TAU2
+    assert np.isfinite(fit['mu_mean']).all() and np.isfinite(fit['mu_var']).all()
+    assert 1000 < fit['mu_mean'][0] < 1020
+
+def test_sigma_mean_is_posterior_mean_of_sigma():
+    df = pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+    fit = fit_rating_model(df)
+    _, sigma = posterior_draws(fit, n_draws=20000, seed=0)
+    assert np.allclose(sigma.mean(axis=1), fit['sigma_mean'], rtol=0.01)
+    # Below the root of the posterior mean of sigma^2
+    sigma2_post = fit['sigma2_scale'] * fit['sigma2_df'] / (fit['sigma2_df'] - 2)
+    assert (fit['sigma_mean'] < np.sqrt(sigma2_post)).all()
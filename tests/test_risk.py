@@ -0,0 +1,47 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+from utils.risk import QUANTILES, draft_board, group_quantiles, risk_metrics
+
+def test_group_quantiles_matches_np_quantile():
+    rng = np.random.default_rng(0)
+    n_players = 30
+    # Players with no, one and many values, in shuffled order with ties
+    player = rng.integers(0, n_players - 3, 500)
+    values = np.round(rng.exponential(10, len(player)))
+    player = np.concatenate([player, [n_players - 2]])
+    values = np.concatenate([values, [7.0]])
+
+    result = group_quantiles(player, values, n_players)
+    for i in range(n_players):
+        mine = values[player == i]
+        if len(mine):
+            assert np.allclose(result[i], np.quantile(mine, QUANTILES))
+        else:
+            assert np.isnan(result[i]).all()
+
+def test_group_quantiles_empty():
+    result = group_quantiles(np.array([], dtype=int), np.array([]), 3)
+    assert result.shape == (3, len(QUANTILES)) and np.isnan(result).all()
+
+@pytest.fixture(scope='module')
+def metrics():
+    sample = pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+    with open(os.path.join(DATA_DIR, 'points_map_2025.json')) as f:
+        points_map = json.load(f)
+    return risk_metrics(sample, points_map, [2023, 2024])
+
+def test_draft_boards_rank_by_their_statistic(metrics):
+    floor = draft_board(metrics, 'floor', min_events=3)
+    scored = floor['score'].notna()
+    assert scored.sum() == (metrics['events'] >= 3).sum()
+    assert floor.loc[scored, 'score'].is_monotonic_decreasing
+    assert np.allclose(floor.loc[scored, 'score'],
+                       (floor['q25'] * floor['events_per_season'])[scored].round(1))
+    with pytest.raises(ValueError):
+        draft_board(metrics, 'median')
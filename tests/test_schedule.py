@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+from utils.feature_extraction import parse_player_data
+from utils.schedule import ScheduleProjections, event_key, matching_keys
+
+@pytest.fixture(scope='module')
+def sample():
+    return pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+
+@pytest.fixture(scope='module')
+def points_map():
+    with open(os.path.join(DATA_DIR, 'points_map_2025.json')) as f:
+        return json.load(f)
+
+@pytest.fixture
+def projections(sample, points_map):
+    return ScheduleProjections(sample, points_map, [2022, 2023, 2024])
+
+def calendar(*events):
+    return pd.DataFrame([{'event_id': i, 'Tournament': name, 'Tier': tier}
+                         for i, (name, tier) in enumerate(events)])
+
+@pytest.mark.parametrize('a, b', [
+    ("DGPT+ Discraft's Ledgestone Open presented by GRIPeq", 'DGPT - Discraft Ledgestone Open'),
+    ("DGPT - Discraft's Great Lakes Open", 'DGPT+ Discraft Great Lakes Open presented by Gerrit J Verburg'),
+    ('DGPT - Las Vegas Challenge presented by Innova', 'Las Vegas Challenge presented by Innova'),
+    ('DGPT - The Preserve Championship connected by Microsoft Teams',
+     'DGPT - The Preserve Championship designed by Leiviska Disc Golf'),
+    ('DGPT Elite+ 2023 Portland Open presented by Latitude 64', 'DGPT+ 2024 Portland Open presented by Latitude64'),
+    ('DGPT+ Prodigy presents WACO', 'DGPT - Prodigy presents WACO'),
+    ('Disc Golf Pro Tour Championship presented by Barbasol', 'DGPT Championship presented by Barbasol'),
+])
+def test_editions_of_real_tournaments_share_a_key(a, b):
+    assert event_key(a) == event_key(b)
+
+def test_different_tournaments_keep_different_keys():
+    assert event_key('DGPT - Discraft Ledgestone Open') != event_key('DGPT - Discraft Great Lakes Open')
+    assert event_key('DGPT Championship presented by Barbasol') != event_key('DGPT - The Preserve Championship')
+
+def test_calendar_names_match_past_editions(sample):
+    names = {name for blob in sample['stats_data'] for name in parse_player_data(blob)['Tournament']}
+    keys = sorted({event_key(name) for name in names})
+    assert matching_keys('Las Vegas Challenge', keys) == ['las vegas challenge']
+    assert len(matching_keys('Green Mountain Championship', keys)) == 2
+    assert matching_keys('Jonesboro Open', keys)
+    assert matching_keys('Des Moines Challenge', keys)
+    assert matching_keys('Brand New Open', keys) == []
+
+def test_attendance_uses_past_editions(projections):
+    with pytest.warns(UserWarning, match='Brand New Open'):
+        projections.update(calendar(('Las Vegas Challenge', 'ES'), ('Brand New Open', 'ES')))
+    assert projections.unmatched == ['Brand New Open']
+    played, new = projections.attendance.T
+    # Players who played past editions differ from the tier-rate fallback
+    assert not np.allclose(played, new)
+
+def test_update_only_computes_new_events(projections, sample, points_map):
+    first = calendar(('Las Vegas Challenge', 'ES'), ('Champions Cup', 'M'), ('European Open', 'ES'))
+    assert projections.update(first)['added'] == 3
+    cached = dict(projections.columns)
+
+    changed = pd.concat([first.iloc[[0, 2]], calendar(('Music City Open', 'ES')).assign(event_id=9)])
+    changes = projections.update(changed)
+    assert (changes['added'], changes['removed'], changes['kept']) == (1, 1, 2)
+    for event, column in projections.columns.items():
+        if event in cached:
+            assert column is cached[event]
+
+    fresh = ScheduleProjections(sample, points_map, [2022, 2023, 2024])
+    fresh.update(changed)
+    np.testing.assert_allclose(projections.matrix, fresh.matrix)
+    np.testing.assert_allclose(projections.matrix,
+                               projections.attendance * projections.rate[:, None] * [1.0, 1.0, 1.0])
+
+def test_major_events_carry_the_multiplier(projections):
+    projections.update(calendar(('Champions Cup', 'M')))
+    np.testing.assert_allclose(projections.matrix[:, 0], projections.attendance[:, 0] * projections.rate * 1.5)
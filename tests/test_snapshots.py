@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from utils.snapshots import SnapshotManager, dataset_path, hash_source
+
+@pytest.mark.parametrize('name', ['objects', 'stages', '', '../elsewhere', 'a/b'])
+def test_reserved_snapshot_names_are_rejected(tmp_path, name):
+    with pytest.raises(ValueError):
+        SnapshotManager(str(tmp_path)).write_snapshot(name, {})
+
+def test_reading_a_missing_snapshot_creates_nothing(tmp_path):
+    root = tmp_path / 'snapshots'
+    with pytest.raises(FileNotFoundError):
+        dataset_path('latest', str(root))
+    assert not root.exists()
+
+def test_source_hash_tracks_code():
+    def f():
+        return 1
+
+    def g():
+        return 2
+
+    assert hash_source(f) == hash_source(f)
+    assert hash_source(f) != hash_source(g)
@@ -0,0 +1,44 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+from utils.sweeps import _centered_ranks, check_settings, run_sweep, score
+
+@pytest.fixture(scope='module')
+def sample():
+    return pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+
+@pytest.fixture(scope='module')
+def points_map():
+    with open(os.path.join(DATA_DIR, 'points_map_2025.json')) as f:
+        return json.load(f)
+
+def test_constant_predictions_score_zero():
+    target = _centered_ranks(np.array([3.0, 1.0, 2.0, 5.0]))
+    assert score(np.full(4, 7.0), target) == 0
+    assert score(np.array([1.0, 2.0, 3.0, 4.0]), _centered_ranks(np.zeros(4))) == 0
+
+    boot = np.array([[0, 0, 0, 0], [0, 1, 2, 3]])
+    resampled = score(np.array([1.0, 2.0, 3.0, 4.0]), _centered_ranks(np.zeros(4)[boot]), boot)
+    assert np.array_equal(resampled, [0, 0])
+
+def test_empty_year1_weights_leaves_season_family_out(sample, points_map):
+    results = run_sweep(sample, points_map, [2024], decay_rates=[0.1], windows=[3],
+                        year1_weights=[], n_boot=20)
+    assert list(results['family']) == ['rating']
+    assert results['year1_weight'].isna().all()
+    assert results['spearman'].notna().all()
+
+@pytest.mark.parametrize('decay_rates, windows, year1_weights', [
+    ([], [], []),
+    ([-0.1], [3], []),
+    ([0.1], [0], []),
+    ([], [], [1.5])
+])
+def test_check_settings_rejects_invalid(decay_rates, windows, year1_weights):
+    with pytest.raises(ValueError):
+        check_settings(decay_rates, windows, year1_weights)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from utils.trades import TradeEvaluator
+
+STARTERS = 3
+
+def lineup_total(projections, rows, starters=STARTERS):
+    """Brute-force season total: best starters per event from a full sort."""
+    values = np.sort(projections[list(rows)], axis=0)[::-1]
+    return values[:starters].sum()
+
+@pytest.fixture
+def league():
+    rng = np.random.default_rng(0)
+    players = [f'P{i}' for i in range(20)]
+    # Exponential projections with zeros, so ties and empty events occur
+    projections = rng.exponential(5, (len(players), 12)) * (rng.random((len(players), 12)) < 0.7)
+    rosters = {'A': players[:7], 'B': players[7:14], 'C': players[14:18]}
+    return projections, rosters, players
+
+def rows_of(players, names):
+    return [players.index(n) for n in names]
+
+def test_evaluate_matches_rescoring(league):
+    projections, rosters, players = league
+    evaluator = TradeEvaluator(projections, rosters, players, starters=STARTERS)
+    for give_a, give_b in [(['P0'], ['P7']), (['P1', 'P2'], ['P8']), (['P3'], ['P9', 'P10'])]:
+        after_a = [p for p in rosters['A'] if p not in give_a] + give_b
+        after_b = [p for p in rosters['B'] if p not in give_b] + give_a
+        before_a = lineup_total(projections, rows_of(players, rosters['A']))
+        before_b = lineup_total(projections, rows_of(players, rosters['B']))
+        result = evaluator.evaluate('A', give_a, 'B', give_b)
+        assert result['delta_a'] == pytest.approx(lineup_total(projections, rows_of(players, after_a)) - before_a)
+        assert result['delta_b'] == pytest.approx(lineup_total(projections, rows_of(players, after_b)) - before_b)
+
+def test_rank_trades_matches_rescoring(league):
+    projections, rosters, players = league
+    trades = TradeEvaluator(projections, rosters, players, starters=STARTERS).rank_trades()
+    # 1-for-1 once per pair of teams, 2-for-1 in both directions
+    sizes = {t: len(r) for t, r in rosters.items()}
+    pairs = [('A', 'B'), ('A', 'C'), ('B', 'C')]
+    expected = sum(sizes[a] * sizes[b] + (sizes[a] * (sizes[a] - 1) // 2) * sizes[b]
+                   + sizes[a] * (sizes[b] * (sizes[b] - 1) // 2) for a, b in pairs)
+    assert len(trades) == expected
+
+    for trade in trades.sample(60, random_state=0).itertuples():
+        give_a, give_b = trade.gives_a.split(' + '), trade.gives_b.split(' + ')
+        after_a = [p for p in rosters[trade.team_a] if p not in give_a] + give_b
+        before_a = lineup_total(projections, rows_of(players, rosters[trade.team_a]))
+        assert trade.delta_a == pytest.approx(lineup_total(projections, rows_of(players, after_a)) - before_a)
+    assert trades['mutual'].is_monotonic_decreasing
+
+def test_apply_trade_and_update_player_refresh_cache(league):
+    projections, rosters, players = league
+    evaluator = TradeEvaluator(projections, rosters, players, starters=STARTERS)
+    evaluator.apply_trade('A', ['P0', 'P1'], 'C', ['P14'])
+    fresh = TradeEvaluator(projections, {
+        'A': [p for p in rosters['A'] if p not in ('P0', 'P1')] + ['P14'],
+        'B': rosters['B'],
+        'C': [p for p in rosters['C'] if p != 'P14'] + ['P0', 'P1']
+    }, players, starters=STARTERS)
+    assert evaluator.totals == pytest.approx(fresh.totals)
+
+    evaluator.update_player('P7', np.full(projections.shape[1], 100.0))
+    rows_b = rows_of(players, rosters['B'])
+    assert evaluator.totals['B'] == pytest.approx(lineup_total(evaluator.projections, rows_b))
+    assert evaluator.totals['A'] == pytest.approx(fresh.totals['A'])
+    # The caller's projections are not modified
+    assert not (projections[players.index('P7')] == 100.0).all()
@@ -0,0 +1,104 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+from utils.validation import check_quarantined, run_validation, validate_scraped
+
+def player(pdga_number, results=None, rounds=None, **fields):
+    """Scraped row with blobs in the scraper's serialized format."""
+    results = results if results is not None else [('5', 'ES', '2024-04-01', 'Open A')]
+    rounds = rounds if rounds is not None else [('1010', '2024-04-01', 'Open A', 'ES', '1')]
+    stats = {col: list(values) for col, values in zip(['Place', 'Tier', 'Date', 'Tournament'], zip(*results))}
+    ratings = {col: list(values) for col, values in zip(['Rating', 'Date', 'Tournament', 'Tier', 'Round'], zip(*rounds))}
+    return {'Player': f'Player {pdga_number}', 'pdga_number': pdga_number, 'rating_current': 1000,
+            'stats_data': json.dumps([stats]), 'ratings_data': json.dumps([ratings]), **fields}
+
+def checks(issues, pdga_number):
+    return set(issues.loc[issues['pdga_number'] == pdga_number, 'check'])
+
+def test_clean_player_passes():
+    clean, quarantined, issues = validate_scraped(pd.DataFrame([player(1)]), [2024], today='2025-01-01')
+    assert len(clean) == 1 and len(quarantined) == 0 and len(issues) == 0
+
+def test_results_outside_years_are_a_warning():
+    df = pd.DataFrame([player(1, results=[('5', 'ES', '2022-04-01', 'Open A'), ('3', 'M', '2024-05-01', 'Open B')])])
+    clean, quarantined, issues = validate_scraped(df, [2023, 2024], today='2025-01-01')
+    assert len(clean) == 1
+    assert checks(issues, 1) == {'result_outside_years'}
+    assert set(issues['severity']) == {'warning'}
+
+def test_player_without_results_is_kept():
+    df = pd.DataFrame([player(1, results=[]), player(2)])
+    df.loc[0, 'stats_data'] = json.dumps([{}])
+    clean, quarantined, issues = validate_scraped(df, [2024], today='2025-01-01')
+    assert list(clean['pdga_number']) == [1, 2]
+    assert checks(issues, 1) == {'no_results'}
+
+@pytest.mark.parametrize('row, check', [
+    (player(1, results=[('fifth', 'ES', '2024-04-01', 'Open A')]), 'unparsed_place'),
+    (player(1, results=[('5', 'ZZ', '2024-04-01', 'Open A')]), 'invalid_tier'),
+    (player(1, results=[('5', 'ES', '2024-13-01', 'Open A')]), 'invalid_date'),
+    (player(1, rounds=[('1500', '2024-04-01', 'Open A', 'ES', '1')]), 'rating_out_of_bounds'),
+    (player(1, rounds=[('1010', '2026-04-01', 'Open A', 'ES', '1')]), 'date_out_of_range'),
+    (player(1, stats_data='{not a blob'), 'unparsed_blob'),
+    (player(1, results=[('5', 'ES', '2024-04-01', 'Open A')] * 2), 'duplicate_event'),
+])
+def test_errors_quarantine_the_player(row, check):
+    clean, quarantined, issues = validate_scraped(pd.DataFrame([row, player(2)]), [2024], today='2025-01-01')
+    assert list(quarantined['pdga_number']) == [1]
+    assert list(clean['pdga_number']) == [2]
+    assert check in checks(issues, 1)
+
+def test_duplicate_rows_quarantine_only_the_repeat():
+    clean, quarantined, _ = validate_scraped(pd.DataFrame([player(1), player(1)]), [2024], today='2025-01-01')
+    assert len(clean) == 1 and len(quarantined) == 1
+
+def test_run_fails_when_most_players_are_quarantined(tmp_path):
+    df = pd.DataFrame([player(1, rating_current=5000), player(2, rating_current=5000), player(3)])
+    with pytest.raises(ValueError, match='quarantined 2 of 3'):
+        run_validation(df, [2024], str(tmp_path / 'out.csv'))
+    # The report is still written for inspection
+    assert (tmp_path / 'out.quarantine.csv').exists()
+    clean, _, _ = run_validation(df, [2024], max_quarantined=None)
+    assert len(clean) == 1
+
+def test_check_quarantined_allows_a_minority():
+    check_quarantined(5, 10)
+    with pytest.raises(ValueError):
+        check_quarantined(6, 10)
+
+def test_sample_scrape_with_a_narrower_year_range_keeps_everyone():
+    df = pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+    clean, quarantined, issues = validate_scraped(df, [2023, 2024])
+    assert len(quarantined) == 0 and len(clean) == len(df)
+    assert 'result_outside_years' in set(issues['check'])
+
+def _chunked_run(tmp_path, n_bad):
+    from utils.dataset_generation import generate_player_dataset_chunked
+    # Six players: copies of the two sample players under new PDGA numbers
+    sample = pd.read_csv(os.path.join(DATA_DIR, 'players_25_crawled_sample.csv'))
+    df = pd.concat([sample] * 3, ignore_index=True)
+    df['pdga_number'] = range(1, len(df) + 1)
+    df['Player'] = [f'Player {n}' for n in df['pdga_number']]
+    df.loc[:n_bad - 1, 'rating_current'] = 5000
+    scraped = tmp_path / 'scraped.csv'
+    df.to_csv(scraped, index=False)
+    with open(os.path.join(DATA_DIR, 'points_map_2025.json')) as f:
+        points_map = json.load(f)
+    return generate_player_dataset_chunked(str(scraped), str(tmp_path / 'parts'), [2023, 2024], points_map,
+                                           chunk_size=1, scraped=True)
+
+def test_chunked_run_checks_the_quarantine_share_across_all_chunks(tmp_path):
+    # One bad player is the whole of its one-player chunk, but a sixth of the run
+    parts = _chunked_run(tmp_path, n_bad=1)
+    assert len(parts) == 6
+    assert sum(len(pd.read_csv(p)) for p in parts) == 5
+
+def test_chunked_run_fails_once_most_players_are_quarantined(tmp_path):
+    with pytest.raises(ValueError, match='quarantined 4 of 6'):
+        _chunked_run(tmp_path, n_bad=4)
+    # Every partition was written before the check
+    assert len(list((tmp_path / 'parts').glob('part-*.csv'))) == 6
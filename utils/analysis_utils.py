@@ -10,7 +10,8 @@ import numpy as np
 from scipy import stats
 from datetime import datetime
 
-def ratings_composite(df: pd.DataFrame, player_name: str, decay_rate=0.1, ref_date=None):
+def ratings_composite(df: pd.DataFrame, player_name: str, decay_rate=0.1, ref_date=None, db=None,
+                      window_years=3):
     """
     Calculate a composite rating from a player's ratings history using exponential time decay.
     
@@ -19,44 +20,56 @@ def ratings_composite(df: pd.DataFrame, player_name: str, decay_rate=0.1, ref_da
         player_name: Name of the player to analyze
         decay_rate: Controls how quickly older ratings decay (higher = faster decay)
         ref_date: Reference date for calculating time differences (defaults to most recent tournament)
+        db: Optional LeagueDB or League to read ratings from instead of the ratings_data blob
+        window_years: Ignore tournaments more than this many years before ref_date
         
     Returns:
         float: Composite rating weighted by recency
     """
-    # Get player's ratings data
-    player_row = df[df['Player'] == player_name].iloc[0]
-    ratings_data = player_row['ratings_data']
+    valid_tiers = ['A', 'ES', 'M', 'XM']
     
-    # Handle JSON decoding
-    if isinstance(ratings_data, str):
-        import json
-        try:
-            # First try to safely evaluate as a Python literal
-            import ast
+    if db is not None:
+        # Push tier and date filters down to the database
+        since = None
+        if ref_date is not None:
+            since = pd.to_datetime(ref_date) - pd.Timedelta(days=window_years * 365.25)
+        ratings = db.ratings(players=[player_name], tiers=valid_tiers, since=since)
+        ratings_data = ratings[['Rating', 'Date', 'Tier']].to_dict(orient='list')
+    else:
+        # Get player's ratings data
+        player_row = df[df['Player'] == player_name].iloc[0]
+        ratings_data = player_row['ratings_data']
+    
+        # Handle JSON decoding
+        if isinstance(ratings_data, str):
+            import json
             try:
-                python_obj = ast.literal_eval(ratings_data)
-                ratings_data = json.dumps(python_obj)
-            except:
-                # If literal_eval fails, fall back to manual cleaning
-                ratings_data = ratings_data.replace('\\"', '"').replace("\\'", "'")
-                ratings_data = ratings_data.replace("'", '"')
-                ratings_data = re.sub(r'"([^"]+)"s\s', r'"\1\'s ', ratings_data)
+                # First try to safely evaluate as a Python literal
+                import ast
+                try:
+                    python_obj = ast.literal_eval(ratings_data)
+                    ratings_data = json.dumps(python_obj)
+                except:
+                    # If literal_eval fails, fall back to manual cleaning
+                    ratings_data = ratings_data.replace('\\"', '"').replace("\\'", "'")
+                    ratings_data = ratings_data.replace("'", '"')
+                    ratings_data = re.sub(r'"([^"]+)"s\s', r'"\1\'s ', ratings_data)
                 
-                # Fix standard JSON values
-                ratings_data = (ratings_data.replace('True', 'true')
-                             .replace('False', 'false')
-                             .replace('None', 'null')
-                             .replace('},]', '}]')
-                             .replace(',}', '}')
-                             .strip())
+                    # Fix standard JSON values
+                    ratings_data = (ratings_data.replace('True', 'true')
+                                 .replace('False', 'false')
+                                 .replace('None', 'null')
+                                 .replace('},]', '}]')
+                                 .replace(',}', '}')
+                                 .strip())
             
-            ratings_data = json.loads(ratings_data)
-        except Exception as e:
-            print(f"Error processing ratings data for {player_name}: {e}")
-            return None
+                ratings_data = json.loads(ratings_data)
+            except Exception as e:
+                print(f"Error processing ratings data for {player_name}: {e}")
+                return None
             
-    if isinstance(ratings_data, list):
-        ratings_data = ratings_data[0]
+        if isinstance(ratings_data, list):
+            ratings_data = ratings_data[0]
         
     # Create DataFrame
     df = pd.DataFrame({
@@ -70,7 +83,6 @@ def ratings_composite(df: pd.DataFrame, player_name: str, decay_rate=0.1, ref_da
     df['Date'] = pd.to_datetime(df['Date'])
     
     # Filter for relevant tiers
-    valid_tiers = ['A', 'ES', 'M', 'XM']
     df = df[df['Tier'].isin(valid_tiers)]
     
     if len(df) == 0:
@@ -91,8 +103,8 @@ def ratings_composite(df: pd.DataFrame, player_name: str, decay_rate=0.1, ref_da
     # Calculate weights with exponential decay
     df['weight'] = np.exp(-decay_rate * df['years_ago'])
     
-    # Zero out weights for tournaments more than 3 years old
-    df.loc[df['years_ago'] > 3, 'weight'] = 0
+    # Zero out weights for tournaments outside the window
+    df.loc[df['years_ago'] > window_years, 'weight'] = 0
     
     # Calculate weighted average
     if df['weight'].sum() > 0:
@@ -159,17 +171,21 @@ def plot_histogram(df: pd.DataFrame, column: str, annotate_top_n: dict = None, n
     
     fig.show()
     
-def player_historic_linechart(df, player_name):
+def player_stats_frame(df, player_name, db=None):
     """
-    Create an interactive line chart showing a player's historical tournament performance.
+    Get a player's tournament results as a DataFrame.
     
     Args:
         df: DataFrame containing player data
-        player_name: Player name to filter and use in chart title
+        player_name: Player name to look up
+        db: Optional LeagueDB or League to query instead of decoding the stats_data blob
         
     Returns:
-        Plotly Figure object with the line chart
+        DataFrame with Place, Tier, Date and Tournament columns, or None on decoding errors
     """
+    if db is not None:
+        return db.results(players=[player_name])[['Place', 'Tier', 'Date', 'Tournament']]
+
     # Get player's stats data
     player_row = df[df['Player'] == player_name].iloc[0]
     stats_data = player_row['stats_data']
@@ -226,6 +242,24 @@ def player_historic_linechart(df, player_name):
         print(f"Error creating DataFrame: {e}")
         return None
         
+    return stats_df
+
+def player_historic_linechart(df, player_name, db=None):
+    """
+    Create an interactive line chart showing a player's historical tournament performance.
+    
+    Args:
+        df: DataFrame containing player data
+        player_name: Player name to filter and use in chart title
+        db: Optional LeagueDB or League to read results from instead of the stats_data blob
+        
+    Returns:
+        Plotly Figure object with the line chart
+    """
+    stats_df = player_stats_frame(df, player_name, db=db)
+    if stats_df is None:
+        return None
+        
     # Convert dates and sort chronologically
     stats_df['Date'] = pd.to_datetime(stats_df['Date'])
     stats_df = stats_df.sort_values('Date')
@@ -330,7 +364,17 @@ def player_summary(df: pd.DataFrame, column: str, player_name: str):
         'rank': f"{rank}/{total}"
     }
 
-def plot_player_histogram(df: pd.DataFrame, column: str, player_name: str, nbins: int = None):
+def histogram_base(df: pd.DataFrame, column: str, nbins: int = None):
+    """
+    League-wide histogram of a column, without any player annotation.
+    
+    Build it once and pass it as base_fig to plot_player_histogram when
+    rendering many players.
+    """
+    return px.histogram(df, x=column, nbins=nbins, title=f"Histogram of {column}")
+
+def plot_player_histogram(df: pd.DataFrame, column: str, player_name: str, nbins: int = None,
+                          base_fig=None):
     """
     Plots a histogram for the given column and annotates the specified player's value.
     
@@ -339,6 +383,8 @@ def plot_player_histogram(df: pd.DataFrame, column: str, player_name: str, nbins
       column (str): The column to plot in the histogram.
       player_name (str): Name of the player to annotate.
       nbins (int, optional): Number of bins to use in the histogram.
+      base_fig (go.Figure, optional): Prebuilt histogram_base figure to copy
+        instead of rebuilding the league-wide histogram.
     """
     # Check if the main column exists in the DataFrame
     if column not in df.columns:
@@ -355,7 +401,7 @@ def plot_player_histogram(df: pd.DataFrame, column: str, player_name: str, nbins
     summary = player_summary(df, column, player_name)
     
     # Create the histogram
-    fig = px.histogram(df, x=column, nbins=nbins, title=f"Histogram of {column}")
+    fig = go.Figure(base_fig) if base_fig is not None else histogram_base(df, column, nbins)
     
     # Determine annotation y-position
     if fig.data and fig.data[0].y:
@@ -384,30 +430,15 @@ def plot_player_histogram(df: pd.DataFrame, column: str, player_name: str, nbins
 import ast
 import re
 
-def plot_scatterplot(df: pd.DataFrame, col_x: str, col_y: str, color_col: str = None, 
-                    player_name: str = None, x_reference: float = None, y_reference: float = None):
+def scatterplot_base(df: pd.DataFrame, col_x: str, col_y: str, color_col: str = None,
+                     highlight: bool = False, x_reference: float = None, y_reference: float = None):
     """
-    Create an interactive scatter plot comparing two columns, with optional coloring and reference lines.
+    League-wide scatter plot with optional reference lines, without a highlighted player.
     
-    Args:
-        df: DataFrame containing player data
-        col_x: Column name for x-axis
-        col_y: Column name for y-axis
-        color_col: Optional column name for point colors
-        player_name: Optional player name to highlight
-        x_reference: Optional percentile (0-100) to draw reference line on x-axis
-        y_reference: Optional percentile (0-100) to draw reference line on y-axis
-        
-    Returns:
-        Plotly Figure object with the scatter plot
+    Build it once (with highlight=True to dim the league points) and pass it as
+    base_fig to plot_scatterplot when rendering many players. Arguments are as
+    in plot_scatterplot.
     """
-    # Validate columns exist
-    for col in [col_x, col_y]:
-        if col not in df.columns:
-            raise ValueError(f"Column '{col}' not found in DataFrame")
-    if color_col and color_col not in df.columns:
-        raise ValueError(f"Color column '{color_col}' not found in DataFrame")
-            
     # Create hover text
     hover_data = {'Player': True}
     for col in [col_x, col_y]:
@@ -428,35 +459,9 @@ def plot_scatterplot(df: pd.DataFrame, col_x: str, col_y: str, color_col: str =
             col_y: col_y.replace('_', ' ').title(),
             color_col: color_col.replace('_', ' ').title() if color_col else None
         },
-        opacity=0.6 if player_name else 1.0  # Reduce opacity if highlighting a player
+        opacity=0.6 if highlight else 1.0  # Reduce opacity if highlighting a player
     )
     
-    # Add highlighted point for specified player
-    if player_name:
-        player_data = df[df['Player'] == player_name]
-        if len(player_data) > 0:
-            hover_dict = {col: player_data[col].iloc[0] for col in hover_data.keys()}
-            fig.add_trace(
-                go.Scatter(
-                    x=[player_data[col_x].iloc[0]],
-                    y=[player_data[col_y].iloc[0]],
-                    mode='markers',
-                    marker=dict(
-                        size=12,
-                        color='red',
-                        line=dict(color='black', width=1)
-                    ),
-                    name=player_name,
-                    hovertemplate=(
-                        f"<b>{player_name}</b><br>" +
-                        f"{col_x}: {hover_dict[col_x]:.2f}<br>" +
-                        f"{col_y}: {hover_dict[col_y]:.2f}<br>" +
-                        (f"{color_col}: {hover_dict[color_col]:.2f}" if color_col else "") +
-                        "<extra></extra>"
-                    )
-                )
-            )
-    
     # Add reference lines if specified
     if x_reference is not None:
         x_value = np.percentile(df[col_x], x_reference)
@@ -496,7 +501,69 @@ def plot_scatterplot(df: pd.DataFrame, col_x: str, col_y: str, color_col: str =
     
     return fig
 
-def player_scoring_linechart(df, player_name, points_map_file='data/points_map_2025.json'):
+def plot_scatterplot(df: pd.DataFrame, col_x: str, col_y: str, color_col: str = None, 
+                    player_name: str = None, x_reference: float = None, y_reference: float = None,
+                    base_fig=None):
+    """
+    Create an interactive scatter plot comparing two columns, with optional coloring and reference lines.
+    
+    Args:
+        df: DataFrame containing player data
+        col_x: Column name for x-axis
+        col_y: Column name for y-axis
+        color_col: Optional column name for point colors
+        player_name: Optional player name to highlight
+        x_reference: Optional percentile (0-100) to draw reference line on x-axis
+        y_reference: Optional percentile (0-100) to draw reference line on y-axis
+        base_fig: Optional prebuilt scatterplot_base figure to copy instead of
+            rebuilding the league-wide points and reference lines
+        
+    Returns:
+        Plotly Figure object with the scatter plot
+    """
+    # Validate columns exist
+    for col in [col_x, col_y]:
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found in DataFrame")
+    if color_col and color_col not in df.columns:
+        raise ValueError(f"Color column '{color_col}' not found in DataFrame")
+    
+    if base_fig is not None:
+        fig = go.Figure(base_fig)
+    else:
+        fig = scatterplot_base(df, col_x, col_y, color_col, highlight=player_name is not None,
+                               x_reference=x_reference, y_reference=y_reference)
+    
+    # Add highlighted point for specified player
+    if player_name:
+        player_data = df[df['Player'] == player_name]
+        if len(player_data) > 0:
+            hover_cols = [col_x, col_y] + ([color_col] if color_col else [])
+            hover_dict = {col: player_data[col].iloc[0] for col in hover_cols}
+            fig.add_trace(
+                go.Scatter(
+                    x=[player_data[col_x].iloc[0]],
+                    y=[player_data[col_y].iloc[0]],
+                    mode='markers',
+                    marker=dict(
+                        size=12,
+                        color='red',
+                        line=dict(color='black', width=1)
+                    ),
+                    name=player_name,
+                    hovertemplate=(
+                        f"<b>{player_name}</b><br>" +
+                        f"{col_x}: {hover_dict[col_x]:.2f}<br>" +
+                        f"{col_y}: {hover_dict[col_y]:.2f}<br>" +
+                        (f"{color_col}: {hover_dict[color_col]:.2f}" if color_col else "") +
+                        "<extra></extra>"
+                    )
+                )
+            )
+    
+    return fig
+
+def player_scoring_linechart(df, player_name, points_map_file='data/points_map_2025.json', db=None):
     """
     Create an interactive line chart showing a player's fantasy points per tournament.
     
@@ -504,50 +571,17 @@ def player_scoring_linechart(df, player_name, points_map_file='data/points_map_2
         df: DataFrame containing player data
         player_name: Player name to filter and use in chart title
         points_map_file: Path to JSON file containing points mapping
+        db: Optional LeagueDB or League to read results from instead of the stats_data blob
         
     Returns:
         Plotly Figure object with the line chart
     """
-    # Get player's stats data
-    player_row = df[df['Player'] == player_name].iloc[0]
-    stats_data = player_row['stats_data']
-    
     # Load points mapping
     with open(points_map_file) as f:
         points_map = json.load(f)
     
-    # Handle JSON decoding
-    if isinstance(stats_data, str):
-        try:
-            # First try to safely evaluate as a Python literal
-            try:
-                python_obj = ast.literal_eval(stats_data)
-                stats_data = json.dumps(python_obj)
-            except:
-                # If literal_eval fails, fall back to manual cleaning
-                stats_data = stats_data.replace('\\"', '"').replace("\\'", "'")
-                stats_data = stats_data.replace("'", '"')
-                stats_data = re.sub(r'"([^"]+)"s\s', r'"\1\'s ', stats_data)
-                stats_data = (stats_data.replace('True', 'true')
-                             .replace('False', 'false')
-                             .replace('None', 'null')
-                             .replace('},]', '}]')
-                             .replace(',}', '}')
-                             .strip())
-            
-            stats_data = json.loads(stats_data)
-        except Exception as e:
-            print(f"Error preprocessing JSON string: {e}")
-            return None
-            
-    # Convert stats to DataFrame
-    try:
-        if isinstance(stats_data, list):
-            stats_df = pd.DataFrame(stats_data[0])
-        else:
-            stats_df = pd.DataFrame(stats_data)
-    except Exception as e:
-        print(f"Error creating DataFrame: {e}")
+    stats_df = player_stats_frame(df, player_name, db=db)
+    if stats_df is None:
         return None
         
     # Convert dates and sort chronologically
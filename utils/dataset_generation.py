@@ -1,14 +1,33 @@
 import pandas as pd
+import numpy as np
 import os
+from scipy import stats
 from tqdm import tqdm
-import time
 import argparse
+import ast
+import inspect
 import json
-from .scraping_utils import get_player_career_stats, scrape_player_stats
+from concurrent.futures import ProcessPoolExecutor
+from . import feature_extraction
+from . import instrumentation
+from . import scraping_utils
+from . import validation
+from .scraping_utils import (
+    get_player_career_stats,
+    scrape_player_stats,
+    throttle,
+    set_base_url,
+    set_request_delay
+)
+from .league_db import load_into_db, update_player_column
+from .validation import MAX_QUARANTINED_SHARE, check_quarantined, run_validation
+from .snapshots import SnapshotManager, PageHasher, check_snapshot_name, hash_file, hash_json, hash_source
 from .feature_extraction import (
-    extract_numbers,
-    calculate_fantasy_points,
-    calculate_composite_scores
+    clean_career_stats,
+    calculate_composite_scores,
+    points_vector,
+    stats_to_arrays,
+    fantasy_points_from_arrays
 )
 
 import json
@@ -26,35 +45,129 @@ def scrape_player_data(input_csv, stats_years):
     """
     # Read player list
     players_df = pd.read_csv(input_csv)
+    return scrape_players(players_df, stats_years)
+
+def scrape_players(players_df, stats_years):
+    """
+    Scrape PDGA data for the players in a DataFrame.
     
+    Args:
+        players_df: DataFrame with a 'pdga_number' column
+        stats_years: List of years to scrape stats for
+        
+    Returns:
+        DataFrame with scraped player data
+    """
     # Get career stats
     for index, row in tqdm(players_df.iterrows(), total=players_df.shape[0]):
-        stats = get_player_career_stats(player_pdga=row['pdga_number'])
+        with instrumentation.stage('scrape_career_stats'):
+            stats = get_player_career_stats(player_pdga=row['pdga_number'])
         for key, value in stats.items():
             players_df.at[index, key] = value
-        time.sleep(1.5)
+        throttle()
         
     # Clean numeric columns
-    numeric_cols = ['career_events', 'join_date', 'rating_current', 
-                   'career_wins', 'career_earnings', 'world_rank']
-    for col in numeric_cols:
-        raw_col = f'{col}_raw'
-        players_df[col] = players_df[raw_col].apply(extract_numbers)
-        players_df = players_df.drop(columns=[raw_col])
+    with instrumentation.stage('clean_numeric'):
+        players_df, clean_report = clean_career_stats(players_df)
+    unparsed = clean_report[clean_report['reason'] == 'unparsed']
+    instrumentation.count('career_stats_missing', int((clean_report['reason'] == 'missing').sum()))
+    instrumentation.count('career_stats_unparsed', len(unparsed))
+    if len(unparsed):
+        print(f"{len(unparsed)} career stat values failed to parse")
+        instrumentation.get_report().info.setdefault('career_stats_unparsed', []).extend(
+            unparsed.astype(str).to_dict(orient='records')
+        )
         
     # Get detailed stats and ratings
     for index, row in tqdm(players_df.iterrows(), total=players_df.shape[0]):
-        stats, ratings = scrape_player_stats(
-            pdga_number=row['pdga_number'],
-            years_list=stats_years
-        )
+        with instrumentation.stage('scrape_player_stats'):
+            stats, ratings = scrape_player_stats(
+                pdga_number=row['pdga_number'],
+                years_list=stats_years
+            )
         players_df.at[index, 'stats_data'] = [stats.to_dict(orient='list')]
         players_df.at[index, 'ratings_data'] = [ratings.to_dict(orient='list')]
-        time.sleep(1.5)
+        instrumentation.count('results_rows_scraped', len(stats))
+        instrumentation.count('ratings_rows_scraped', len(ratings))
+        throttle()
         
+    instrumentation.count('players_scraped', len(players_df))
     return players_df
 
-def calculate_features(df, points_map, stats_years):
+# Smallest league worth a process pool. A scraped player's blob takes about
+# 0.75 ms to decode and score, and a one-worker pool runs within ~10% of the
+# serial kernel from a few hundred players up, so from here the serial work
+# (~0.4 s) is large enough for extra cores to pay for the pool's startup
+# (benchmarks/parallel_scaling.py --dataset)
+PARALLEL_MIN_PLAYERS = 500
+
+def _fantasy_points_shard(args):
+    """Fantasy points per year for a shard of stats blobs, with the array kernel."""
+    blobs, points_vec, years, rules = args
+    points = np.zeros((len(blobs), len(years)))
+    for i, blob in enumerate(blobs):
+        points[i] = fantasy_points_from_arrays(*stats_to_arrays(blob, rules), points_vec, years)
+    return points
+
+def fantasy_points_matrix(stats_data, points_map, stats_years, workers=None, rules=None):
+    """
+    Calculate fantasy points per year for every player with the array kernel.
+    
+    Runs in this process unless more than one worker is requested and the
+    league has at least PARALLEL_MIN_PLAYERS players.
+    
+    Args:
+        stats_data: Sequence of stats blobs, one per player
+        points_map: Dictionary mapping places to point values
+        stats_years: List of years to total points for
+        workers: Number of worker processes (None = serial)
+        rules: League rules (defaults to feature_extraction.DEFAULT_RULES)
+        
+    Returns:
+        numpy array of shape (n_players, n_years)
+    """
+    if workers is not None and workers > 1 and len(stats_data) >= PARALLEL_MIN_PLAYERS:
+        return parallel_fantasy_points(stats_data, points_map, stats_years, workers, rules)
+    years = [int(y) for y in stats_years]
+    return _fantasy_points_shard((list(stats_data), points_vector(points_map), years, rules))
+
+def parallel_fantasy_points(stats_data, points_map, stats_years, workers, rules=None):
+    """
+    Calculate fantasy points per year for every player across a process pool.
+    
+    Players are split into contiguous shards; each worker receives the raw
+    stats blobs (as JSON strings) plus the points array, decodes them and
+    returns a float array. Blobs are sent undecoded because decoding is most
+    of the work: converting them to arrays first would run it serially in
+    this process. Shards are merged in their original order, so results do
+    not depend on scheduling. fantasy_points_matrix decides when a pool is
+    worth starting.
+    
+    Args:
+        stats_data: Sequence of stats blobs, one per player
+        points_map: Dictionary mapping places to point values
+        stats_years: List of years to total points for
+        workers: Number of worker processes
+        rules: League rules (defaults to feature_extraction.DEFAULT_RULES)
+        
+    Returns:
+        numpy array of shape (n_players, n_years)
+    """
+    blobs = [x if isinstance(x, str) else json.dumps(x, default=str) for x in stats_data]
+    points_vec = points_vector(points_map)
+    years = [int(y) for y in stats_years]
+
+    # A few shards per worker keeps the pool busy when blob sizes vary
+    n_shards = min(len(blobs), workers * 4) or 1
+    bounds = np.linspace(0, len(blobs), n_shards + 1).astype(int)
+    shards = [(blobs[lo:hi], points_vec, years, rules) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_fantasy_points_shard, shards))
+
+    return np.concatenate(results) if results else np.zeros((0, len(years)))
+
+def calculate_features(df, points_map, stats_years, workers=None, rules=None, season=None):
     """
     Calculate fantasy features from scraped player data.
     
@@ -62,30 +175,101 @@ def calculate_features(df, points_map, stats_years):
         df: DataFrame with scraped player data
         points_map: Dictionary mapping places to point values
         stats_years: List of years used in scraping
+        workers: Number of worker processes for fantasy points (None = serial;
+            see fantasy_points_matrix for when a pool is used)
+        rules: League rules (defaults to feature_extraction.DEFAULT_RULES)
+        season: Most recent season of the composite score (defaults to
+            calculate_composite_scores' default)
         
     Returns:
         DataFrame with calculated features
     """
-    # Parse JSON strings back into Python objects if needed
+    with instrumentation.stage('features'):
+        df = _calculate_features(df, points_map, stats_years, workers, rules, season)
+    instrumentation.count('rows_produced', len(df))
+    return df
+
+def _decode_blob(blob):
+    """Decode a serialized blob, keeping the scraper's list wrapper."""
+    if not isinstance(blob, str):
+        return blob
+    try:
+        return json.loads(blob)
+    except json.JSONDecodeError:
+        return ast.literal_eval(blob)
+
+def _calculate_features(df, points_map, stats_years, workers, rules=None, season=None):
+    """Feature computation behind calculate_features."""
+    points = fantasy_points_matrix(df['stats_data'], points_map, stats_years, workers, rules)
+
+    # Parse JSON (or Python literal) strings back into Python objects if needed
     if df['stats_data'].dtype == 'object':
-        df['stats_data'] = df['stats_data'].apply(json.loads)
+        df['stats_data'] = df['stats_data'].apply(_decode_blob)
     
     # Calculate fantasy points
-    for year in stats_years:
-        col = f'fantasy_points_{str(year)[-2:]}'
-        df[col] = df['stats_data'].apply(
-            lambda x: calculate_fantasy_points(x, points_map, year)
-        )
+    for i, year in enumerate(stats_years):
+        df[f'fantasy_points_{str(year)[-2:]}'] = points[:, i]
         
     # Calculate composite scores
-    df = calculate_composite_scores(df)
+    df = calculate_composite_scores(df) if season is None else calculate_composite_scores(df, season=season)
     
     # Convert rating to float
     df['rating_current'] = df['rating_current'].astype(float)
     
     return df.sort_values('composite_fp', ascending=False)
 
-def generate_player_dataset(input_csv, stats_years, points_map):
+def validate_scraped_data(df, stats_years, report_output, rescrape=False,
+                          max_quarantined=MAX_QUARANTINED_SHARE):
+    """
+    Drop scraped players that fail validation before feature computation.
+    
+    The issue report and quarantine list are written next to report_output.
+    With rescrape, quarantined players are scraped once more and kept if they
+    then pass, so a flaky page costs one player's requests instead of a full rerun.
+    
+    Args:
+        df: Scraped DataFrame with serialized blobs
+        stats_years: List of years scraped
+        report_output: Path (or directory) to write the report next to
+        rescrape: Whether to re-scrape quarantined players once
+        max_quarantined: Largest share of players that may be quarantined;
+            None skips the check (e.g. for one chunk of a larger run)
+        
+    Returns:
+        DataFrame of players that passed validation
+
+    Raises:
+        ValueError: If more than max_quarantined of the players were
+            quarantined (see validation.check_quarantined)
+    """
+    # With rescrape, the quarantine share is checked after the retry
+    clean, quarantined, _ = run_validation(df, stats_years, report_output,
+                                           max_quarantined=None if rescrape else max_quarantined)
+    
+    # Duplicated rows are dropped rather than re-scraped
+    retry = quarantined[~quarantined['pdga_number'].isin(clean['pdga_number'])]
+    retry = retry.drop_duplicates('pdga_number')
+    if rescrape and len(retry):
+        columns = [c for c in ['Player', 'pdga_number'] if c in retry.columns]
+        print(f"Re-scraping {len(retry)} quarantined players")
+        rescraped = serialize_blobs(scrape_players(retry[columns].reset_index(drop=True), stats_years))
+        instrumentation.count('players_rescraped', len(rescraped))
+        recovered, _, _ = run_validation(rescraped, stats_years, report_output, max_quarantined=None)
+        clean = pd.concat([clean, recovered], ignore_index=True)
+    if rescrape and max_quarantined is not None:
+        check_quarantined(df['pdga_number'].nunique() - clean['pdga_number'].nunique(),
+                          df['pdga_number'].nunique(), max_quarantined)
+    return clean
+
+def serialize_blobs(df):
+    """Convert stats_data/ratings_data columns to JSON strings for CSV output."""
+    with instrumentation.stage('serialize'):
+        df['stats_data'] = df['stats_data'].apply(lambda x: json.dumps(x, default=str))
+        df['ratings_data'] = df['ratings_data'].apply(lambda x: json.dumps(x, default=str))
+    return df
+
+def generate_player_dataset(input_csv, stats_years, points_map, workers=None, validate=True,
+                            rescrape=False, report_output='data/scraped_temp.csv'):
     """
     Generate complete player dataset with stats and fantasy points.
     
@@ -93,6 +277,10 @@ def generate_player_dataset(input_csv, stats_years, points_map):
         input_csv: Path to CSV containing PDGA player numbers
         stats_years: List of years to scrape stats for
         points_map: Dictionary mapping places to fantasy points
+        workers: Number of worker processes for feature computation
+        validate: Whether to drop players failing validation before computing features
+        rescrape: Whether to re-scrape quarantined players once
+        report_output: Path to write the validation report next to
         
     Returns:
         DataFrame with player stats and fantasy points
@@ -100,11 +288,204 @@ def generate_player_dataset(input_csv, stats_years, points_map):
     df = scrape_player_data(input_csv, stats_years)
     
     # Convert DataFrame contents to JSON-serializable format
-    df['stats_data'] = df['stats_data'].apply(lambda x: json.dumps(x, default=str))
-    df['ratings_data'] = df['ratings_data'].apply(lambda x: json.dumps(x, default=str))
+    df = serialize_blobs(df)
     df.to_csv('data/scraped_temp.csv', index=False)
     print("Intermediate scraped data saved to data/scraped_temp.csv")
-    return calculate_features(df, points_map, stats_years)
+    if validate:
+        df = validate_scraped_data(df, stats_years, report_output, rescrape=rescrape)
+    return calculate_features(df, points_map, stats_years, workers=workers)
+
+def generate_player_dataset_chunked(input_csv, output_dir, stats_years, points_map,
+                                    chunk_size=100, scraped=False, workers=None, db_path=None,
+                                    validate=True, rescrape=False):
+    """
+    Generate the player dataset in bounded-size chunks, writing partitioned output.
+    
+    Each chunk of players is scraped (or read from an existing scraped CSV),
+    featurized and written to its own partition before the next chunk is read,
+    so peak memory depends on chunk_size rather than the number of players.
+    League-wide percentiles are filled in by a final pass that reads only the
+    composite_fp column of each partition.
+    
+    Args:
+        input_csv: Path to CSV of PDGA player numbers, or of scraped data if scraped=True
+        output_dir: Directory to write part-NNNNN.csv partitions to
+        stats_years: List of years to scrape stats for
+        points_map: Dictionary mapping places to fantasy points
+        chunk_size: Number of players per chunk
+        scraped: Whether input_csv already contains scraped data
+        workers: Number of worker processes for feature computation
+        db_path: Optional SQLite database to load each chunk into
+        validate: Whether to drop players failing validation before computing features;
+            reports are written to output_dir/validation
+        rescrape: Whether to re-scrape quarantined players once
+        
+    Returns:
+        List of partition file paths
+
+    Raises:
+        ValueError: If validation quarantined more than MAX_QUARANTINED_SHARE
+            of all players; checked once every partition is written, since a
+            single chunk is too small to judge
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    scraped_dir = os.path.join(output_dir, 'scraped')
+    if not scraped:
+        os.makedirs(scraped_dir, exist_ok=True)
+    validation_dir = os.path.join(output_dir, 'validation')
+    if validate:
+        os.makedirs(validation_dir, exist_ok=True)
+
+    parts = []
+    n_players = n_kept = 0
+    for i, chunk in enumerate(pd.read_csv(input_csv, chunksize=chunk_size)):
+        name = f'part-{i:05d}.csv'
+        if not scraped:
+            chunk = serialize_blobs(scrape_players(chunk.reset_index(drop=True), stats_years))
+            chunk.to_csv(os.path.join(scraped_dir, name), index=False)
+        if validate:
+            n_players += chunk['pdga_number'].nunique()
+            chunk = validate_scraped_data(chunk, stats_years, os.path.join(validation_dir, name),
+                                          rescrape=rescrape, max_quarantined=None)
+            n_kept += chunk['pdga_number'].nunique()
+
+        chunk = calculate_features(chunk, points_map, stats_years, workers=workers)
+        path = os.path.join(output_dir, name)
+        chunk.to_csv(path, index=False)
+        parts.append(path)
+        print(f"Wrote {len(chunk)} players to {path}")
+        if db_path:
+            with instrumentation.stage('load_db'):
+                load_into_db(chunk, db_path)
+
+    finalize_partitions(parts, db_path=db_path)
+    if validate:
+        check_quarantined(n_players - n_kept, n_players)
+    return parts
+
+def finalize_partitions(parts, db_path=None):
+    """
+    Recompute league-wide composite percentiles across all partitions.
+    
+    Args:
+        parts: List of partition CSV paths written by generate_player_dataset_chunked
+        db_path: Optional SQLite database whose percentiles should be updated too
+    """
+    composite_fp = np.concatenate([
+        pd.read_csv(path, usecols=['composite_fp'])['composite_fp'].to_numpy()
+        for path in parts
+    ])
+
+    for path in parts:
+        part = pd.read_csv(path)
+        part['composite_percentile'] = np.round(
+            stats.percentileofscore(composite_fp, part['composite_fp'].to_numpy()), 1
+        )
+        part.to_csv(path, index=False)
+        if db_path:
+            update_player_column(db_path, 'composite_percentile',
+                                 part['pdga_number'], part['composite_percentile'])
+
+def feature_params(stats_years):
+    """
+    Parameters that determine calculate_features output, for snapshot keys.
+
+    Includes a hash of the feature code (feature_extraction, validation and
+    the feature functions here), so any change to it recomputes features.
+    """
+    composite = {
+        name: param.default
+        for name, param in inspect.signature(calculate_composite_scores).parameters.items()
+        if param.default is not inspect.Parameter.empty
+    }
+    code = hash_source(feature_extraction, validation, validate_scraped_data, calculate_features,
+                       _calculate_features, _decode_blob, fantasy_points_matrix, _fantasy_points_shard)
+    return {'years': list(stats_years), 'composite': composite, 'code': code}
+
+def generate_player_dataset_snapshot(input_csv, stats_years, points_map_path, name,
+                                     root='data/snapshots', refresh_scrape=False, workers=None,
+                                     validate=True):
+    """
+    Generate the player dataset as a named, content-hashed snapshot.
+    
+    Each stage is keyed by the hashes of its inputs and skipped when an earlier
+    run with the same key is stored: scraping depends on the tour-card CSV,
+    years and base URL; features depend on the scraped data, points map and
+    feature parameters. Refreshing the scrape records a hash of every raw page,
+    and features are only recomputed if the scraped data actually changed.
+    
+    Args:
+        input_csv: Path to CSV containing PDGA player numbers
+        stats_years: List of years to scrape stats for
+        points_map_path: Path to JSON file containing place-to-points mapping
+        name: Snapshot name
+        root: Snapshot store directory
+        refresh_scrape: Re-scrape even if the scrape inputs are unchanged
+        workers: Number of worker processes for feature computation
+        validate: Whether to drop players failing validation before computing features;
+            the report is written to the snapshot directory
+        
+    Returns:
+        DataFrame with player stats and fantasy points
+    """
+    check_snapshot_name(name)
+    manager = SnapshotManager(root)
+    records = {}
+
+    # Stage 1: scrape
+    scrape_inputs = {
+        'players_csv': hash_file(input_csv),
+        'years': list(stats_years),
+        'base_url': scraping_utils.PDGA_BASE_URL
+    }
+    scrape_key = manager.stage_key('scrape', scrape_inputs)
+    records['scrape'] = None if refresh_scrape else manager.lookup('scrape', scrape_key)
+    if records['scrape'] is None:
+        hasher = PageHasher()
+        scraping_utils.PAGE_HOOKS.append(hasher)
+        try:
+            df = serialize_blobs(scrape_player_data(input_csv, stats_years))
+        finally:
+            scraping_utils.PAGE_HOOKS.remove(hasher)
+        tmp_path = os.path.join(root, 'scraped.tmp.csv')
+        df.to_csv(tmp_path, index=False)
+        records['scrape'] = manager.record(
+            'scrape', scrape_key, scrape_inputs, {'scraped': tmp_path},
+            extra={'pages_hash': hash_json(hasher.pages), 'pages': hasher.pages}
+        )
+        os.remove(tmp_path)
+    else:
+        print("Scrape inputs unchanged, reusing stored scraped data")
+
+    # Stage 2: features
+    with open(points_map_path) as f:
+        points_map = json.load(f)
+    feature_inputs = {
+        'scraped': records['scrape']['outputs']['scraped']['sha'],
+        'points_map': hash_file(points_map_path),
+        'params': feature_params(stats_years),
+        'validate': validate
+    }
+    feature_key = manager.stage_key('features', feature_inputs)
+    records['features'] = manager.lookup('features', feature_key)
+    if records['features'] is None:
+        with instrumentation.stage('read_input'):
+            df = pd.read_csv(manager.output_path(records['scrape'], 'scraped'))
+        if validate:
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+            df = validate_scraped_data(df, stats_years, os.path.join(root, name))
+        df = calculate_features(df, points_map, stats_years, workers=workers)
+        tmp_path = os.path.join(root, 'dataset.tmp.csv')
+        df.to_csv(tmp_path, index=False)
+        records['features'] = manager.record('features', feature_key, feature_inputs, {'dataset': tmp_path})
+        os.remove(tmp_path)
+    else:
+        print("Feature inputs unchanged, reusing stored dataset")
+        df = pd.read_csv(manager.output_path(records['features'], 'dataset'))
+
+    manager.write_snapshot(name, records)
+    print(f"Snapshot '{name}' saved to {os.path.join(root, name)}")
+    return df
 
 def main():
     parser = argparse.ArgumentParser(description='Generate fantasy disc golf player dataset')
@@ -116,24 +497,103 @@ def main():
                       help='Path to JSON file containing place-to-points mapping')
     parser.add_argument('--use-scraped', action='store_true',
                       help='Use existing scraped data from data/scraped_temp.csv')
+    parser.add_argument('--chunk-size', type=int,
+                      help='Process players in chunks of this size, writing partitioned '
+                           'output to output_csv as a directory')
+    parser.add_argument('--workers', type=int,
+                      help='Number of worker processes for feature computation (only used for '
+                           f'at least {PARALLEL_MIN_PLAYERS} players)')
+    parser.add_argument('--profile', action='store_true',
+                      help='Capture a cProfile profile of the run next to the output')
+    parser.add_argument('--base-url', type=str,
+                      help='PDGA base URL override, e.g. a local replay server')
+    parser.add_argument('--request-delay', type=float,
+                      help='Seconds to wait between requests (default 1.5)')
+    parser.add_argument('--db', type=str,
+                      help='Also load players, results and ratings into this SQLite database')
+    parser.add_argument('--snapshot', type=str,
+                      help='Build a named content-hashed snapshot, skipping unchanged stages')
+    parser.add_argument('--snapshot-root', type=str, default='data/snapshots',
+                      help='Directory of the snapshot store')
+    parser.add_argument('--refresh-scrape', action='store_true',
+                      help='With --snapshot, re-scrape even if scrape inputs are unchanged')
+    parser.add_argument('--skip-validation', action='store_true',
+                      help='Compute features for every scraped player without validating them')
+    parser.add_argument('--rescrape-quarantined', action='store_true',
+                      help='Re-scrape players that fail validation once before dropping them')
     
     args = parser.parse_args()
+    if args.snapshot and (args.chunk_size or args.use_scraped):
+        parser.error('--snapshot cannot be combined with --chunk-size or --use-scraped')
+    if args.rescrape_quarantined and (args.snapshot or args.skip_validation):
+        parser.error('--rescrape-quarantined cannot be combined with --snapshot or --skip-validation')
+    
+    if args.base_url:
+        set_base_url(args.base_url)
+    if args.request_delay is not None:
+        set_request_delay(args.request_delay)
+    
+    report = instrumentation.start_run()
+    report.info['args'] = vars(args)
     
+    with instrumentation.profiled(args.output_csv, enabled=args.profile):
+        run_pipeline(args)
+    
+    path = instrumentation.report_path(args.output_csv)
+    report.write(path)
+    print(f"Run report saved to {path}")
+
+def run_pipeline(args):
+    """Run the dataset pipeline for parsed command line arguments."""
     # Load points mapping from JSON
     with open(args.points_map) as f:
         points_map = json.load(f)
     
+    # Streaming mode writes its own partitions
+    if args.chunk_size:
+        scraped = args.use_scraped and os.path.exists('data/scraped_temp.csv')
+        if scraped:
+            instrumentation.count('scraped_data_reused')
+        generate_player_dataset_chunked(
+            'data/scraped_temp.csv' if scraped else args.input_csv,
+            args.output_csv, args.years, points_map,
+            chunk_size=args.chunk_size, scraped=scraped, workers=args.workers,
+            db_path=args.db, validate=not args.skip_validation, rescrape=args.rescrape_quarantined
+        )
+        print(f"Partitioned dataset saved to {args.output_csv}")
+        return
+    
     # Generate dataset
-    if args.use_scraped and os.path.exists('data/scraped_temp.csv'):
+    if args.snapshot:
+        df = generate_player_dataset_snapshot(
+            args.input_csv, args.years, args.points_map, args.snapshot,
+            root=args.snapshot_root, refresh_scrape=args.refresh_scrape, workers=args.workers,
+            validate=not args.skip_validation
+        )
+    elif args.use_scraped and os.path.exists('data/scraped_temp.csv'):
         print("Using existing scraped data from data/scraped_temp.csv")
-        df = pd.read_csv('data/scraped_temp.csv')
-        df = calculate_features(df, points_map, args.years)
+        instrumentation.count('scraped_data_reused')
+        with instrumentation.stage('read_input'):
+            df = pd.read_csv('data/scraped_temp.csv')
+        if not args.skip_validation:
+            df = validate_scraped_data(df, args.years, args.output_csv,
+                                       rescrape=args.rescrape_quarantined)
+        df = calculate_features(df, points_map, args.years, workers=args.workers)
     else:
-        df = generate_player_dataset(args.input_csv, args.years, points_map)
+        df = generate_player_dataset(args.input_csv, args.years, points_map, workers=args.workers,
+                                     validate=not args.skip_validation,
+                                     rescrape=args.rescrape_quarantined,
+                                     report_output=args.output_csv)
     
     # Save to CSV
-    df.to_csv(args.output_csv, index=False)
+    with instrumentation.stage('write_output'):
+        df.to_csv(args.output_csv, index=False)
     print(f"Dataset saved to {args.output_csv}")
+    
+    if args.db:
+        with instrumentation.stage('load_db'):
+            load_into_db(df, args.db)
+        print(f"League database saved to {args.db}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from . import instrumentation
+from .dataset_generation import calculate_features, serialize_blobs
+from .feature_extraction import clean_career_stats, parse_player_data, resolve_rules
+from .scraping_utils import (
+    CAREER_SELECTORS,
+    SCRAPED_TIERS,
+    scrape_player_divisions,
+    set_base_url,
+    set_page_cache,
+    set_request_delay
+)
+from .validation import run_validation
+
+# Career stats scraped as of today, which a past season's partition cannot
+# know; they are dropped from season partitions
+CURRENT_ONLY_COLUMNS = ['career_events', 'career_wins', 'career_earnings', 'world_rank']
+
+def load_config(path):
+    """
+    Read a league config, resolving each division's rules and points map.
+
+    A config is a JSON file such as:
+
+        {
+            "seasons": [2022, 2023, 2024],
+            "scraped_tiers": ["ES", "M", "A", "B", "XM"],
+            "rules": {"points_map": "data/points_map_2025.json",
+                      "scoring_tiers": ["M", "ES", "XM"], "major_tiers": ["M", "XM"],
+                      "major_multiplier": 1.5},
+            "divisions": {
+                "MPO": {"players_csv": "data/2025_pdga_tourcards_mpo.csv"},
+                "FPO": {"players_csv": "data/2025_pdga_tourcards_fpo.csv",
+                        "rules": {"major_multiplier": 2.0}}
+            }
+        }
+
+    League rules apply to every division unless the division overrides
+    them; unset rules default to feature_extraction.DEFAULT_RULES.
+    "scraped_tiers" of null keeps every tier.
+
+    Returns:
+        Dictionary with 'seasons', 'scraped_tiers' and 'divisions', mapping
+        each division code to its 'players_csv', 'rules' and 'points_map'
+    """
+    with open(path) as f:
+        config = json.load(f)
+    if not config.get('divisions'):
+        raise ValueError(f"{path} defines no divisions")
+
+    league_rules = config.get('rules', {})
+    divisions = {}
+    for code, spec in config['divisions'].items():
+        rules = {**league_rules, **spec.get('rules', {})}
+        points_map_path = rules.pop('points_map', 'data/points_map_2025.json')
+        with open(points_map_path) as f:
+            points_map = json.load(f)
+        divisions[code.upper()] = {
+            'players_csv': spec['players_csv'],
+            'rules': resolve_rules(rules),
+            'points_map': points_map
+        }
+
+    return {
+        'seasons': sorted(int(s) for s in config['seasons']),
+        'scraped_tiers': config.get('scraped_tiers', SCRAPED_TIERS),
+        'divisions': divisions
+    }
+
+def crawl_divisions(config, max_age=None):
+    """
+    Scrape every division's players, fetching each player's pages once.
+
+    A player listed in several divisions is crawled once, and each of their
+    season pages supplies the results tables of all their divisions.
+
+    Args:
+        config: League config from load_config
+        max_age: Oldest cached copy to accept for pages that can still change
+
+    Returns:
+        Dictionary mapping division codes to scraped DataFrames with
+        serialized blobs, in the same format as dataset_generation.scrape_players
+        (with no rows for an empty roster)
+    """
+    rosters = {code: pd.read_csv(spec['players_csv'])[['Player', 'pdga_number']]
+               for code, spec in config['divisions'].items()}
+    divisions_of = {}
+    for code, roster in rosters.items():
+        for pdga_number in roster['pdga_number']:
+            divisions_of.setdefault(int(pdga_number), []).append(code)
+    instrumentation.count('players_listed', sum(len(r) for r in rosters.values()))
+    instrumentation.count('players_crawled', len(divisions_of))
+
+    rows = {code: [] for code in rosters}
+    for pdga_number, codes in tqdm(divisions_of.items(), total=len(divisions_of)):
+        with instrumentation.stage('scrape_player'):
+            career, stats, ratings = scrape_player_divisions(
+                pdga_number, config['seasons'], codes, tiers=config['scraped_tiers'], max_age=max_age
+            )
+        for code in codes:
+            rows[code].append({
+                **career,
+                'stats_data': [stats[code].to_dict(orient='list')],
+                'ratings_data': [ratings.to_dict(orient='list')]
+            })
+            instrumentation.count('results_rows_scraped', len(stats[code]))
+
+    scraped = {}
+    for code, roster in rosters.items():
+        # An empty roster has no scraped rows to take the columns from
+        scraped_rows = pd.DataFrame(rows[code], columns=['pdga_number', *CAREER_SELECTORS,
+                                                         'stats_data', 'ratings_data'])
+        df = roster.merge(scraped_rows.astype({'pdga_number': roster['pdga_number'].dtype}),
+                          on='pdga_number', how='left')
+        with instrumentation.stage('clean_numeric'):
+            df, _ = clean_career_stats(df)
+        scraped[code] = serialize_blobs(df)
+    return scraped
+
+def _blob_through(blob, date_column, season):
+    """Serialized blob keeping only rows dated on or before the end of a season."""
+    data = parse_player_data(blob) or {}
+    if not data:
+        return json.dumps([data])
+    keep = [str(d)[:4] <= str(season) for d in data[date_column]]
+    return json.dumps([{col: [v for v, k in zip(values, keep) if k] for col, values in data.items()}])
+
+def _rating_at(blob, season):
+    """
+    Approximate rating at the end of a season: the mean of the player's
+    round ratings in its last twelve months, as PDGA ratings roughly are.
+    """
+    data = parse_player_data(blob) or {}
+    dates = pd.to_datetime(pd.Series(data.get('Date', []), dtype=object), errors='coerce')
+    ratings = pd.to_numeric(pd.Series(data.get('Rating', []), dtype=object), errors='coerce')
+    end = pd.Timestamp(f'{season}-12-31')
+    recent = ratings[(dates > end - pd.DateOffset(years=1)) & (dates <= end)].dropna()
+    return float(round(recent.mean())) if len(recent) else np.nan
+
+def season_dataset(scraped, season):
+    """
+    A division's scraped data as it stood at the end of a season.
+
+    Results and rounds after the season are dropped, rating_current is
+    recomputed from the season's rounds (see _rating_at), and career stats
+    only known as of today (CURRENT_ONLY_COLUMNS) are removed, so a
+    season's features use nothing from after it.
+    """
+    df = scraped.drop(columns=[c for c in CURRENT_ONLY_COLUMNS if c in scraped.columns])
+    df['stats_data'] = df['stats_data'].apply(_blob_through, args=('Date', season))
+    df['ratings_data'] = df['ratings_data'].apply(_blob_through, args=('Date', season))
+    df['rating_current'] = df['ratings_data'].apply(_rating_at, args=(season,))
+    return df
+
+def partition_path(output_dir, division, season):
+    """Path of a division and season's partition."""
+    return os.path.join(output_dir, f'division={division}', f'season={season}', 'part-00000.csv')
+
+def generate_division_datasets(config, output_dir, workers=None, validate=True, max_age=None):
+    """
+    Crawl all divisions once and write a partition per division and season.
+
+    Partitions are written to <output_dir>/division=<code>/season=<year>/
+    and hold the dataset as it stood at the end of that season. Seasons
+    whose previous season is also configured get a partition, since
+    the composite score weights a season and the one before it.
+
+    Args:
+        config: League config from load_config
+        output_dir: Root directory of the partitioned dataset
+        workers: Number of worker processes for feature computation
+        validate: Whether to drop players failing validation before computing features
+        max_age: Oldest cached copy to accept for pages that can still change
+
+    Returns:
+        Dictionary mapping (division, season) to partition paths
+    """
+    seasons = config['seasons']
+    partition_seasons = [s for s in seasons if s - 1 in seasons]
+    if not partition_seasons:
+        raise ValueError("Configure at least two consecutive seasons")
+
+    scraped = crawl_divisions(config, max_age=max_age)
+
+    paths = {}
+    for code, df in scraped.items():
+        spec = config['divisions'][code]
+        division_dir = os.path.join(output_dir, f'division={code}')
+        os.makedirs(division_dir, exist_ok=True)
+        df.to_csv(os.path.join(division_dir, 'scraped.csv'), index=False)
+        if validate:
+            df, _, _ = run_validation(df, seasons, division_dir, tiers=config['scraped_tiers'])
+
+        for season in partition_seasons:
+            years = [y for y in seasons if y <= season]
+            features = calculate_features(season_dataset(df, season), spec['points_map'], years,
+                                          workers=workers, rules=spec['rules'], season=season)
+            path = partition_path(output_dir, code, season)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            features.to_csv(path, index=False)
+            paths[(code, season)] = path
+            print(f"Wrote {len(features)} {code} players for {season} to {path}")
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate partitioned datasets for several divisions and seasons')
+    parser.add_argument('config', help='League config JSON with seasons, rules and divisions')
+    parser.add_argument('output_dir', help='Root directory of the partitioned dataset')
+    parser.add_argument('--workers', type=int,
+                      help='Number of worker processes for feature computation')
+    parser.add_argument('--page-cache', default='data/page_cache',
+                      help='Directory of cached pages (completed seasons are never refetched)')
+    parser.add_argument('--page-max-age', type=float, default=24,
+                      help='Hours a cached page for the current season or a profile stays fresh')
+    parser.add_argument('--base-url', type=str,
+                      help='PDGA base URL override, e.g. a local replay server')
+    parser.add_argument('--request-delay', type=float,
+                      help='Seconds to wait between requests (default 1.5)')
+    parser.add_argument('--skip-validation', action='store_true',
+                      help='Compute features for every scraped player without validating them')
+
+    args = parser.parse_args()
+
+    if args.base_url:
+        set_base_url(args.base_url)
+    if args.request_delay is not None:
+        set_request_delay(args.request_delay)
+    set_page_cache(args.page_cache)
+
+    report = instrumentation.start_run()
+    report.info['args'] = vars(args)
+
+    config = load_config(args.config)
+    paths = generate_division_datasets(config, args.output_dir, workers=args.workers,
+                                       validate=not args.skip_validation,
+                                       max_age=args.page_max_age * 3600)
+    print(f"Wrote {len(paths)} partitions to {args.output_dir}")
+
+    path = instrumentation.report_path(args.output_dir)
+    report.write(path)
+    print(f"Run report saved to {path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .feature_extraction import parse_player_data, points_vector
+
+# Representative DGPT Elite Series MPO field
+DEFAULT_FIELD = {
+    'field_size': 120,
+    'field_mean': 995.0,
+    'field_sd': 22.0,
+    'round_sd': 22.0,
+    'n_rounds': 3
+}
+
+DEFAULT_MU_GRID = np.arange(900.0, 1090.0 + 2.5, 2.5)
+DEFAULT_SIGMA_GRID = np.arange(5.0, 45.0 + 2.5, 2.5)
+
+def field_from_dataframe(df, n_rounds=DEFAULT_FIELD['n_rounds']):
+    """
+    Estimate the simulated field distribution from scraped player data.
+
+    Args:
+        df: DataFrame with 'rating_current' and 'ratings_data' columns
+        n_rounds: Number of rounds per simulated event
+
+    Returns:
+        Dictionary of field parameters in the same format as DEFAULT_FIELD
+    """
+    ratings = df['rating_current'].astype(float).dropna()
+
+    # Pooled within-player spread of round ratings
+    round_sds = []
+    for ratings_data in df['ratings_data']:
+        try:
+            values = pd.to_numeric(
+                pd.Series(parse_player_data(ratings_data)['Rating']), errors='coerce'
+            ).dropna()
+        except Exception:
+            continue
+        if len(values) > 1:
+            round_sds.append(values.std())
+
+    return {
+        'field_size': int(len(ratings)),
+        'field_mean': round(float(ratings.mean()), 1),
+        'field_sd': round(float(ratings.std()), 1),
+        'round_sd': round(float(np.median(round_sds)), 1) if round_sds else DEFAULT_FIELD['round_sd'],
+        'n_rounds': n_rounds
+    }
+
+def table_key(points_map, field, mu_grid, sigma_grid, n_sims, seed):
+    """Content hash identifying the inputs a points table was built from."""
+    payload = {
+        'points_map': {str(k): float(v) for k, v in sorted(points_map.items(), key=lambda x: int(x[0]))},
+        'field': {k: field[k] for k in sorted(field)},
+        'mu_grid': [float(x) for x in mu_grid],
+        'sigma_grid': [float(x) for x in sigma_grid],
+        'n_sims': int(n_sims),
+        'seed': int(seed)
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def simulate_points_table(points_map, field=None, mu_grid=None, sigma_grid=None,
+                          n_sims=4000, seed=0):
+    """
+    Simulate expected fantasy points per event over a grid of rating means and spreads.
+
+    Each simulated event draws an event-average rating for every player in the field,
+    then places a target player with rating distribution N(mu, sigma) against it.
+    The same random draws are reused for every grid point, which keeps the table
+    smooth and monotone in mu.
+
+    Args:
+        points_map: Dictionary mapping places to point values
+        field: Dictionary of field parameters (defaults to DEFAULT_FIELD)
+        mu_grid: Array of rating means to evaluate
+        sigma_grid: Array of round rating standard deviations to evaluate
+        n_sims: Number of simulated events per grid point
+        seed: Random seed
+
+    Returns:
+        Dictionary with 'mu', 'sigma', 'points' (len(mu) x len(sigma)) and 'key'
+    """
+    field = {**DEFAULT_FIELD, **(field or {})}
+    mu_grid = DEFAULT_MU_GRID if mu_grid is None else np.asarray(mu_grid, dtype=float)
+    sigma_grid = DEFAULT_SIGMA_GRID if sigma_grid is None else np.asarray(sigma_grid, dtype=float)
+
+    rng = np.random.default_rng(seed)
+    field_size = int(field['field_size'])
+    scale = 1 / np.sqrt(field['n_rounds'])
+
+    # Field: player means drawn once per event, plus event-average round noise
+    player_mu = rng.normal(field['field_mean'], field['field_sd'], size=(n_sims, field_size))
+    field_scores = player_mu + rng.normal(0, field['round_sd'] * scale, size=(n_sims, field_size))
+    field_scores.sort(axis=1)
+
+    # Offset each simulated event into its own band so a single searchsorted
+    # over the flattened array counts beaten players per event
+    offset = np.ceil(field_scores.max() - field_scores.min() + 1000.0)
+    base = field_scores.min() - 500.0
+    row_offsets = np.arange(n_sims)[:, None] * offset
+    flat_field = (field_scores - base + row_offsets).ravel()
+
+    z = rng.standard_normal(n_sims) * scale
+    points_vec = points_vector(points_map, field_size + 2)
+
+    table = np.empty((len(mu_grid), len(sigma_grid)))
+    for j, sigma in enumerate(sigma_grid):
+        # Target scores for every mu at this sigma, shape (n_mu, n_sims)
+        target = mu_grid[:, None] + sigma * z[None, :]
+        target = np.clip(target - base, 0, offset - 1) + row_offsets.T
+        below = np.searchsorted(flat_field, target.ravel(), side='right').reshape(target.shape)
+        beaten = below - np.arange(n_sims) * field_size
+        place = field_size - beaten + 1
+        table[:, j] = points_vec[place].mean(axis=1)
+
+    return {
+        'mu': mu_grid,
+        'sigma': sigma_grid,
+        'points': table,
+        'key': table_key(points_map, field, mu_grid, sigma_grid, n_sims, seed)
+    }
+
+def save_points_table(table, path):
+    """Write a points table to a compressed .npz file."""
+    np.savez_compressed(
+        path, mu=table['mu'], sigma=table['sigma'], points=table['points'], key=table['key']
+    )
+
+def read_points_table(path):
+    """Read a points table written by save_points_table."""
+    with np.load(path) as data:
+        return {
+            'mu': data['mu'],
+            'sigma': data['sigma'],
+            'points': data['points'],
+            'key': str(data['key'])
+        }
+
+def load_points_table(path, points_map, field=None, mu_grid=None, sigma_grid=None,
+                      n_sims=4000, seed=0):
+    """
+    Load a cached points table, rebuilding it only if its inputs have changed.
+
+    Args:
+        path: Path to the .npz cache file
+        points_map: Dictionary mapping places to point values
+        field: Dictionary of field parameters (defaults to DEFAULT_FIELD)
+        mu_grid: Array of rating means to evaluate
+        sigma_grid: Array of round rating standard deviations to evaluate
+        n_sims: Number of simulated events per grid point
+        seed: Random seed
+
+    Returns:
+        Points table dictionary (see simulate_points_table)
+    """
+    field = {**DEFAULT_FIELD, **(field or {})}
+    key = table_key(
+        points_map, field,
+        DEFAULT_MU_GRID if mu_grid is None else mu_grid,
+        DEFAULT_SIGMA_GRID if sigma_grid is None else sigma_grid,
+        n_sims, seed
+    )
+
+    if os.path.exists(path):
+        table = read_points_table(path)
+        if table['key'] == key:
+            return table
+
+    table = simulate_points_table(points_map, field, mu_grid, sigma_grid, n_sims, seed)
+    save_points_table(table, path)
+    return table
+
+def expected_points(table, mu, sigma):
+    """
+    Look up expected fantasy points per event by bilinear interpolation.
+
+    Values outside the grid are clamped to its edges. Points are base values;
+    apply tier multipliers (e.g. 1.5x for Majors) separately.
+
+    Args:
+        table: Points table dictionary
+        mu: Scalar or array of rating means
+        sigma: Scalar or array of round rating standard deviations
+
+    Returns:
+        numpy array of expected points, broadcast to the shape of mu and sigma
+    """
+    mu_grid, sigma_grid, values = table['mu'], table['sigma'], table['points']
+    mu, sigma = np.broadcast_arrays(np.asarray(mu, dtype=float), np.asarray(sigma, dtype=float))
+
+    mu = np.clip(mu, mu_grid[0], mu_grid[-1])
+    sigma = np.clip(sigma, sigma_grid[0], sigma_grid[-1])
+
+    i = np.clip(np.searchsorted(mu_grid, mu, side='right') - 1, 0, len(mu_grid) - 2)
+    j = np.clip(np.searchsorted(sigma_grid, sigma, side='right') - 1, 0, len(sigma_grid) - 2)
+
+    tx = (mu - mu_grid[i]) / (mu_grid[i + 1] - mu_grid[i])
+    ty = (sigma - sigma_grid[j]) / (sigma_grid[j + 1] - sigma_grid[j])
+
+    return (
+        values[i, j] * (1 - tx) * (1 - ty) +
+        values[i + 1, j] * tx * (1 - ty) +
+        values[i, j + 1] * (1 - tx) * ty +
+        values[i + 1, j + 1] * tx * ty
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute rating-to-expected-points lookup table')
+    parser.add_argument('points_map', help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('output', help='Path to save the .npz lookup table')
+    parser.add_argument('--players-csv', type=str,
+                      help='Scraped player dataset used to estimate the field distribution')
+    parser.add_argument('--n-sims', type=int, default=4000,
+                      help='Number of simulated events per grid point')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    field = None
+    if args.players_csv:
+        field = field_from_dataframe(pd.read_csv(args.players_csv))
+        print(f"Estimated field: {field}")
+
+    table = load_points_table(args.output, points_map, field=field,
+                              n_sims=args.n_sims, seed=args.seed)
+    print(f"Points table saved to {args.output} (key {table['key'][:12]})")
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,83 @@
+import ast
+import json
 import pandas as pd
 import numpy as np
+import re
 from scipy import stats
 
+# Number following the last ':', '$' or '#' in a PDGA profile field
+NUMBER_PATTERN = re.compile(r'.*[:$#]\s?((\d{1,5}(?:,\d{3})*|\d+)(\.\d+)?)')
+MISSING_ELEMENT = 'Element not found'
+
+# Typed output of clean_career_stats
+CAREER_STAT_TYPES = {
+    'career_events': 'Int64',
+    'join_date': 'Int64',
+    'rating_current': 'float64',
+    'career_wins': 'Int64',
+    'career_earnings': 'float64',
+    'world_rank': 'Int64'
+}
+
 def extract_numbers(s):
     """Extract numbers from strings containing formatted text with numbers."""
-    import re
-    pattern = r'.*[:$#]\s?((\d{1,5}(?:,\d{3})*|\d+)(\.\d+)?)'
-    matches = re.findall(pattern, s)
+    matches = NUMBER_PATTERN.findall(s)
     if matches:
         return [match[0] for match in matches][0]
     return None
 
+def clean_career_stats(df):
+    """
+    Vectorized cleanup of the *_raw career stat columns from get_player_career_stats.
+    
+    Each raw column is parsed with the precompiled NUMBER_PATTERN through pandas
+    string methods, thousands separators are removed and values are cast to
+    CAREER_STAT_TYPES. Missing elements become nulls.
+    
+    Args:
+        df: DataFrame with '<stat>_raw' columns
+        
+    Returns:
+        Tuple of (DataFrame with typed stat columns replacing the raw columns,
+        DataFrame report with one row per null value: 'pdga_number', 'column',
+        'raw' and 'reason' ('missing' or 'unparsed'))
+    """
+    failures = []
+    for col, dtype in CAREER_STAT_TYPES.items():
+        raw_col = f'{col}_raw'
+        if raw_col not in df.columns:
+            continue
+        raw = df[raw_col].astype('string')
+        missing = raw.isna() | (raw.str.strip() == MISSING_ELEMENT)
+
+        number = raw.mask(missing).str.extract(NUMBER_PATTERN, expand=True)[0]
+        values = pd.to_numeric(number.str.replace(',', '', regex=False), errors='coerce')
+        unparsed = ~missing & values.isna()
+
+        if dtype == 'Int64':
+            # Whole numbers only; anything fractional is a parse failure
+            fractional = values.notna() & (values % 1 != 0)
+            unparsed |= fractional
+            values = values.mask(fractional).round().astype('Int64')
+        else:
+            values = values.astype(dtype)
+
+        for reason, mask in (('missing', missing), ('unparsed', unparsed)):
+            if mask.any():
+                failures.append(pd.DataFrame({
+                    'pdga_number': df.loc[mask, 'pdga_number'] if 'pdga_number' in df.columns else df.index[mask],
+                    'column': col,
+                    'raw': df.loc[mask, raw_col],
+                    'reason': reason
+                }))
+
+        df[col] = values
+        df = df.drop(columns=[raw_col])
+
+    report = (pd.concat(failures, ignore_index=True) if failures
+              else pd.DataFrame(columns=['pdga_number', 'column', 'raw', 'reason']))
+    return df, report
+
 def extract_ratings_vec(input_data, tiers=None, cutoff_date=None):
     """
     Extract filtered vector of round ratings from player's rating history.
@@ -35,9 +102,29 @@ def extract_ratings_vec(input_data, tiers=None, cutoff_date=None):
         
     return df['Rating'].values
 
-import json
+def parse_player_data(data):
+    """
+    Decode a player's stats_data or ratings_data blob into a column dictionary.
+
+    Handles JSON strings, Python literal strings (as written by DataFrame.to_csv)
+    and the single-element list wrapper used by the scraper.
+
+    Args:
+        data: Blob as a string, list or dictionary
+
+    Returns:
+        Dictionary mapping column names to lists of values
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            data = ast.literal_eval(data)
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    return data
 
-def calculate_fantasy_points(stats_data, points_map, year):
+def calculate_fantasy_points(stats_data, points_map, year, rules=None):
     """
     Calculate fantasy points for a player's tournament results.
     
@@ -45,10 +132,12 @@ def calculate_fantasy_points(stats_data, points_map, year):
         stats_data: Dictionary of tournament stats
         points_map: Dictionary mapping places to point values
         year: Year to calculate points for
+        rules: League rules (defaults to DEFAULT_RULES)
         
     Returns:
         Total fantasy points
     """
+    rules = resolve_rules(rules)
     #print('call to calculate_fantasy_points')
     if isinstance(stats_data, str):
         stats_data = json.loads(stats_data)
@@ -60,19 +149,120 @@ def calculate_fantasy_points(stats_data, points_map, year):
     except Exception as e:
         print('Stats data not in list, parsing standalone json...')
         df = pd.DataFrame(stats_data)
-    df['Date'] = df['Date'].apply(
-        lambda x : pd.to_datetime(x, format='%Y-%m-%d')
-    )
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
 
-    df = df[df['Tier'].isin(['M', 'ES', 'XM'])]
+    df = df[df['Tier'].isin(rules['scoring_tiers'])]
     df = df[df['Date'].dt.year == year]
 
     df['event_points'] = df['Place'].astype(str).map(points_map)
-    df.loc[df['Tier'].isin(['M', 'XM']), 'event_points'] *= 1.5
+    df.loc[df['Tier'].isin(rules['major_tiers']), 'event_points'] *= rules['major_multiplier']
 
     return df['event_points'].sum()
 
-def calculate_composite_scores(df, year1_weight=0.65, year2_weight=0.35):
+SCORING_TIERS = ['M', 'ES', 'XM']
+MAJOR_TIERS = ['M', 'XM']
+
+# League scoring rules; a division or league config may override any key
+DEFAULT_RULES = {
+    'scoring_tiers': SCORING_TIERS,
+    'major_tiers': MAJOR_TIERS,
+    'major_multiplier': 1.5
+}
+
+def tier_multiplier(tier, rules=DEFAULT_RULES):
+    """Fantasy points multiplier for an event tier: 1.5 for Majors, 0 for non-scoring tiers by default."""
+    if tier in rules['major_tiers']:
+        return float(rules['major_multiplier'])
+    return 1.0 if tier in rules['scoring_tiers'] else 0.0
+
+def resolve_rules(rules=None):
+    """League rules with unset keys taken from DEFAULT_RULES."""
+    return {**DEFAULT_RULES, **(rules or {})}
+
+def points_vector(points_map, length=None):
+    """
+    Convert a place-to-points mapping into an array indexed by place.
+    
+    Args:
+        points_map: Dictionary mapping places (str or int) to point values
+        length: Array length (defaults to the largest mapped place + 1)
+        
+    Returns:
+        numpy array where element i holds the points for place i (0 for unscored places)
+    """
+    places = {int(place): float(points) for place, points in points_map.items()}
+    vec = np.zeros(length if length is not None else max(places) + 1)
+    for place, points in places.items():
+        if place < len(vec):
+            vec[place] = points
+    return vec
+
+# Year stored for missing or malformed dates; no season matches it
+MISSING_YEAR = -1
+
+def _year(date):
+    """Year of an ISO date string, or MISSING_YEAR when it has none (None, NaN, '')."""
+    text = str(date)
+    return int(text[:4]) if text[:4].isdigit() else MISSING_YEAR
+
+def stats_to_arrays(stats_data, rules=None):
+    """
+    Convert a player's stats_data blob into compact typed arrays.
+    
+    Args:
+        stats_data: Stats blob as accepted by parse_player_data
+        rules: League rules for tier multipliers (defaults to DEFAULT_RULES)
+        
+    Returns:
+        Tuple of (place int16, tier multiplier float64, year int16) arrays.
+        Non-numeric places are -1; non-scoring tiers have multiplier 0;
+        missing dates have year MISSING_YEAR.
+    """
+    data = parse_player_data(stats_data)
+    places = data.get('Place', [])
+    place = np.array([int(p) if str(p).isdigit() else -1 for p in places], dtype=np.int16)
+    rules = resolve_rules(rules)
+    multiplier = np.array([tier_multiplier(t, rules) for t in data.get('Tier', [])], dtype=np.float64)
+    year = np.array([_year(d) for d in data.get('Date', [])], dtype=np.int16)
+    return place, multiplier, year
+
+def fantasy_points_from_arrays(place, multiplier, year, points_vec, years):
+    """
+    Array equivalent of calculate_fantasy_points for several years at once.
+    
+    Point values are multiples of 0.5, so totals are exact and independent
+    of summation order.
+    
+    Args:
+        place, multiplier, year: Arrays from stats_to_arrays
+        points_vec: numpy array of points indexed by place
+        years: List of years to total points for
+        
+    Returns:
+        numpy array of total points per year
+    """
+    valid = (place >= 0) & (place < len(points_vec))
+    event_points = np.where(valid, points_vec[np.where(valid, place, 0)], 0.0) * multiplier
+    return np.array([event_points[year == y].sum() for y in years], dtype=np.float64)
+
+FANTASY_POINTS_COLUMN = re.compile(r'fantasy_points_(\d{2})')
+
+def fantasy_points_seasons(columns):
+    """
+    Seasons with a fantasy_points_YY column, oldest first.
+
+    Other columns sharing the prefix (e.g. 'fantasy_points_total') are ignored.
+
+    Args:
+        columns: Column names
+
+    Returns:
+        Sorted list of seasons, e.g. [2023, 2024]
+    """
+    matches = (FANTASY_POINTS_COLUMN.fullmatch(c) for c in columns)
+    return sorted(2000 + int(m.group(1)) for m in matches if m)
+
+def calculate_composite_scores(df, year1_weight=0.65, year2_weight=0.35, season=2024):
     """
     Calculate composite fantasy scores and percentiles.
     
@@ -80,14 +270,14 @@ def calculate_composite_scores(df, year1_weight=0.65, year2_weight=0.35):
         df: DataFrame with fantasy_points columns
         year1_weight: Weight for most recent year
         year2_weight: Weight for previous year
+        season: Most recent year; the composite uses it and the year before
         
     Returns:
         DataFrame with added composite columns
     """
-    #Make this function more flexible in the future
     df['composite_fp'] = (
-        year1_weight * df['fantasy_points_24'] + 
-        year2_weight * df['fantasy_points_23']
+        year1_weight * df[f'fantasy_points_{str(season)[-2:]}'] + 
+        year2_weight * df[f'fantasy_points_{str(season - 1)[-2:]}']
     )
     
     df['composite_percentile'] = df['composite_fp'].apply(
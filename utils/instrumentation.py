@@ -0,0 +1,122 @@
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+class RunReport:
+    """
+    Per-stage timers and counters for one pipeline run.
+
+    Stage timings are inclusive, so a 'scrape_player_stats' stage also
+    contains the 'network' and 'parse' time spent inside it.
+
+    Counters are named for exactly what they count. The cache counters are
+    separate because each covers one layer: 'page_cache_hits' (pages served
+    from the page cache instead of the network), 'scraped_data_reused'
+    (runs reading data/scraped_temp.csv under --use-scraped) and
+    'snapshot_stage_hits' (snapshot stages reused from the store).
+    """
+
+    def __init__(self):
+        self.started = datetime.now(timezone.utc)
+        self.stages = defaultdict(lambda: {'seconds': 0.0, 'calls': 0})
+        self.counters = defaultdict(int)
+        self.info = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of work under the given stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name]['seconds'] += time.perf_counter() - start
+            self.stages[name]['calls'] += 1
+
+    def count(self, name, n=1):
+        """Increment a counter."""
+        self.counters[name] += n
+
+    def to_dict(self):
+        """Return the report as a JSON-serializable dictionary."""
+        return {
+            'started': self.started.isoformat(),
+            'elapsed_seconds': (datetime.now(timezone.utc) - self.started).total_seconds(),
+            'python': platform.python_version(),
+            'info': self.info,
+            'stages': {
+                name: {'seconds': round(s['seconds'], 4), 'calls': s['calls']}
+                for name, s in sorted(self.stages.items(), key=lambda x: -x[1]['seconds'])
+            },
+            'counters': dict(sorted(self.counters.items()))
+        }
+
+    def write(self, path):
+        """Write the report as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+# Library functions record into the active report; start_run replaces it
+_report = RunReport()
+
+def start_run():
+    """Start a fresh run report and make it the active one."""
+    global _report
+    _report = RunReport()
+    return _report
+
+def get_report():
+    """Return the active run report."""
+    return _report
+
+def stage(name):
+    """Time a block of work in the active report."""
+    return _report.stage(name)
+
+def count(name, n=1):
+    """Increment a counter in the active report."""
+    _report.count(name, n)
+
+def report_path(output):
+    """Run report path next to an output CSV, or inside an output directory."""
+    if os.path.isdir(output):
+        return os.path.join(output, 'run_report.json')
+    return f'{os.path.splitext(output)[0]}.report.json'
+
+@contextmanager
+def profiled(output, enabled=True, top_n=40):
+    """
+    Capture a cProfile profile of the enclosed block.
+
+    Writes <output>.prof (loadable with pstats or snakeviz) and a text summary
+    of the top functions by cumulative time to <output>.profile.txt.
+
+    Args:
+        output: Output CSV path or directory the profile is written next to
+        enabled: Whether to profile at all
+        top_n: Number of functions in the text summary
+    """
+    if not enabled:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        base = os.path.join(output, 'run') if os.path.isdir(output) else os.path.splitext(output)[0]
+        profiler.dump_stats(f'{base}.prof')
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(top_n)
+        with open(f'{base}.profile.txt', 'w') as f:
+            f.write(summary.getvalue())
+        _report.info['profile'] = f'{base}.prof'
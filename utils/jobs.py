@@ -0,0 +1,350 @@
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+from .snapshots import hash_file, hash_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_ROOT = 'data/jobs'
+
+# Job states; the last three are final
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+def _lock(f):
+    """Block until this process holds an exclusive lock on an open file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+def _unlock(f):
+    """Release a lock taken with _lock."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class JobStore:
+    """
+    Disk-backed store of job status and results.
+
+    Layout under root:
+        <job_id>.json    status: task, args, state, progress, message, timestamps
+        <job_id>.pkl     pickled result of a finished job
+        <job_id>.cancel  present while cancellation is requested
+        <job_id>.lock    lock file serializing status updates
+
+    Status files are replaced atomically, so the dashboard process can read
+    them while a worker process is writing. Read-modify-write updates hold
+    the job's lock, so the dashboard and a worker updating the same job at
+    once cannot drop each other's fields. The root is created on the first
+    write, not when the store is opened.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def path(self, job_id, ext):
+        """Path of one of a job's files."""
+        return os.path.join(self.root, f'{job_id}.{ext}')
+
+    def _write_path(self, job_id, ext):
+        """Path of one of a job's files, creating the root if needed."""
+        os.makedirs(self.root, exist_ok=True)
+        return self.path(job_id, ext)
+
+    def status(self, job_id):
+        """Status dictionary of a job, or None if it is unknown."""
+        try:
+            with open(self.path(job_id, 'json')) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @contextmanager
+    def locked(self, job_id):
+        """Hold a job's lock, across processes and threads, for the duration of the block."""
+        with open(self._write_path(job_id, 'lock'), 'a') as f:
+            _lock(f)
+            try:
+                yield
+            finally:
+                _unlock(f)
+
+    def write_status(self, job_id, status):
+        """Atomically replace a job's status."""
+        tmp = self._write_path(job_id, f'json.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({**status, 'updated': time.time()}, f, default=str)
+        os.replace(tmp, self.path(job_id, 'json'))
+
+    def update(self, job_id, **fields):
+        """Update fields of a job's status under its lock."""
+        with self.locked(job_id):
+            self.write_status(job_id, {**(self.status(job_id) or {}), **fields})
+
+    def save_result(self, job_id, result):
+        """Store a finished job's result."""
+        tmp = self._write_path(job_id, f'pkl.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(tmp, self.path(job_id, 'pkl'))
+
+    def result(self, job_id):
+        """Result of a finished job, or None if there is none."""
+        try:
+            with open(self.path(job_id, 'pkl'), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def request_cancel(self, job_id):
+        """Ask a running job to stop at its next progress report."""
+        open(self._write_path(job_id, 'cancel'), 'w').close()
+
+    def cancel_requested(self, job_id):
+        """Whether cancellation of a job has been requested."""
+        return os.path.exists(self.path(job_id, 'cancel'))
+
+    def clear_cancel(self, job_id):
+        """Withdraw a cancellation request."""
+        if self.cancel_requested(job_id):
+            os.remove(self.path(job_id, 'cancel'))
+
+    def jobs(self):
+        """Status of every job in the store, newest first."""
+        if not os.path.isdir(self.root):
+            return []
+        statuses = [self.status(f[:-len('.json')]) for f in os.listdir(self.root) if f.endswith('.json')]
+        return sorted((s for s in statuses if s), key=lambda s: s.get('created', 0), reverse=True)
+
+def _reporter(store, job_id):
+    """Progress callback for a job, raising JobCancelled once cancellation is requested."""
+    def report(fraction, message=None):
+        if store.cancel_requested(job_id):
+            raise JobCancelled()
+        fields = {'progress': round(float(fraction), 3)}
+        if message is not None:
+            fields['message'] = message
+        store.update(job_id, **fields)
+    return report
+
+def _run_job(root, job_id, task, args):
+    """Process pool worker: run one job, recording progress, result and final state."""
+    store = JobStore(root)
+    progress = _reporter(store, job_id)
+    try:
+        progress(0.0)
+        store.update(job_id, state=RUNNING, started=time.time())
+        result = TASKS[task](progress, **args)
+        store.save_result(job_id, result)
+        store.update(job_id, state=DONE, progress=1.0, message='Done')
+    except JobCancelled:
+        store.update(job_id, state=CANCELLED, message='Cancelled')
+    except Exception as e:
+        store.update(job_id, state=FAILED, message=f'{type(e).__name__}: {e}',
+                     traceback=traceback.format_exc())
+    return job_id
+
+def sweep_task(progress, dataset_csv, target_years, points_map_file='data/points_map_2025.json',
+               n_boot=1000, seed=0):
+    """Background job: sweeps.run_sweep on a dataset file."""
+    from .sweeps import run_sweep
+
+    progress(0.0, 'Loading dataset')
+    with open(points_map_file) as f:
+        points_map = json.load(f)
+    df = pd.read_csv(dataset_csv)
+    progress(0.05, 'Scoring settings')
+    return run_sweep(df, points_map, target_years, n_boot=n_boot, seed=seed,
+                     progress=lambda fraction: progress(0.05 + 0.95 * fraction, 'Scoring settings'))
+
+def trades_task(progress, dataset_csv, rosters_file, events, points_map_file='data/points_map_2025.json',
+                points_table_file='data/points_table.npz', team=None, two_for_one=True):
+    """Background job: rank every trade between rostered players as in the trades CLI."""
+    from .expected_points import load_points_table
+    from .rating_model import add_rating_posterior
+    from .trades import TradeEvaluator, projection_matrix
+
+    progress(0.0, 'Fitting ratings')
+    with open(points_map_file) as f:
+        points_map = json.load(f)
+    with open(rosters_file) as f:
+        rosters = json.load(f)
+    df = add_rating_posterior(pd.read_csv(dataset_csv))
+    rostered = {name for names in rosters.values() for name in names}
+    df = df[df['Player'].isin(rostered)].reset_index(drop=True)
+
+    progress(0.4, 'Projecting events')
+    table = load_points_table(points_table_file, points_map)
+    evaluator = TradeEvaluator(projection_matrix(df, events, table), rosters, df['Player'])
+
+    progress(0.6, 'Ranking trades')
+    return evaluator.rank_trades(team=team, two_for_one=two_for_one)
+
+def points_table_task(progress, points_map_file='data/points_map_2025.json',
+                      output='data/points_table.npz'):
+    """Background job: simulate (or load the cached) rating-to-points table."""
+    from .expected_points import load_points_table
+
+    progress(0.0, 'Simulating events')
+    with open(points_map_file) as f:
+        points_map = json.load(f)
+    load_points_table(output, points_map)
+    return output
+
+# Task name -> function(progress, **args); args must be JSON-serializable
+TASKS = {
+    'sweep': sweep_task,
+    'trades': trades_task,
+    'points_table': points_table_task
+}
+
+def job_key(task, args):
+    """
+    Job id for a request: identical tasks and arguments share one job.
+
+    Arguments naming existing files contribute the file's content hash, so a
+    rewritten dataset is not served a stale cached result.
+    """
+    files = {str(v): hash_file(v) for v in args.values() if isinstance(v, str) and os.path.isfile(v)}
+    return hash_json({'task': task, 'args': args, 'files': files})[:16]
+
+class JobQueue:
+    """
+    Local process pool running jobs recorded in a JobStore.
+
+    submit() returns immediately with a job id; callers poll status() while
+    the work runs in another process. A request identical to a queued,
+    running or finished job returns that job instead of starting a new one.
+    Failed and cancelled jobs are rerun when requested again. Worker
+    processes start on the first submit, not when the queue is created.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, workers=2):
+        """
+        Args:
+            root: Directory of the job store
+            workers: Number of worker processes
+        """
+        self.store = JobStore(root)
+        self.workers = workers
+        self.executor = None
+        self.futures = {}
+        self._executor_lock = threading.Lock()
+
+    def _executor(self):
+        """The worker pool, started on first use."""
+        with self._executor_lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self.executor
+
+    def submit(self, task, **args):
+        """
+        Start a job (or join an identical one).
+
+        Returns:
+            Job id
+        """
+        if task not in TASKS:
+            raise ValueError(f"Unknown task {task!r}; expected one of {sorted(TASKS)}")
+
+        job_id = job_key(task, args)
+        with self.store.locked(job_id):
+            status = self.store.status(job_id)
+            future = self.futures.get(job_id)
+            if status and status['state'] == DONE and os.path.exists(self.store.path(job_id, 'pkl')):
+                return job_id
+            if future is not None and not future.done():
+                return job_id
+
+            self.store.clear_cancel(job_id)
+            self.store.write_status(job_id, {
+                'id': job_id, 'task': task, 'args': args, 'state': QUEUED,
+                'progress': 0.0, 'message': 'Queued', 'created': time.time()
+            })
+            self.futures[job_id] = self._executor().submit(_run_job, self.store.root, job_id, task, args)
+        return job_id
+
+    def status(self, job_id):
+        """Status dictionary of a job, or None if it is unknown."""
+        status = self.store.status(job_id)
+        future = self.futures.get(job_id)
+        if status and status['state'] not in FINAL_STATES and future is not None and future.done() \
+                and future.exception() is not None:
+            # The worker died before recording a final state
+            self.store.update(job_id, state=FAILED, message=f'Worker error: {future.exception()}')
+            status = self.store.status(job_id)
+        if status and status['state'] not in FINAL_STATES and self.store.cancel_requested(job_id):
+            status['message'] = 'Cancelling'
+        return status
+
+    def result(self, job_id):
+        """Result of a finished job, or None."""
+        return self.store.result(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: queued jobs are dropped, running jobs stop at their
+        next progress report.
+        """
+        future = self.futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.update(job_id, state=CANCELLED, message='Cancelled')
+            return
+        status = self.store.status(job_id)
+        if status and status['state'] not in FINAL_STATES:
+            # Only the worker writes a running job's status, so nothing it records is lost
+            self.store.request_cancel(job_id)
+
+    def shutdown(self):
+        """Stop the worker pool, if started, cancelling queued jobs."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='List background jobs in a job store')
+    parser.add_argument('--root', default=DEFAULT_ROOT, help='Job store directory')
+
+    args = parser.parse_args()
+
+    jobs = JobStore(args.root).jobs()
+    if not jobs:
+        print(f"No jobs in {args.root}")
+        return
+    print(pd.DataFrame([{
+        'id': job['id'],
+        'task': job['task'],
+        'state': job['state'],
+        'progress': job.get('progress'),
+        'message': job.get('message'),
+        'created': pd.Timestamp(job['created'], unit='s').strftime('%Y-%m-%d %H:%M')
+    } for job in jobs]).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
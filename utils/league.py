@@ -0,0 +1,294 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .feature_extraction import parse_player_data
+
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+# Stored in place of missing places, ratings, rounds and dates
+MISSING = -1
+
+def _days(dates):
+    """Convert date strings to int32 day numbers since 1970-01-01."""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce')
+    days = (parsed.to_numpy(dtype='datetime64[D]') - EPOCH).astype(np.int64)
+    return np.where(parsed.isna().to_numpy(), MISSING, days).astype(np.int32)
+
+def _int16(values):
+    """Convert numeric strings to int16, storing MISSING for anything else."""
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+    return numbers.fillna(MISSING).to_numpy().astype(np.int16)
+
+def _places(values):
+    """
+    Convert places to int16, keeping non-numeric codes (DNF, DNS, DQ).
+
+    Non-numeric places are stored as -2 - k, where k indexes the returned
+    code table; missing places are MISSING.
+
+    Returns:
+        Tuple of (int16 place array, code table)
+    """
+    series = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(series, errors='coerce')
+    coded = numbers.isna() & series.notna()
+    codes, table = pd.factorize(series[coded].astype(str))
+    places = numbers.fillna(MISSING).to_numpy().astype(np.int16)
+    places[coded.to_numpy()] = -2 - codes
+    return places, np.asarray(table, dtype=object)
+
+class League:
+    """
+    Compact typed representation of every player's results and round ratings.
+
+    Results and rounds are each stored as contiguous typed arrays in player
+    order, with an offsets array marking where each player's rows start
+    (a CSR layout): player i's results are rows offsets[i]:offsets[i + 1].
+    Places, ratings and round numbers are int16, dates int32 day numbers,
+    and tiers and tournaments small unsigned integer codes into shared
+    lookup tables. Non-numeric places (DNF, DNS, DQ) are negative codes into
+    a place code table; missing values of any column are MISSING.
+
+    player_results() and player_rounds() return slices of these arrays
+    without copying. results() and ratings() gather the filtered rows into a
+    new DataFrame; they accept the same filters and return the same columns
+    as LeagueDB, so a League can be passed to analysis_utils functions
+    anywhere they take a db.
+    """
+
+    def __init__(self, players, pdga_numbers, tiers, tournaments, results, rounds,
+                 rating_current=None, place_codes=()):
+        """
+        Args:
+            players: Player names
+            pdga_numbers: PDGA numbers aligned with players
+            tiers: Tier code lookup table
+            tournaments: Tournament name lookup table
+            results: Dictionary of result arrays ('place', 'day', 'tier', 'tournament', 'offsets')
+            rounds: Dictionary of round arrays ('rating', 'day', 'tier', 'tournament',
+                'round', 'offsets')
+            rating_current: Optional current PDGA ratings aligned with players
+            place_codes: Non-numeric place lookup table (see _places)
+        """
+        self.players = np.asarray(players, dtype=object)
+        self.pdga_numbers = np.asarray(pdga_numbers, dtype=np.int32)
+        if rating_current is None:
+            rating_current = np.full(len(self.players), np.nan)
+        self.rating_current = np.asarray(rating_current, dtype=np.float32)
+        self.tiers = np.asarray(tiers, dtype=object)
+        self.tournaments = np.asarray(tournaments, dtype=object)
+        self.place_codes = np.asarray(place_codes, dtype=object)
+        self.result_arrays = results
+        self.round_arrays = rounds
+        self.index = {name: i for i, name in enumerate(self.players)}
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build a League from a DataFrame with stats_data and ratings_data blobs.
+
+        Blobs are decoded once; ratings and rounds that are not numbers are
+        stored as MISSING.
+        """
+        stats_cols = {'Place': [], 'Date': [], 'Tier': [], 'Tournament': []}
+        ratings_cols = {'Rating': [], 'Date': [], 'Tier': [], 'Tournament': [], 'Round': []}
+        result_counts, round_counts = [], []
+
+        for stats_data, ratings_data in zip(df['stats_data'], df['ratings_data']):
+            stats = parse_player_data(stats_data) or {}
+            n_results = len(stats.get('Place', []))
+            for col, values in stats_cols.items():
+                values.extend(stats.get(col, [None] * n_results))
+            result_counts.append(n_results)
+
+            ratings = parse_player_data(ratings_data) or {}
+            n_rounds = len(ratings.get('Rating', []))
+            for col, values in ratings_cols.items():
+                values.extend(ratings.get(col, [None] * n_rounds))
+            round_counts.append(n_rounds)
+
+        tier_codes, tiers = pd.factorize(
+            pd.Series(stats_cols['Tier'] + ratings_cols['Tier'], dtype=object), use_na_sentinel=False
+        )
+        tournament_codes, tournaments = pd.factorize(
+            pd.Series(stats_cols['Tournament'] + ratings_cols['Tournament'], dtype=object),
+            use_na_sentinel=False
+        )
+        n_results = len(stats_cols['Place'])
+        places, place_codes = _places(stats_cols['Place'])
+        # Smallest unsigned type that can index the tournament table
+        code_type = np.min_scalar_type(max(len(tournaments) - 1, 0))
+
+        results = {
+            'place': places,
+            'day': _days(stats_cols['Date']),
+            'tier': tier_codes[:n_results].astype(np.uint8),
+            'tournament': tournament_codes[:n_results].astype(code_type),
+            'offsets': np.concatenate([[0], np.cumsum(result_counts)]).astype(np.int64)
+        }
+        rounds = {
+            'rating': _int16(ratings_cols['Rating']),
+            'day': _days(ratings_cols['Date']),
+            'tier': tier_codes[n_results:].astype(np.uint8),
+            'tournament': tournament_codes[n_results:].astype(code_type),
+            'round': _int16(ratings_cols['Round']),
+            'offsets': np.concatenate([[0], np.cumsum(round_counts)]).astype(np.int64)
+        }
+        rating_current = (pd.to_numeric(df['rating_current'], errors='coerce').to_numpy()
+                          if 'rating_current' in df.columns else None)
+        return cls(df['Player'].to_numpy(), df['pdga_number'].to_numpy(), tiers, tournaments,
+                   results, rounds, rating_current, place_codes)
+
+    def save(self, path):
+        """Save to a .npz file."""
+        np.savez(
+            path,
+            players=self.players.astype(str), pdga_numbers=self.pdga_numbers,
+            rating_current=self.rating_current,
+            tiers=self.tiers.astype(str), tournaments=self.tournaments.astype(str),
+            place_codes=self.place_codes.astype(str),
+            **{f'results_{k}': v for k, v in self.result_arrays.items()},
+            **{f'rounds_{k}': v for k, v in self.round_arrays.items()}
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a League written by save."""
+        with np.load(path) as data:
+            results = {k[len('results_'):]: data[k] for k in data.files if k.startswith('results_')}
+            rounds = {k[len('rounds_'):]: data[k] for k in data.files if k.startswith('rounds_')}
+            place_codes = data['place_codes'] if 'place_codes' in data.files else ()
+            return cls(data['players'], data['pdga_numbers'], data['tiers'], data['tournaments'],
+                       results, rounds, data['rating_current'], place_codes)
+
+    def nbytes(self):
+        """Memory held by the typed arrays and lookup tables, in bytes."""
+        arrays = (list(self.result_arrays.values()) + list(self.round_arrays.values()) +
+                  [self.pdga_numbers, self.rating_current])
+        tables = [self.players, self.tiers, self.tournaments, self.place_codes]
+        return (sum(a.nbytes for a in arrays) +
+                sum(a.nbytes + sum(len(str(x)) + 49 for x in a) for a in tables))
+
+    def player_results(self, i):
+        """Zero-copy views of player i's result arrays."""
+        lo, hi = self.result_arrays['offsets'][i], self.result_arrays['offsets'][i + 1]
+        return {k: v[lo:hi] for k, v in self.result_arrays.items() if k != 'offsets'}
+
+    def player_rounds(self, i):
+        """Zero-copy views of player i's round arrays."""
+        lo, hi = self.round_arrays['offsets'][i], self.round_arrays['offsets'][i + 1]
+        return {k: v[lo:hi] for k, v in self.round_arrays.items() if k != 'offsets'}
+
+    def _rows(self, table, players=None, pdga_numbers=None, tiers=None, since=None,
+              until=None, min_rating=None, max_place=None):
+        """Row positions and owning players of a table matching LeagueDB filters."""
+        arrays = self.result_arrays if table == 'results' else self.round_arrays
+        offsets = arrays['offsets']
+
+        selected = np.arange(len(self.players))
+        if players is not None:
+            selected = np.array([self.index[p] for p in players if p in self.index], dtype=np.intp)
+        if pdga_numbers is not None:
+            selected = selected[np.isin(self.pdga_numbers[selected], np.asarray(pdga_numbers, dtype=np.int32))]
+
+        # Concatenate the selected players' row ranges
+        counts = offsets[selected + 1] - offsets[selected]
+        owner = np.repeat(selected, counts)
+        rows = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + offsets[owner]
+
+        keep = np.ones(len(rows), dtype=bool)
+        if tiers is not None:
+            codes = [k for k, t in enumerate(self.tiers) if t in tiers]
+            keep &= np.isin(arrays['tier'][rows], codes)
+        if since is not None:
+            keep &= arrays['day'][rows] >= _days([pd.Timestamp(since).date().isoformat()])[0]
+        if until is not None:
+            day = arrays['day'][rows]
+            keep &= (day != MISSING) & (day <= _days([pd.Timestamp(until).date().isoformat()])[0])
+        if max_place is not None and table == 'results':
+            place = arrays['place'][rows]
+            keep &= (place >= 0) & (place <= max_place)
+        if min_rating is not None:
+            keep &= self.rating_current[owner] >= min_rating
+        rows, owner = rows[keep], owner[keep]
+
+        # Same order as LeagueDB: by PDGA number, then date
+        order = np.lexsort((arrays['day'][rows], self.pdga_numbers[owner]))
+        return rows[order], owner[order]
+
+    def _dates(self, days):
+        """Day numbers back to ISO date strings, None where missing."""
+        dates = np.datetime_as_string(EPOCH + days.astype('timedelta64[D]'), unit='D').astype(object)
+        dates[days == MISSING] = None
+        return dates
+
+    def _place_strings(self, place):
+        """Places back to their scraped strings: numbers, codes such as 'DNS', None where missing."""
+        strings = place.astype(str).astype(object)
+        coded = place <= -2
+        strings[coded] = self.place_codes[-2 - place[coded].astype(np.intp)]
+        strings[place == MISSING] = None
+        return strings
+
+    def results_frame(self, rows, owner):
+        """DataFrame of result rows in LeagueDB.results format."""
+        place = self.result_arrays['place'][rows]
+        return pd.DataFrame({
+            'Player': self.players[owner],
+            'pdga_number': self.pdga_numbers[owner],
+            'Tournament': self.tournaments[self.result_arrays['tournament'][rows]],
+            'Date': self._dates(self.result_arrays['day'][rows]),
+            'Tier': self.tiers[self.result_arrays['tier'][rows]],
+            'Place': self._place_strings(place),
+            'place': np.where(place < 0, np.nan, place)
+        })
+
+    def results(self, **filters):
+        """
+        Tournament results with the same filters and columns as LeagueDB.results.
+
+        Non-numeric places keep their scraped code ('DNF', 'DNS', 'DQ').
+        """
+        rows, owner = self._rows('results', **filters)
+        return self.results_frame(rows, owner)
+
+    def ratings(self, **filters):
+        """Round ratings with the same filters and columns as LeagueDB.ratings."""
+        filters.pop('max_place', None)
+        rows, owner = self._rows('rounds', **filters)
+        rating = self.round_arrays['rating'][rows]
+        rnd = self.round_arrays['round'][rows]
+        return pd.DataFrame({
+            'Player': self.players[owner],
+            'pdga_number': self.pdga_numbers[owner],
+            'Tournament': self.tournaments[self.round_arrays['tournament'][rows]],
+            'Date': self._dates(self.round_arrays['day'][rows]),
+            'Tier': self.tiers[self.round_arrays['tier'][rows]],
+            'Round': np.where(rnd == MISSING, None, rnd.astype(str)),
+            'Rating': np.where(rating == MISSING, np.nan, rating)
+        })
+
+def blob_nbytes(df):
+    """Memory held by a DataFrame's stats_data and ratings_data columns, in bytes."""
+    return int(df[['stats_data', 'ratings_data']].memory_usage(deep=True, index=False).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a compact typed league file from a dataset')
+    parser.add_argument('dataset_csv', help='Player dataset with stats_data and ratings_data')
+    parser.add_argument('output', help='Path to save the .npz league file')
+
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.dataset_csv)
+    league = League.from_dataframe(df)
+    league.save(args.output)
+
+    before, after = blob_nbytes(df), league.nbytes()
+    print(f"Blob columns: {before / 1e6:.1f} MB, typed league: {after / 1e6:.1f} MB "
+          f"({before / after:.1f}x smaller)")
+    print(f"League saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
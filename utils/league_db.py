@@ -0,0 +1,244 @@
+import sqlite3
+
+import pandas as pd
+
+from .feature_extraction import parse_player_data
+
+BLOB_COLUMNS = ['stats_data', 'ratings_data']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    pdga_number INTEGER PRIMARY KEY,
+    Player TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    pdga_number INTEGER NOT NULL,
+    event TEXT,
+    date TEXT,
+    tier TEXT,
+    place INTEGER,
+    place_raw TEXT
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    pdga_number INTEGER NOT NULL,
+    event TEXT,
+    date TEXT,
+    tier TEXT,
+    round TEXT,
+    rating INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_player_date ON results (pdga_number, date);
+CREATE INDEX IF NOT EXISTS results_event_place ON results (event, place);
+CREATE INDEX IF NOT EXISTS results_tier ON results (tier);
+CREATE INDEX IF NOT EXISTS ratings_player_date ON ratings (pdga_number, date);
+CREATE INDEX IF NOT EXISTS ratings_tier ON ratings (tier);
+"""
+
+def _to_int(value):
+    """Parse an integer place or rating, returning None for DNF and the like."""
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+def load_into_db(df, path):
+    """
+    Load player, results and ratings tables into an SQLite database file.
+
+    Players already in the database are replaced, so the function can be called
+    once per chunk of a streaming run or to refresh a subset of players.
+
+    Args:
+        df: DataFrame with scraped player data, features and stats/ratings blobs
+        path: Path to the SQLite database file
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+
+        # Player table carries every scalar column, adding new ones as they appear
+        scalar_cols = [c for c in df.columns if c not in BLOB_COLUMNS]
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(players)')}
+        for col in scalar_cols:
+            if col not in existing:
+                conn.execute(f'ALTER TABLE players ADD COLUMN "{col}"')
+
+        players = df[scalar_cols].astype(object).where(df[scalar_cols].notna(), None)
+        placeholders = ', '.join('?' for _ in scalar_cols)
+        columns = ', '.join(f'"{c}"' for c in scalar_cols)
+
+        pdga_numbers = [(int(x),) for x in df['pdga_number']]
+        conn.executemany('DELETE FROM results WHERE pdga_number = ?', pdga_numbers)
+        conn.executemany('DELETE FROM ratings WHERE pdga_number = ?', pdga_numbers)
+        conn.executemany(
+            f'INSERT OR REPLACE INTO players ({columns}) VALUES ({placeholders})',
+            players.itertuples(index=False, name=None)
+        )
+
+        results, ratings = [], []
+        for pdga_number, stats_data, ratings_data in zip(
+            df['pdga_number'], df['stats_data'], df['ratings_data']
+        ):
+            pdga_number = int(pdga_number)
+            stats = parse_player_data(stats_data) or {}
+            results.extend(
+                (pdga_number, event, date, tier, _to_int(place), str(place))
+                for place, tier, date, event in zip(
+                    stats.get('Place', []), stats.get('Tier', []),
+                    stats.get('Date', []), stats.get('Tournament', [])
+                )
+            )
+            rounds = parse_player_data(ratings_data) or {}
+            ratings.extend(
+                (pdga_number, event, date, tier, str(rnd), _to_int(rating))
+                for rating, date, event, tier, rnd in zip(
+                    rounds.get('Rating', []), rounds.get('Date', []),
+                    rounds.get('Tournament', []), rounds.get('Tier', []),
+                    rounds.get('Round', [''] * len(rounds.get('Rating', [])))
+                )
+            )
+
+        conn.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)', results)
+        conn.executemany('INSERT INTO ratings VALUES (?, ?, ?, ?, ?, ?)', ratings)
+        conn.commit()
+    finally:
+        conn.close()
+
+def update_player_column(path, column, pdga_numbers, values):
+    """
+    Overwrite one player column, e.g. league-wide percentiles after a streaming run.
+    
+    Args:
+        path: Path to the SQLite database file
+        column: Player column to update
+        pdga_numbers: PDGA numbers of the players to update
+        values: New values aligned with pdga_numbers
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            f'UPDATE players SET "{column}" = ? WHERE pdga_number = ?',
+            [(None if pd.isna(v) else float(v), int(p)) for p, v in zip(pdga_numbers, values)]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+class LeagueDB:
+    """
+    Query API over a league database built by load_into_db.
+
+    Filters are applied in SQL against the indexed tables, so only matching
+    rows are read into pandas.
+    """
+
+    def __init__(self, path):
+        """Open a league database file."""
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def query(self, sql, params=()):
+        """Run raw SQL and return a DataFrame."""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def _filters(self, table, players=None, pdga_numbers=None, tiers=None, since=None,
+                 until=None, min_rating=None, max_place=None):
+        """Build a WHERE clause and parameters for the common filters."""
+        clauses, params = [], []
+        if players is not None:
+            clauses.append(f'p.Player IN ({", ".join("?" for _ in players)})')
+            params.extend(players)
+        if pdga_numbers is not None:
+            clauses.append(f'{table}.pdga_number IN ({", ".join("?" for _ in pdga_numbers)})')
+            params.extend(int(x) for x in pdga_numbers)
+        if tiers is not None:
+            clauses.append(f'{table}.tier IN ({", ".join("?" for _ in tiers)})')
+            params.extend(tiers)
+        if since is not None:
+            clauses.append(f'{table}.date >= ?')
+            params.append(str(pd.Timestamp(since).date()))
+        if until is not None:
+            clauses.append(f'{table}.date <= ?')
+            params.append(str(pd.Timestamp(until).date()))
+        if min_rating is not None:
+            clauses.append('p.rating_current >= ?')
+            params.append(min_rating)
+        if max_place is not None:
+            clauses.append(f'{table}.place <= ?')
+            params.append(max_place)
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        return where, params
+
+    def results(self, **filters):
+        """
+        Tournament results with pushed-down filters.
+
+        Args:
+            players: List of player names
+            pdga_numbers: List of PDGA numbers
+            tiers: List of tier codes, e.g. ['M', 'XM']
+            since, until: Date bounds (inclusive)
+            min_rating: Minimum current player rating
+            max_place: Worst place to include
+
+        Returns:
+            DataFrame with 'Player', 'pdga_number', 'Tournament', 'Date', 'Tier',
+            'Place' (as scraped) and 'place' (numeric or null), sorted by player and date
+        """
+        where, params = self._filters('results', **filters)
+        return self.query(f"""
+            SELECT p.Player, results.pdga_number, results.event AS Tournament,
+                   results.date AS Date, results.tier AS Tier,
+                   results.place_raw AS Place, results.place
+            FROM results JOIN players p USING (pdga_number)
+            {where}
+            ORDER BY results.pdga_number, results.date
+        """, params)
+
+    def ratings(self, **filters):
+        """
+        Round ratings with pushed-down filters (see results for the filter arguments).
+
+        Returns:
+            DataFrame with 'Player', 'pdga_number', 'Tournament', 'Date', 'Tier',
+            'Round' and 'Rating', sorted by player and date
+        """
+        filters.pop('max_place', None)
+        where, params = self._filters('ratings', **filters)
+        return self.query(f"""
+            SELECT p.Player, ratings.pdga_number, ratings.event AS Tournament,
+                   ratings.date AS Date, ratings.tier AS Tier,
+                   ratings.round AS Round, ratings.rating AS Rating
+            FROM ratings JOIN players p USING (pdga_number)
+            {where}
+            ORDER BY ratings.pdga_number, ratings.date
+        """, params)
+
+    def average_finish(self, min_events=1, **filters):
+        """
+        Average numeric finish per player, best first.
+
+        For example, best average finish at Majors since 2023 among players
+        rated 1030 or more:
+            db.average_finish(tiers=['M', 'XM'], since='2023-01-01', min_rating=1030)
+
+        Args:
+            min_events: Minimum number of results a player needs to be included
+            **filters: Filters as in results
+
+        Returns:
+            DataFrame with 'Player', 'pdga_number', 'events', 'avg_place', 'best_place'
+        """
+        where, params = self._filters('results', **filters)
+        where = f'{where} AND results.place IS NOT NULL' if where else 'WHERE results.place IS NOT NULL'
+        return self.query(f"""
+            SELECT p.Player, results.pdga_number, COUNT(*) AS events,
+                   AVG(results.place) AS avg_place, MIN(results.place) AS best_place
+            FROM results JOIN players p USING (pdga_number)
+            {where}
+            GROUP BY results.pdga_number
+            HAVING COUNT(*) >= ?
+            ORDER BY avg_place
+        """, params + [min_events])
@@ -0,0 +1,310 @@
+import argparse
+import json
+import warnings
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .expected_points import expected_points, load_points_table
+from .feature_extraction import (
+    fantasy_points_from_arrays,
+    points_vector,
+    stats_to_arrays,
+    tier_multiplier
+)
+from .rating_model import VALID_TIERS, ratings_long
+from .schedule import event_key
+
+SECONDS_PER_YEAR = 365.25 * 24 * 60 * 60
+
+def _years(dates):
+    """Convert dates to fractional years since the Unix epoch."""
+    dates = pd.to_datetime(pd.Series(dates))
+    return (dates - pd.Timestamp(0)).dt.total_seconds().to_numpy() / SECONDS_PER_YEAR
+
+def _to_int(value):
+    """Parse an integer place or rating, returning None for DNF and the like."""
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+class ProjectionEngine:
+    """
+    In-memory rest-of-season projections that update as event results arrive.
+
+    Each player keeps running sums of decayed round ratings over a sliding
+    window, matching ratings_composite: weights are exp(decay_rate * t) for a
+    round at time t, so the weighted mean is unchanged by the reference date
+    and only rounds leaving the window need subtracting. New results touch
+    only the players in that event's field. Projections are each player's
+    expected points per event (from the points table) times the remaining
+    schedule's tier multipliers.
+    """
+
+    def __init__(self, df, schedule, table, points_map, season=None, decay_rate=0.1,
+                 window_years=3, prior_strength=10.0):
+        """
+        Args:
+            df: Player DataFrame with 'Player', 'pdga_number', 'ratings_data' and 'stats_data'
+            schedule: DataFrame of the season's remaining events with 'Tournament'
+                and 'Tier' columns, in schedule order
+            table: Points table from expected_points.load_points_table
+            points_map: Dictionary mapping places to point values
+            season: Season whose points to date are counted (defaults to the current year)
+            decay_rate: Exponential decay rate as in ratings_composite
+            window_years: Rounds older than this relative to a player's latest round are dropped
+            prior_strength: Pseudo-round count shrinking each player's spread toward the league's
+        """
+        self.players = df['Player'].tolist()
+        self.pdga_numbers = df['pdga_number'].astype(int).to_numpy()
+        self.row = {pdga: i for i, pdga in enumerate(self.pdga_numbers)}
+        self.table = table
+        self.points_vec = points_vector(points_map)
+        self.season = season if season is not None else pd.Timestamp.now().year
+        self.decay_rate = decay_rate
+        self.window_years = window_years
+        self.prior_strength = prior_strength
+        self.ingested = set()
+
+        self.remaining = schedule[['Tournament', 'Tier']].reset_index(drop=True)
+        unscored = self.remaining[[tier_multiplier(t) == 0 for t in self.remaining['Tier']]]
+        if len(unscored):
+            warnings.warn(f"{len(unscored)} scheduled events have a non-scoring tier and add no "
+                          f"projected points: {', '.join(map(str, unscored['Tournament']))}")
+        self._update_remaining()
+
+        n_players = len(df)
+        self.points_to_date = np.zeros(n_players)
+        for i, stats_data in enumerate(df['stats_data']):
+            try:
+                place, multiplier, year = stats_to_arrays(stats_data)
+            except Exception:
+                continue
+            self.points_to_date[i] = fantasy_points_from_arrays(
+                place, multiplier, year, self.points_vec, [self.season]
+            )[0]
+
+        # Rounds inside each player's window, oldest first
+        long_df = ratings_long(df)
+        long_df = long_df[long_df['Tier'].isin(VALID_TIERS) & long_df['Rating'].notna()]
+        long_df = long_df.assign(t=_years(long_df['Date'])).sort_values(['player', 't'])
+        latest = long_df.groupby('player')['t'].transform('max')
+        long_df = long_df[latest - long_df['t'] <= window_years]
+
+        # Weights are taken relative to a fixed origin so they stay O(1) for decades
+        self.origin = long_df['t'].max() if len(long_df) else 0.0
+        player = long_df['player'].to_numpy()
+        t = long_df['t'].to_numpy()
+        x = long_df['Rating'].to_numpy()
+        w = np.exp(decay_rate * (t - self.origin))
+
+        self.sw = np.bincount(player, weights=w, minlength=n_players)
+        self.sw2 = np.bincount(player, weights=w ** 2, minlength=n_players)
+        self.swx = np.bincount(player, weights=w * x, minlength=n_players)
+        self.swx2 = np.bincount(player, weights=w * x ** 2, minlength=n_players)
+
+        self.rounds = [deque() for _ in range(n_players)]
+        bounds = np.searchsorted(player, np.arange(n_players + 1))
+        for i in range(n_players):
+            self.rounds[i].extend(zip(t[bounds[i]:bounds[i + 1]], x[bounds[i]:bounds[i + 1]]))
+
+        # League spread of round ratings, used as the prior on each player's sigma
+        rows = np.nonzero(self._n_eff() > 1)[0]
+        self.prior_var = np.median(self._sample_var(rows)) if len(rows) else 22.0 ** 2
+
+        self.mu = np.full(n_players, np.nan)
+        self.sigma = np.full(n_players, np.nan)
+        self.base_points = np.zeros(n_players)
+        self._refresh(np.arange(n_players))
+
+    def _n_eff(self, rows=slice(None)):
+        """Effective number of rounds for players."""
+        sw, sw2 = self.sw[rows], self.sw2[rows]
+        return np.divide(sw ** 2, sw2, out=np.zeros_like(sw), where=sw2 > 0)
+
+    def _sample_var(self, rows):
+        """Weighted variance of round ratings for players."""
+        sw = self.sw[rows]
+        mean = self.swx[rows] / sw
+        return np.maximum(self.swx2[rows] / sw - mean ** 2, 0.0)
+
+    def _refresh(self, rows):
+        """Recompute rating estimates and expected points for the given players."""
+        rows = np.asarray(rows, dtype=np.intp)
+        sw = self.sw[rows]
+        observed = sw > 0
+
+        mu = np.full(len(rows), np.nan)
+        mu[observed] = self.swx[rows][observed] / sw[observed]
+
+        # Shrink each player's spread toward the league's by their effective rounds
+        n_eff = self._n_eff(rows)
+        var = np.full(len(rows), self.prior_var)
+        var[observed] = self._sample_var(rows[observed])
+        sigma = np.sqrt(
+            (self.prior_strength * self.prior_var + n_eff * var) / (self.prior_strength + n_eff)
+        )
+
+        points = expected_points(self.table, np.nan_to_num(mu), sigma)
+        self.base_points[rows] = np.where(observed, points, 0.0)
+        self.mu[rows] = mu
+        self.sigma[rows] = sigma
+
+    def _update_remaining(self):
+        """Total tier multiplier of the events left in the schedule."""
+        self.remaining_multiplier = float(sum(tier_multiplier(t) for t in self.remaining['Tier']))
+
+    def _add_round(self, i, t, rating):
+        """Add one round to a player's running sums."""
+        w = np.exp(self.decay_rate * (t - self.origin))
+        self.sw[i] += w
+        self.sw2[i] += w ** 2
+        self.swx[i] += w * rating
+        self.swx2[i] += w * rating ** 2
+        self.rounds[i].append((t, rating))
+
+    def _evict(self, i, latest):
+        """Drop a player's rounds that have left the window."""
+        rounds = self.rounds[i]
+        while rounds and latest - rounds[0][0] > self.window_years:
+            t, rating = rounds.popleft()
+            w = np.exp(self.decay_rate * (t - self.origin))
+            self.sw[i] -= w
+            self.sw2[i] -= w ** 2
+            self.swx[i] -= w * rating
+            self.swx2[i] -= w * rating ** 2
+        if not rounds:
+            # Clear accumulated rounding error once the window is empty
+            self.sw[i] = self.sw2[i] = self.swx[i] = self.swx2[i] = 0.0
+
+    def ingest_event(self, results, event, tier, date):
+        """
+        Update projections with one event's results.
+
+        Only players in the event's field are touched. Ingesting the same
+        event twice has no effect. Only events on the remaining schedule and
+        in the engine's season are accepted: any other event (a past edition
+        of a scheduled event, or one already in the scraped blobs) would
+        count its places and rounds a second time.
+
+        Args:
+            results: Event results DataFrame as returned by scrape_event_results
+                ('PDGA#', 'Place' and rating_N round rating columns)
+            event: Event name, matched against the schedule's 'Tournament' column
+                by schedule.event_key, so sponsor and series decorations may differ
+            tier: Event tier code
+            date: Event date
+
+        Returns:
+            Number of league players updated
+
+        Raises:
+            ValueError: If the event is outside the season or not on the
+                remaining schedule
+        """
+        key = event_key(event)
+        if key in self.ingested:
+            return 0
+        if pd.Timestamp(date).year != self.season:
+            raise ValueError(f"{event} ({date}) is outside the {self.season} season; not ingested")
+        scheduled = (self.remaining['Tournament'].map(event_key) == key).to_numpy()
+        if not scheduled.any():
+            raise ValueError(f"{event} is not on the remaining schedule; not ingested")
+        self.ingested.add(key)
+
+        t = _years([date])[0]
+        multiplier = tier_multiplier(tier)
+        rating_cols = [c for c in results.columns if c.startswith('rating_')]
+
+        updated = []
+        with instrumentation.stage('ingest_event'):
+            for _, result in results.iterrows():
+                i = self.row.get(_to_int(result.get('PDGA#')))
+                if i is None:
+                    continue
+                updated.append(i)
+
+                place = _to_int(result.get('Place'))
+                if place is not None and place < len(self.points_vec):
+                    self.points_to_date[i] += self.points_vec[place] * multiplier
+
+                if tier in VALID_TIERS:
+                    for col in rating_cols:
+                        rating = _to_int(result[col])
+                        if rating is not None:
+                            self._add_round(i, t, rating)
+                    self._evict(i, t)
+
+            if updated:
+                self._refresh(updated)
+            self.remaining = self.remaining[~scheduled].reset_index(drop=True)
+            self._update_remaining()
+
+        instrumentation.count('events_ingested')
+        instrumentation.count('players_updated', len(updated))
+        return len(updated)
+
+    def projections(self):
+        """
+        Current rest-of-season projections for every player.
+
+        Returns:
+            DataFrame with 'Player', 'pdga_number', 'rating', 'rating_sigma',
+            'points_to_date', 'ros_points' and 'season_points', best projected first
+        """
+        ros = self.base_points * self.remaining_multiplier
+        return pd.DataFrame({
+            'Player': self.players,
+            'pdga_number': self.pdga_numbers,
+            'rating': np.round(self.mu, 1),
+            'rating_sigma': np.round(self.sigma, 1),
+            'points_to_date': self.points_to_date,
+            'ros_points': np.round(ros, 1),
+            'season_points': np.round(self.points_to_date + ros, 1)
+        }).sort_values('ros_points', ascending=False, ignore_index=True)
+
+    def player(self, name):
+        """
+        Current projection for one player.
+
+        Returns:
+            Dictionary with the same fields as projections, plus 'remaining_events'
+        """
+        i = self.players.index(name)
+        ros = self.base_points[i] * self.remaining_multiplier
+        return {
+            'Player': name,
+            'pdga_number': int(self.pdga_numbers[i]),
+            'rating': None if np.isnan(self.mu[i]) else round(float(self.mu[i]), 1),
+            'rating_sigma': round(float(self.sigma[i]), 1),
+            'points_to_date': float(self.points_to_date[i]),
+            'ros_points': round(float(ros), 1),
+            'season_points': round(float(self.points_to_date[i] + ros), 1),
+            'remaining_events': len(self.remaining)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Rest-of-season fantasy projections')
+    parser.add_argument('dataset_csv', help='Player dataset with ratings_data and stats_data')
+    parser.add_argument('schedule_csv', help='Remaining events with Tournament and Tier columns')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--points-table', default='data/points_table.npz',
+                      help='Cached rating-to-points lookup table')
+    parser.add_argument('--season', type=int, help='Season to count points to date for')
+    parser.add_argument('--top', type=int, default=25, help='Number of players to show')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    engine = ProjectionEngine(
+        pd.read_csv(args.dataset_csv), pd.read_csv(args.schedule_csv),
+        load_points_table(args.points_table, points_map), points_map, season=args.season
+    )
+    print(engine.projections().head(args.top).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+
+from .feature_extraction import parse_player_data
+
+VALID_TIERS = ['A', 'ES', 'M', 'XM']
+
+# Prior round-to-round rating variance when no player has repeat rounds to
+# estimate it from (a typical touring pro's standard deviation is ~20)
+FALLBACK_SIGMA2 = 20.0 ** 2
+# Prior mean and between-player variance of ratings when fewer players have
+# rounds than they need (none for the mean, two for the variance)
+FALLBACK_MU = 950.0
+FALLBACK_TAU2 = 40.0 ** 2
+
+def ratings_long(df):
+    """
+    Flatten every player's ratings_data blob into long-format arrays.
+
+    Args:
+        df: DataFrame with a 'ratings_data' column
+
+    Returns:
+        DataFrame with one row per round: 'player' (positional index into df),
+        'Rating' (float), 'Date' (datetime64) and 'Tier'
+    """
+    players, ratings, dates, tiers = [], [], [], []
+    for i, ratings_data in enumerate(df['ratings_data']):
+        try:
+            data = parse_player_data(ratings_data)
+        except Exception as e:
+            print(f"Error processing ratings data for row {i}: {e}")
+            continue
+        if not data or 'Rating' not in data:
+            continue
+        players.append(np.full(len(data['Rating']), i))
+        ratings.extend(data['Rating'])
+        dates.extend(data['Date'])
+        tiers.extend(data['Tier'])
+
+    return pd.DataFrame({
+        'player': np.concatenate(players) if players else np.array([], dtype=int),
+        'Rating': pd.to_numeric(pd.Series(ratings, dtype=object), errors='coerce').astype(float),
+        'Date': pd.to_datetime(pd.Series(dates, dtype=object)),
+        'Tier': pd.Series(tiers, dtype=object)
+    })
+
+def decay_weights(long_df, decay_rate=0.1, ref_date=None, window_years=3):
+    """
+    Exponential time-decay weights matching ratings_composite.
+
+    Args:
+        long_df: Long-format ratings from ratings_long
+        decay_rate: Controls how quickly older ratings decay (None = no decay)
+        ref_date: Reference date (defaults to each player's most recent round)
+        window_years: Rounds older than this get zero weight (None = no cutoff)
+
+    Returns:
+        numpy array of weights aligned with long_df
+    """
+    if ref_date is None:
+        ref = long_df.groupby('player')['Date'].transform('max')
+    else:
+        ref = pd.Timestamp(ref_date)
+
+    years_ago = ((ref - long_df['Date']).dt.total_seconds() / (365.25 * 24 * 60 * 60)).to_numpy()
+
+    if decay_rate is None:
+        weights = np.ones(len(long_df))
+    else:
+        weights = np.exp(-decay_rate * years_ago)
+
+    if window_years is not None:
+        weights[years_ago > window_years] = 0
+    # Rounds after an explicit reference date are not yet observed
+    weights[years_ago < 0] = 0
+    return weights
+
+def fit_rating_model(df, decay_rate=None, ref_date=None, window_years=3, prior_strength=10.0,
+                     long_df=None):
+    """
+    Fit an empirical-Bayes normal model of round ratings for every player at once.
+
+    Each player's rounds are modeled as R ~ N(mu_i, sigma_i). A league-level
+    prior is estimated from all players: mu_i ~ N(m0, tau^2) by method of moments,
+    and sigma_i^2 ~ scaled-inv-chi^2(prior_strength, s0^2). The prior falls
+    back to fixed values when the league is too small to estimate it: s0^2 to
+    FALLBACK_SIGMA2 when no player has more than one effective round, tau^2
+    to FALLBACK_TAU2 with fewer than two observed players and m0 to
+    FALLBACK_MU with none.
+    Posteriors are computed in closed form, shrinking players with few rounds
+    toward the league. Weighted rounds count through their effective sample
+    size.
+
+    Args:
+        df: DataFrame with a 'ratings_data' column
+        decay_rate: Exponential decay rate as in ratings_composite (None = unweighted)
+        ref_date: Reference date for decay (defaults to each player's latest round)
+        window_years: Ignore rounds older than this many years (None = keep all)
+        prior_strength: Pseudo-round count of the prior on sigma
+        long_df: Optional precomputed output of ratings_long(df)
+
+    Returns:
+        Dictionary with the league 'prior' and per-player arrays aligned with df:
+        'mu_mean', 'mu_var', 'sigma2_scale', 'sigma2_df', 'sigma_mean' (posterior
+        mean of sigma), 'n_eff'
+    """
+    if long_df is None:
+        long_df = ratings_long(df)
+    long_df = long_df[long_df['Tier'].isin(VALID_TIERS) & long_df['Rating'].notna()]
+
+    n_players = len(df)
+    player = long_df['player'].to_numpy()
+    x = long_df['Rating'].to_numpy()
+    w = decay_weights(long_df, decay_rate, ref_date, window_years)
+
+    # Weighted sufficient statistics per player
+    sw = np.bincount(player, weights=w, minlength=n_players)
+    sw2 = np.bincount(player, weights=w ** 2, minlength=n_players)
+    swx = np.bincount(player, weights=w * x, minlength=n_players)
+
+    observed = sw > 0
+    xbar = np.full(n_players, np.nan)
+    xbar[observed] = swx[observed] / sw[observed]
+
+    n_eff = np.zeros(n_players)
+    n_eff[observed] = sw[observed] ** 2 / sw2[observed]
+
+    resid = x - np.nan_to_num(xbar)[player]
+    sq = np.bincount(player, weights=w * resid ** 2, minlength=n_players)
+    s2 = np.full(n_players, np.nan)
+    multi = n_eff > 1
+    s2[multi] = sq[multi] / sw[multi] * n_eff[multi] / (n_eff[multi] - 1)
+
+    # League prior on sigma^2, weighted by each player's degrees of freedom
+    dof = np.where(multi, n_eff - 1, 0)
+    s0_2 = np.sum(dof[multi] * s2[multi]) / np.sum(dof[multi]) if multi.any() else FALLBACK_SIGMA2
+    nu0 = prior_strength
+
+    sigma2_df = nu0 + dof
+    sigma2_scale = (nu0 * s0_2 + dof * np.nan_to_num(s2)) / sigma2_df
+    sigma2_post = sigma2_scale * sigma2_df / (sigma2_df - 2)
+
+    # League prior on mu: between-player variance net of sampling noise
+    n_observed = np.count_nonzero(observed)
+    m0 = np.mean(xbar[observed]) if n_observed else FALLBACK_MU
+    if n_observed > 1:
+        sampling_var = sigma2_post[observed] / n_eff[observed]
+        tau2 = max(np.var(xbar[observed], ddof=1) - np.mean(sampling_var), 1.0)
+    else:
+        tau2 = FALLBACK_TAU2
+
+    precision = 1 / tau2 + n_eff / sigma2_post
+    mu_var = 1 / precision
+    mu_mean = mu_var * (m0 / tau2 + n_eff * np.nan_to_num(xbar) / sigma2_post)
+
+    return {
+        'prior': {
+            'mu_mean': float(m0),
+            'mu_var': float(tau2),
+            'sigma2_scale': float(s0_2),
+            'sigma2_df': float(nu0)
+        },
+        'mu_mean': mu_mean,
+        'mu_var': mu_var,
+        'sigma2_scale': sigma2_scale,
+        'sigma2_df': sigma2_df,
+        'sigma_mean': _sigma_mean(sigma2_scale, sigma2_df),
+        'n_eff': n_eff
+    }
+
+def _sigma_mean(scale, dof):
+    """
+    Mean of sigma when sigma^2 ~ scaled-inv-chi^2(dof, scale).
+
+    E[sigma] = sqrt(scale * dof / 2) * Gamma((dof - 1) / 2) / Gamma(dof / 2),
+    slightly below sqrt(E[sigma^2]).
+    """
+    return np.sqrt(scale * dof / 2) * np.exp(gammaln((dof - 1) / 2) - gammaln(dof / 2))
+
+def posterior_draws(fit, n_draws=1000, seed=None):
+    """
+    Draw per-player (mu, sigma) samples from a fitted rating model.
+
+    Args:
+        fit: Output of fit_rating_model
+        n_draws: Number of draws per player
+        seed: Random seed
+
+    Returns:
+        Tuple of (mu draws, sigma draws), each of shape (n_players, n_draws)
+    """
+    rng = np.random.default_rng(seed)
+    n_players = len(fit['mu_mean'])
+
+    mu = fit['mu_mean'][:, None] + np.sqrt(fit['mu_var'])[:, None] * rng.standard_normal((n_players, n_draws))
+
+    # Scaled inverse chi-squared: sigma^2 = df * scale / chi2(df)
+    dof = fit['sigma2_df'][:, None]
+    chi2 = rng.chisquare(np.broadcast_to(dof, (n_players, n_draws)))
+    sigma = np.sqrt(dof * fit['sigma2_scale'][:, None] / chi2)
+
+    return mu, sigma
+
+def add_rating_posterior(df, **kwargs):
+    """
+    Add posterior rating columns to a player DataFrame.
+
+    Args:
+        df: DataFrame with a 'ratings_data' column
+        **kwargs: Passed through to fit_rating_model
+
+    Returns:
+        DataFrame with added 'rating_mu', 'rating_mu_sd' and 'rating_sigma' columns
+    """
+    fit = fit_rating_model(df, **kwargs)
+    df['rating_mu'] = np.round(fit['mu_mean'], 1)
+    df['rating_mu_sd'] = np.round(np.sqrt(fit['mu_var']), 2)
+    df['rating_sigma'] = np.round(fit['sigma_mean'], 1)
+    return df
@@ -0,0 +1,273 @@
+import argparse
+import html
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from .feature_extraction import parse_player_data
+
+# Fixture files mirror PDGA URL paths:
+#   <root>/player/<pdga>/details.html
+#   <root>/player/<pdga>/stats/<year>.html
+#   <root>/tour/event/<id>.html
+
+def fixture_path(fixtures_dir, url_path):
+    """
+    Map a PDGA URL path to its fixture file.
+
+    Args:
+        fixtures_dir: Root directory of recorded fixtures
+        url_path: URL path such as '/player/75412/details'
+
+    Returns:
+        Path to the fixture file, or None if the path escapes fixtures_dir
+    """
+    rel = url_path.split('?')[0].strip('/')
+    path = os.path.normpath(os.path.join(fixtures_dir, f'{rel}.html'))
+    if not path.startswith(os.path.normpath(fixtures_dir) + os.sep):
+        return None
+    return path
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serve recorded PDGA pages with configurable latency and injected errors."""
+
+    # Set per server by make_server
+    fixtures_dir = 'fixtures'
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    error_status = 503
+    rng = random.Random(0)
+    lock = threading.Lock()
+    stats = None
+
+    def do_GET(self):
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+            self.stats['requests'] += 1
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if fail:
+            with self.lock:
+                self.stats['injected_errors'] += 1
+            self._respond(self.error_status, b'Injected error')
+            return
+
+        path = fixture_path(self.fixtures_dir, self.path)
+        if path is None or not os.path.exists(path):
+            with self.lock:
+                self.stats['not_found'] += 1
+            self._respond(404, b'Fixture not found')
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        with self.lock:
+            self.stats['bytes_served'] += len(body)
+        self._respond(200, body)
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output quiet
+        pass
+
+def make_server(fixtures_dir, host='127.0.0.1', port=8765, latency=0.0, jitter=0.0,
+                error_rate=0.0, error_status=503, seed=0):
+    """
+    Create a replay server for recorded PDGA pages.
+
+    Args:
+        fixtures_dir: Root directory of recorded fixtures
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency: Fixed delay in seconds added to every response
+        jitter: Extra uniform random delay in seconds (0 to jitter)
+        error_rate: Probability of answering with error_status instead of the page
+        error_status: HTTP status used for injected errors
+        seed: Random seed for latency jitter and error injection
+
+    Returns:
+        ThreadingHTTPServer; its 'stats' attribute counts requests served
+    """
+    stats = {'requests': 0, 'bytes_served': 0, 'not_found': 0, 'injected_errors': 0}
+    handler = type('ConfiguredReplayHandler', (ReplayHandler,), {
+        'fixtures_dir': os.path.abspath(fixtures_dir),
+        'latency': latency,
+        'jitter': jitter,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'rng': random.Random(seed),
+        'lock': threading.Lock(),
+        'stats': stats
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.stats = stats
+    return server
+
+def start_replay_server(fixtures_dir, **kwargs):
+    """
+    Start a replay server on a background thread.
+
+    Args:
+        fixtures_dir: Root directory of recorded fixtures
+        **kwargs: Passed through to make_server (port defaults to a free port)
+
+    Returns:
+        Tuple of (server, base_url). Call server.shutdown() when done.
+    """
+    kwargs.setdefault('port', 0)
+    server = make_server(fixtures_dir, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}'
+
+def record_fixtures(pdga_numbers, years, fixtures_dir, event_ids=(), delay=1.5):
+    """
+    Record live PDGA pages as fixtures.
+
+    Args:
+        pdga_numbers: Player PDGA numbers to record details and stats pages for
+        years: Seasons to record stats pages for
+        fixtures_dir: Root directory to write fixtures to
+        event_ids: Event ids to record results pages for
+        delay: Seconds to wait between live requests
+    """
+    from .scraping_utils import fetch_page, player_details_url, player_stats_url, event_url
+
+    urls = []
+    for pdga_number in pdga_numbers:
+        urls.append(player_details_url(pdga_number))
+        urls.extend(player_stats_url(pdga_number, year) for year in years)
+    urls.extend(event_url(event_id) for event_id in event_ids)
+
+    for url in urls:
+        response = fetch_page(url)
+        if response.status_code == 200:
+            path = fixture_path(fixtures_dir, '/' + url.split('://', 1)[-1].split('/', 1)[-1])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+        else:
+            print(f'{response.status_code} for {url}')
+        time.sleep(delay)
+
+def _html_table(table_id, columns, rows):
+    """Render rows as a PDGA-style HTML table."""
+    head = ''.join(f'<th>{html.escape(c)}</th>' for c in columns)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{html.escape(str(v))}</td>' for v in row) + '</tr>'
+        for row in rows
+    )
+    return f'<table id="{table_id}"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+def write_synthetic_fixtures(df, fixtures_dir, years):
+    """
+    Render fixture pages from a scraped (or synthetic) player dataset.
+
+    The pages contain only the elements the scrapers read, so a crawl against
+    them reproduces the dataset's blobs without network access. Results go in
+    the table of the row's 'division' column (MPO if there is none).
+
+    Args:
+        df: DataFrame with scraped player columns and stats/ratings blobs
+        fixtures_dir: Root directory to write fixtures to
+        years: Seasons to write stats pages for
+    """
+    from .scraping_utils import stats_table_id
+
+    for _, row in df.iterrows():
+        player_dir = os.path.join(fixtures_dir, 'player', str(row['pdga_number']))
+        os.makedirs(os.path.join(player_dir, 'stats'), exist_ok=True)
+
+        ratings = parse_player_data(row['ratings_data']) or {}
+        ratings_rows = zip(
+            ratings.get('Tournament', []), ratings.get('Tier', []), ratings.get('Date', []),
+            ratings.get('Round', []), ratings.get('Rating', [])
+        )
+        career = (
+            f'<ul><li class="career-events">Career Events: {row["career_events"]}</li>'
+            f'<li class="join-date">Member Since: {row["join_date"]}</li>'
+            f'<li class="current-rating">Current Rating: {row["rating_current"]}</li>'
+            f'<li class="career-wins">Career Wins: {row["career_wins"]}</li>'
+            f'<li class="career-earnings">Career Earnings: ${row["career_earnings"]}</li></ul>'
+        )
+        details = _html_table('player-results-details',
+                              ['Tournament', 'Tier', 'Date', 'Round', 'Rating'], ratings_rows)
+        with open(os.path.join(player_dir, 'details.html'), 'w') as f:
+            f.write(f'<html><body>{career}{details}</body></html>')
+
+        stats = pd.DataFrame(parse_player_data(row['stats_data']) or
+                             {'Place': [], 'Tier': [], 'Date': [], 'Tournament': []})
+        table_id = stats_table_id(row['division'] if 'division' in row else 'MPO')
+        for year in years:
+            season = stats[stats['Date'].astype(str).str[:4] == str(year)]
+            table = _html_table(table_id, ['Place', 'Tournament', 'Tier', 'Dates'],
+                                season[['Place', 'Tournament', 'Tier', 'Date']].values)
+            with open(os.path.join(player_dir, 'stats', f'{year}.html'), 'w') as f:
+                f.write(f'<html><body>{table}</body></html>')
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded PDGA pages for offline crawling')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help='Serve fixtures over HTTP')
+    serve.add_argument('fixtures_dir', help='Root directory of recorded fixtures')
+    serve.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    serve.add_argument('--port', type=int, default=8765, help='Port to bind')
+    serve.add_argument('--latency', type=float, default=0.0,
+                     help='Fixed delay in seconds added to every response')
+    serve.add_argument('--jitter', type=float, default=0.0,
+                     help='Extra uniform random delay in seconds')
+    serve.add_argument('--error-rate', type=float, default=0.0,
+                     help='Probability of an injected error response')
+    serve.add_argument('--error-status', type=int, default=503,
+                     help='HTTP status for injected errors')
+    serve.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    record = subparsers.add_parser('record', help='Record live PDGA pages as fixtures')
+    record.add_argument('input_csv', help='Path to CSV containing PDGA player numbers')
+    record.add_argument('fixtures_dir', help='Directory to write fixtures to')
+    record.add_argument('--years', nargs='+', type=int, required=True,
+                      help='Seasons to record stats pages for')
+    record.add_argument('--events', nargs='*', type=int, default=[],
+                      help='Event ids to record results pages for')
+
+    synthesize = subparsers.add_parser('synthesize', help='Render fixtures from a dataset CSV')
+    synthesize.add_argument('dataset_csv', help='Scraped or synthetic player dataset')
+    synthesize.add_argument('fixtures_dir', help='Directory to write fixtures to')
+    synthesize.add_argument('--years', nargs='+', type=int, required=True,
+                          help='Seasons to write stats pages for')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = make_server(args.fixtures_dir, args.host, args.port, args.latency, args.jitter,
+                             args.error_rate, args.error_status, args.seed)
+        print(f"Replaying {args.fixtures_dir} at http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"Served: {server.stats}")
+    elif args.command == 'record':
+        players = pd.read_csv(args.input_csv)
+        record_fixtures(players['pdga_number'], args.years, args.fixtures_dir, args.events)
+    else:
+        write_synthetic_fixtures(pd.read_csv(args.dataset_csv), args.fixtures_dir, args.years)
+
+if __name__ == '__main__':
+    main()
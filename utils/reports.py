@@ -0,0 +1,218 @@
+import argparse
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from .analysis_utils import (
+    histogram_base,
+    player_historic_linechart,
+    player_scoring_linechart,
+    player_summary,
+    plot_player_histogram,
+    plot_scatterplot,
+    scatterplot_base
+)
+from .feature_extraction import fantasy_points_seasons
+
+FORMATS = ['html', 'png']
+
+def latest_points_column(df):
+    """Most recent fantasy_points_YY column in a dataset."""
+    return f'fantasy_points_{str(max(fantasy_points_seasons(df.columns)))[-2:]}'
+
+def player_slug(player_name, pdga_number):
+    """File-name-safe identifier for a player's report."""
+    name = re.sub(r'[^a-z0-9]+', '-', player_name.lower()).strip('-')
+    return f'{name}-{pdga_number}'
+
+def build_base_figures(df):
+    """
+    League-wide figures shared by every player's report.
+
+    Returns:
+        Dictionary with the 'rating_distribution' histogram and the
+        'points_vs_rating' scatter plot, without any player highlighted
+    """
+    points_col = latest_points_column(df)
+    return {
+        'rating_distribution': histogram_base(df, 'composite_rating', nbins=45),
+        'points_vs_rating': scatterplot_base(df, points_col, 'composite_rating',
+                                             highlight=True, x_reference=50)
+    }
+
+def _summary_html(df, player_name):
+    """Summary card matching the dashboard's Player and Scoring Summary cards."""
+    points_col = latest_points_column(df)
+    rows = []
+    for label, column in [('Composite Rating', 'composite_rating'),
+                          (f'20{points_col[-2:]} Fantasy Points', points_col)]:
+        summary = player_summary(df, column, player_name)
+        rows.append(
+            f"<tr><td>{label}</td><td>{summary['value']:.1f}</td><td>{summary['rank']}</td>"
+            f"<td>{summary['percentile']}</td><td>{summary['pct_of_max']}%</td></tr>"
+        )
+    return ("<table><tr><th></th><th>Value</th><th>Rank</th><th>Percentile</th>"
+            "<th>% of Max</th></tr>" + ''.join(rows) + "</table>")
+
+def player_figures(df, player_name, base_figs, points_map_file):
+    """
+    Every chart in a player's report, built from the shared base figures.
+
+    Returns:
+        Dictionary mapping chart names to Plotly figures (None when the player
+        has no data for a chart)
+    """
+    points_col = latest_points_column(df)
+    return {
+        'tournament_history': player_historic_linechart(df, player_name),
+        'fantasy_scoring': player_scoring_linechart(df, player_name, points_map_file=points_map_file),
+        'rating_distribution': plot_player_histogram(
+            df, 'composite_rating', player_name, base_fig=base_figs['rating_distribution']
+        ),
+        'points_vs_rating': plot_scatterplot(
+            df, col_x=points_col, col_y='composite_rating', player_name=player_name,
+            x_reference=50, base_fig=base_figs['points_vs_rating']
+        )
+    }
+
+def render_player_report(df, player_name, base_figs, output_dir, formats=('html',),
+                         points_map_file='data/points_map_2025.json'):
+    """
+    Write one player's report.
+
+    HTML reports load plotly.js from the shared copy in output_dir written by
+    write_reports. PNG charts need the optional kaleido package.
+
+    Returns:
+        Path of the player's HTML report, or of their PNG directory
+    """
+    pdga_number = df.loc[df['Player'] == player_name, 'pdga_number'].iloc[0]
+    slug = player_slug(player_name, pdga_number)
+    figures = player_figures(df, player_name, base_figs, points_map_file)
+
+    if 'png' in formats:
+        png_dir = os.path.join(output_dir, 'players', slug)
+        os.makedirs(png_dir, exist_ok=True)
+        for name, fig in figures.items():
+            if fig is not None:
+                fig.write_image(os.path.join(png_dir, f'{name}.png'), width=1000, height=500)
+
+    if 'html' not in formats:
+        return os.path.join(output_dir, 'players', slug)
+
+    sections = [f"<h1>{html.escape(player_name)}</h1>", _summary_html(df, player_name)]
+    for name, fig in figures.items():
+        sections.append(f"<h2>{name.replace('_', ' ').title()}</h2>")
+        if fig is None:
+            sections.append("<p>No data</p>")
+        else:
+            sections.append(fig.to_html(full_html=False, include_plotlyjs=False))
+
+    path = os.path.join(output_dir, 'players', f'{slug}.html')
+    with open(path, 'w') as f:
+        f.write(
+            "<html><head><meta charset='utf-8'><script src='../plotly.min.js'></script></head>"
+            f"<body><p><a href='../index.html'>All players</a></p>{''.join(sections)}</body></html>"
+        )
+    return path
+
+def _render_shard(args):
+    """Process pool worker: render reports for a shard of players."""
+    df, players, base_figs, output_dir, formats, points_map_file = args
+    paths = []
+    for player_name in players:
+        try:
+            paths.append(render_player_report(df, player_name, base_figs, output_dir,
+                                              formats, points_map_file))
+        except Exception as e:
+            print(f"Error rendering report for {player_name}: {e}")
+    return paths
+
+def write_index(df, output_dir):
+    """Write index.html linking every player's report, best composite rating first."""
+    points_col = latest_points_column(df)
+    ranked = df.sort_values('composite_rating', ascending=False)
+    rows = ''.join(
+        f"<tr><td><a href='players/{player_slug(row['Player'], row['pdga_number'])}.html'>"
+        f"{html.escape(row['Player'])}</a></td><td>{row['composite_rating']:.1f}</td>"
+        f"<td>{row[points_col]:.1f}</td></tr>"
+        for _, row in ranked.iterrows()
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w') as f:
+        f.write(
+            "<html><head><meta charset='utf-8'></head><body><h1>Player Reports</h1>"
+            f"<table><tr><th>Player</th><th>Composite Rating</th><th>{points_col}</th></tr>"
+            f"{rows}</table></body></html>"
+        )
+
+def write_reports(df, output_dir, players=None, formats=('html',), workers=None,
+                  points_map_file='data/points_map_2025.json'):
+    """
+    Render static reports for many players.
+
+    League-wide figures are built once and copied for each player. Players are
+    split into contiguous shards rendered across a process pool.
+
+    Args:
+        df: Player dataset with composite and fantasy points columns
+        output_dir: Directory to write index.html and players/ into
+        players: Player names to render (defaults to every player)
+        formats: Any of 'html' and 'png' (PNG requires kaleido)
+        workers: Number of worker processes (None = render in this process)
+        points_map_file: Path to JSON file containing place-to-points mapping
+
+    Returns:
+        List of written report paths
+    """
+    if 'png' in formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            raise ImportError("PNG export requires the kaleido package (pip install kaleido)")
+
+    players = list(df['Player']) if players is None else list(players)
+    os.makedirs(os.path.join(output_dir, 'players'), exist_ok=True)
+    if 'html' in formats:
+        with open(os.path.join(output_dir, 'plotly.min.js'), 'w') as f:
+            f.write(get_plotlyjs())
+        write_index(df[df['Player'].isin(players)], output_dir)
+
+    base_figs = build_base_figures(df)
+
+    if workers is None:
+        return _render_shard((df, players, base_figs, output_dir, formats, points_map_file))
+
+    n_shards = min(len(players), workers * 4) or 1
+    bounds = np.linspace(0, len(players), n_shards + 1).astype(int)
+    shards = [(df, players[lo:hi], base_figs, output_dir, formats, points_map_file)
+              for lo, hi in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [path for paths in executor.map(_render_shard, shards) for path in paths]
+
+def main():
+    parser = argparse.ArgumentParser(description='Export static player reports')
+    parser.add_argument('dataset_csv', help='Player dataset CSV')
+    parser.add_argument('output_dir', help='Directory to write reports to')
+    parser.add_argument('--players', nargs='*', help='Player names to render (defaults to all)')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['html'],
+                      help='Output formats (png requires kaleido)')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = write_reports(pd.read_csv(args.dataset_csv), args.output_dir, args.players,
+                          args.formats, args.workers, args.points_map)
+    print(f"Wrote {len(paths)} player reports to {args.output_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
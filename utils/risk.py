@@ -0,0 +1,197 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from .feature_extraction import points_vector, resolve_rules, stats_to_arrays
+
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+# Board name -> per-event statistic it ranks by (risk_adjusted is avg - aversion * sd)
+BOARDS = {
+    'avg': 'avg',
+    'floor': 'q25',
+    'ceiling': 'q75',
+    'risk_adjusted': None
+}
+
+def event_points_long(df, points_map, seasons, rules=None):
+    """
+    Fantasy points of every player's scoring events in the given seasons.
+
+    Uses the same scoring as player_scoring_linechart: mapped points for the
+    place times the tier multiplier, 0 for unmapped places and DNFs.
+
+    Returns:
+        Tuple of (player positional index, points, place) arrays, one entry
+        per scoring event, sorted by player
+    """
+    rules = resolve_rules(rules)
+    points_vec = points_vector(points_map)
+    seasons = np.asarray(seasons)
+
+    players, points, places = [], [], []
+    for i, stats_data in enumerate(df['stats_data']):
+        try:
+            place, multiplier, year = stats_to_arrays(stats_data, rules)
+        except Exception:
+            continue
+        keep = (multiplier > 0) & np.isin(year, seasons)
+        place, multiplier = place[keep], multiplier[keep]
+        valid = (place >= 0) & (place < len(points_vec))
+        players.append(np.full(len(place), i))
+        points.append(np.where(valid, points_vec[np.where(valid, place, 0)], 0.0) * multiplier)
+        places.append(place)
+
+    if not players:
+        return np.array([], dtype=int), np.array([]), np.array([], dtype=np.int16)
+    return np.concatenate(players), np.concatenate(points), np.concatenate(places)
+
+def group_quantiles(player, values, n_players, quantiles=QUANTILES):
+    """
+    Per-player quantiles with linear interpolation, as np.quantile, in one pass.
+
+    Args:
+        player: Player index per value
+        values: Values
+        n_players: Number of players
+        quantiles: Quantile levels
+
+    Returns:
+        Array of shape (n_players, len(quantiles)); NaN for players without values
+    """
+    order = np.lexsort((values, player))
+    values = values[order]
+    counts = np.bincount(player, minlength=n_players)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    result = np.full((n_players, len(quantiles)), np.nan)
+    has = counts > 0
+    for k, q in enumerate(quantiles):
+        pos = q * (counts[has] - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, counts[has] - 1)
+        frac = pos - lo
+        result[has, k] = (values[offsets[has] + lo] * (1 - frac) +
+                          values[offsets[has] + hi] * frac)
+    return result
+
+def risk_metrics(df, points_map, seasons, rules=None, prior_events=5):
+    """
+    Per-event fantasy points distribution metrics for every player.
+
+    All metrics come from one pass over the league's per-event points:
+      - avg, sd and cv (sd / avg) of points per scoring event
+      - q10 to q90: per-event points quantiles (downside and upside)
+      - p_top10: probability of a top-10 finish per event, shrunk toward the
+        league rate by prior_events pseudo-events
+      - consistency: fraction of events scoring more than the league's median
+        event
+
+    Args:
+        df: DataFrame with 'Player', 'pdga_number' and 'stats_data'
+        points_map: Dictionary mapping places to point values
+        seasons: Seasons whose events to use
+        rules: League rules (defaults to feature_extraction.DEFAULT_RULES)
+        prior_events: Strength of the league prior on p_top10
+
+    Returns:
+        DataFrame with one row per player: 'Player', 'pdga_number', 'events',
+        'events_per_season', the metrics above
+    """
+    n_players = len(df)
+    player, points, place = event_points_long(df, points_map, seasons, rules)
+
+    n = np.bincount(player, minlength=n_players).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(player, weights=points, minlength=n_players) / n
+        sq = np.bincount(player, weights=points ** 2, minlength=n_players)
+        var = np.where(n > 1, (sq - n * mean ** 2) / (n - 1), np.nan)
+        sd = np.sqrt(np.maximum(var, 0))
+        cv = np.where(mean > 0, sd / mean, np.nan)
+
+    top10 = np.bincount(player, weights=((place > 0) & (place <= 10)).astype(float), minlength=n_players)
+    league_rate = top10.sum() / max(n.sum(), 1)
+    p_top10 = (top10 + prior_events * league_rate) / (n + prior_events)
+
+    median = np.median(points) if len(points) else 0.0
+    useful = np.bincount(player, weights=(points > median).astype(float), minlength=n_players)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        consistency = useful / n
+
+    metrics = pd.DataFrame({
+        'Player': df['Player'].to_numpy(),
+        'pdga_number': df['pdga_number'].to_numpy(),
+        'events': n.astype(int),
+        'events_per_season': n / len(seasons),
+        'avg': mean,
+        'sd': sd,
+        'cv': cv
+    })
+    quantiles = group_quantiles(player, points, n_players)
+    for k, q in enumerate(QUANTILES):
+        metrics[f'q{int(round(q * 100))}'] = quantiles[:, k]
+    metrics['p_top10'] = p_top10
+    metrics['consistency'] = consistency
+    return metrics
+
+def draft_board(metrics, board='avg', risk_aversion=1.0, min_events=1):
+    """
+    Rank players for a draft by a risk preference.
+
+    Each board scores a per-event statistic times the player's events per
+    season: 'avg' the average, 'floor' the 25th percentile, 'ceiling' the
+    75th percentile, and 'risk_adjusted' avg - risk_aversion * sd (negative
+    aversion favors volatile players). Only arithmetic on precomputed
+    columns, so re-ranking is instant.
+
+    Args:
+        metrics: DataFrame from risk_metrics
+        board: One of BOARDS
+        risk_aversion: Penalty per standard deviation for 'risk_adjusted'
+        min_events: Players with fewer events are ranked last
+
+    Returns:
+        metrics with 'score' and 'rank' columns, best first
+    """
+    if board not in BOARDS:
+        raise ValueError(f"Unknown board {board!r}; expected one of {list(BOARDS)}")
+
+    if board == 'risk_adjusted':
+        per_event = metrics['avg'] - risk_aversion * metrics['sd'].fillna(0)
+    else:
+        per_event = metrics[BOARDS[board]]
+    score = (per_event * metrics['events_per_season']).where(metrics['events'] >= min_events)
+
+    ranked = metrics.assign(score=score.round(1)).sort_values('score', ascending=False,
+                                                               na_position='last', ignore_index=True)
+    ranked['rank'] = np.arange(1, len(ranked) + 1)
+    return ranked
+
+def main():
+    parser = argparse.ArgumentParser(description='Draft board ranked by a risk preference')
+    parser.add_argument('dataset_csv', help='Player dataset with stats_data')
+    parser.add_argument('--seasons', nargs='+', type=int, required=True,
+                      help='Seasons whose events to use')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--board', choices=list(BOARDS), default='risk_adjusted',
+                      help='Ranking to use')
+    parser.add_argument('--risk-aversion', type=float, default=1.0,
+                      help='Penalty per standard deviation for the risk_adjusted board')
+    parser.add_argument('--min-events', type=int, default=3, help='Minimum events to be ranked')
+    parser.add_argument('--top', type=int, default=25, help='Number of players to show')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    metrics = risk_metrics(pd.read_csv(args.dataset_csv), points_map, args.seasons)
+    board = draft_board(metrics, args.board, args.risk_aversion, args.min_events)
+    columns = ['rank', 'Player', 'score', 'events', 'avg', 'sd', 'q10', 'q25', 'q75', 'p_top10', 'consistency']
+    print(board[columns].head(args.top).round(3).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+import argparse
+import json
+import os
+import re
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .feature_extraction import parse_player_data, points_vector, resolve_rules, tier_multiplier
+
+# Sponsor phrases; everything from the phrase on is dropped
+SPONSOR_SUFFIX = re.compile(
+    r'\s+(presented|powered|driven|sponsored|designed|connected|equipped|fueled|hosted)\s+by\b.*$'
+)
+
+# Tour and series labels in front of the event name ('DGPT - ', 'DGPT+ ', 'DGPT Playoffs - ', ...),
+# except for the tour's own championship
+SERIES_PREFIX = re.compile(r'^dgpt(\s*(\+|elite|silver|playoffs))*\s*-?\s*(?!championship\b)(?=\w)')
+
+# Words that do not tell editions of different tournaments apart
+STOPWORDS = {'the', 'a', 'an', 'at', 'of', 'and', 'annual', 'pdga', 'professional'}
+
+# Word variants spelled both ways across years
+SYNONYMS = {'championships': 'championship', 'pro': 'professional'}
+
+def event_key(name):
+    """
+    Normalize a tournament name so editions from different years match.
+
+    Drops years, ordinals, tour and series prefixes, sponsor phrases and
+    possessives:
+
+        '2023 Las Vegas Challenge presented by Innova' -> 'las vegas challenge'
+        "DGPT+ Discraft's Ledgestone Open presented by GRIPeq" -> 'discraft ledgestone open'
+        'Prodigy presents WACO' -> 'waco'
+    """
+    name = str(name).lower().replace('\u2019', "'")
+    name = name.replace('disc golf pro tour', 'dgpt')
+    name = re.sub(r"'s\b", '', name)
+    name = SPONSOR_SUFFIX.sub('', name)
+    # '<Sponsor> presents <event>'
+    name = re.sub(r'^.*?\bpresents\s+', '', name)
+    name = re.sub(r'\b(19|20)\d{2}\b', ' ', name)
+    name = SERIES_PREFIX.sub('', ' '.join(re.sub(r'[^a-z0-9+]+', ' ', name).split()))
+    tokens = [SYNONYMS.get(t, t) for t in re.sub(r'[^a-z0-9]+', ' ', name).split()]
+    return ' '.join(t for t in tokens if t not in STOPWORDS and not re.fullmatch(r'\d+(st|nd|rd|th)|[ivx]+', t))
+
+def matching_keys(name, keys):
+    """
+    Past tournament keys a calendar event name refers to.
+
+    A key matches when it contains every word of the event's key, so a
+    calendar entry 'Jonesboro Open' matches 'play it again sports jonesboro
+    open' and 'Green Mountain Championship' matches editions with and without
+    their venue.
+
+    Args:
+        name: Calendar event name
+        keys: Keys of past tournaments from event_key
+
+    Returns:
+        List of matching keys
+    """
+    words = set(event_key(name).split())
+    if not words:
+        return []
+    return [key for key in keys if words <= set(key.split())]
+
+def load_calendar(path):
+    """
+    Read an upcoming event calendar.
+
+    Either a JSON file listing PDGA event ids as in the README's events_list_23,
+    with the tier of each event and optionally its name:
+
+        {"events": [65206, 66457, 65288],
+         "tiers": ["ES", "M", "ES"],
+         "names": ["Las Vegas Challenge", "Champions Cup", "Jonesboro Open"]}
+
+    or a CSV with 'Tournament' and 'Tier' columns (and optionally 'event_id'),
+    as used for FANTASY_DG_SCHEDULE. Events without a name are projected
+    from their tier alone.
+
+    Returns:
+        DataFrame with 'event_id', 'Tournament' and 'Tier' columns, in schedule order
+    """
+    if path.endswith('.json'):
+        with open(path) as f:
+            spec = json.load(f)
+        if isinstance(spec, list) or 'tiers' not in spec:
+            raise ValueError(f"{path} must give the tier of each event alongside the event ids")
+        events, tiers = spec['events'], spec['tiers']
+        names = spec.get('names', [None] * len(events))
+        if not len(events) == len(tiers) == len(names):
+            raise ValueError(f"{path}: events, tiers and names must have the same length")
+        calendar = pd.DataFrame({'event_id': events, 'Tournament': names, 'Tier': tiers})
+    else:
+        calendar = pd.read_csv(path)
+        if 'event_id' not in calendar.columns:
+            calendar['event_id'] = None
+    return calendar[['event_id', 'Tournament', 'Tier']].reset_index(drop=True)
+
+class ScheduleProjections:
+    """
+    Expected fantasy points per player for each event on an upcoming calendar.
+
+    History is summarized once per player: points per event at a 1x tier
+    (shrunk toward the league average by rate_prior pseudo-events), the share
+    of the league's events of each tier they entered, and which past editions
+    of each tournament they played. A player's attendance probability for an
+    event is their share of its past editions, shrunk toward their tier
+    participation rate by attendance_prior pseudo-seasons, so new events fall
+    back to the tier rate. Calendar names are matched to past editions by
+    matching_keys; events with no past edition are listed in unmatched.
+
+    The expectation matrix is attendance * rate * tier multiplier in one
+    vectorized multiply. Attendance columns are cached by event, so when the
+    calendar changes update() only computes columns for events it has not
+    seen before.
+    """
+
+    def __init__(self, df, points_map, seasons, rules=None, attendance_prior=2.0, rate_prior=5.0):
+        """
+        Args:
+            df: DataFrame with 'Player', 'pdga_number' and 'stats_data'
+            points_map: Dictionary mapping places to point values
+            seasons: Past seasons whose events to learn from
+            rules: League rules (defaults to feature_extraction.DEFAULT_RULES)
+            attendance_prior: Pseudo-seasons of tier-rate attendance added to each event's history
+            rate_prior: Pseudo-events of league-average points added to each player's rate
+        """
+        self.players = df['Player'].to_numpy()
+        self.pdga_numbers = df['pdga_number'].to_numpy()
+        self.rules = resolve_rules(rules)
+        self.seasons = [int(s) for s in seasons]
+        self.attendance_prior = attendance_prior
+        points_vec = points_vector(points_map)
+
+        # One pass over the blobs into long arrays of scoring events in the history seasons
+        player, base, tier, key, season = [], [], [], [], []
+        for i, stats_data in enumerate(df['stats_data']):
+            try:
+                data = parse_player_data(stats_data) or {}
+            except Exception:
+                continue
+            for place, t, date, name in zip(data.get('Place', []), data.get('Tier', []),
+                                            data.get('Date', []), data.get('Tournament', [])):
+                year = int(str(date)[:4])
+                if t not in self.rules['scoring_tiers'] or year not in self.seasons:
+                    continue
+                place = int(place) if str(place).isdigit() else -1
+                player.append(i)
+                base.append(points_vec[place] if 0 <= place < len(points_vec) else 0.0)
+                tier.append(t)
+                key.append(event_key(name))
+                season.append(year)
+        n_players = len(df)
+        player = np.array(player, dtype=np.intp)
+        base = np.array(base, dtype=np.float64)
+
+        # Points per event at a 1x tier
+        n = np.bincount(player, minlength=n_players)
+        league_rate = base.sum() / max(len(base), 1)
+        self.rate = (np.bincount(player, weights=base, minlength=n_players) +
+                     rate_prior * league_rate) / (n + rate_prior)
+
+        # Share of the league's events of each tier a player entered
+        events = pd.DataFrame({'player': player, 'tier': tier, 'key': key, 'season': season})
+        editions = events.drop_duplicates(['key', 'season'])
+        self.tier_rate = {}
+        for t, held in editions['tier'].value_counts().items():
+            entered = np.bincount(player[events['tier'].to_numpy() == t], minlength=n_players)
+            self.tier_rate[t] = np.minimum(entered / held, 1.0)
+        self.default_rate = np.minimum(n / max(len(editions), 1), 1.0)
+
+        # Who played each past tournament in which season
+        self.history = events.drop_duplicates(['player', 'key', 'season'])[['player', 'key', 'season']]
+        self.keys = sorted(self.history['key'].unique())
+
+        self.calendar = pd.DataFrame(columns=['event_id', 'Tournament', 'Tier'])
+        self.columns = {}
+        self.matches = {}
+        self.unmatched = []
+        self.attendance = np.zeros((n_players, 0))
+        self.multipliers = np.zeros(0)
+        self.matrix = np.zeros((n_players, 0))
+
+    def _event(self, row):
+        """Cache key of a calendar row."""
+        return (None if pd.isna(row.event_id) else int(row.event_id),
+                None if pd.isna(row.Tournament) else str(row.Tournament), row.Tier)
+
+    def _attendance(self, name, tier, keys):
+        """Attendance probability of every player for one event with the given past editions."""
+        prior = self.tier_rate.get(tier, self.default_rate)
+        played = np.zeros(len(self.players))
+        editions = self.history[self.history['key'].isin(keys)]
+        held = editions['season'].nunique()
+        if held:
+            # Seasons in which each player entered any edition
+            counts = editions.drop_duplicates(['player', 'season'])['player'].value_counts()
+            played[counts.index.to_numpy()] = counts.to_numpy()
+        return (played + self.attendance_prior * prior) / (held + self.attendance_prior)
+
+    def update(self, calendar):
+        """
+        Project a new or changed calendar, reusing cached columns of unchanged events.
+
+        Args:
+            calendar: DataFrame from load_calendar
+
+        Returns:
+            Dictionary with the numbers of 'added', 'removed' and 'kept' events
+
+        Calendar events matching no past edition are projected from tier
+        participation alone; their names are kept in self.unmatched and a
+        warning is raised when new ones are added.
+        """
+        events = [self._event(row) for row in calendar.itertuples()]
+        added = [e for e in events if e not in self.columns]
+        for event in added:
+            self.matches[event] = matching_keys(event[1], self.keys) if event[1] is not None else []
+            self.columns[event] = self._attendance(event[1], event[2], self.matches[event])
+        removed = [e for e in self.columns if e not in set(events)]
+        for event in removed:
+            del self.columns[event]
+            del self.matches[event]
+
+        self.unmatched = [e[1] if e[1] is not None else str(e[0]) for e in events if not self.matches[e]]
+        new_unmatched = [e[1] if e[1] is not None else str(e[0]) for e in added if not self.matches[e]]
+        if new_unmatched:
+            warnings.warn(f"{len(new_unmatched)} calendar events match no past edition and are "
+                          f"projected from tier participation only: {', '.join(new_unmatched)}")
+
+        self.calendar = calendar.reset_index(drop=True)
+        self.attendance = np.column_stack([self.columns[e] for e in events]) if events \
+            else np.zeros((len(self.players), 0))
+        self.multipliers = np.array([tier_multiplier(e[2], self.rules) for e in events], dtype=np.float64)
+        self.matrix = self.attendance * np.outer(self.rate, self.multipliers)
+        return {'added': len(added), 'removed': len(removed), 'kept': len(events) - len(added),
+                'unmatched': len(self.unmatched)}
+
+    def totals(self):
+        """
+        Projected season totals.
+
+        Returns:
+            DataFrame with 'Player', 'pdga_number', 'expected_events', 'points_per_event'
+            and 'expected_points', best first
+        """
+        return pd.DataFrame({
+            'Player': self.players,
+            'pdga_number': self.pdga_numbers,
+            'expected_events': self.attendance.sum(axis=1),
+            'points_per_event': self.rate,
+            'expected_points': self.matrix.sum(axis=1)
+        }).sort_values('expected_points', ascending=False, ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Project season points from the upcoming event calendar')
+    parser.add_argument('dataset_csv', help='Player dataset with stats_data')
+    parser.add_argument('calendar', help='Calendar JSON (event ids and tiers) or CSV (Tournament, Tier)')
+    parser.add_argument('--seasons', nargs='+', type=int, required=True,
+                      help='Past seasons to learn attendance and scoring rates from')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--output', type=str,
+                      help='Path to save the players x events expectation matrix as CSV')
+    parser.add_argument('--top', type=int, default=25, help='Number of players to show')
+    parser.add_argument('--watch', type=float,
+                      help='Poll the calendar file every this many seconds and re-project on changes')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    projections = ScheduleProjections(pd.read_csv(args.dataset_csv), points_map, args.seasons)
+    mtime = None
+    while True:
+        if os.path.getmtime(args.calendar) != mtime:
+            mtime = os.path.getmtime(args.calendar)
+            changes = projections.update(load_calendar(args.calendar))
+            print(f"Calendar: {len(projections.calendar)} events ({changes['added']} added, "
+                  f"{changes['removed']} removed, {changes['unmatched']} without past editions)")
+            print(projections.totals().head(args.top).round(2).to_string(index=False))
+            if args.output:
+                labels = projections.calendar['Tournament'].fillna(projections.calendar['event_id'].astype(str))
+                pd.DataFrame(projections.matrix, index=projections.players, columns=labels).round(2) \
+                    .to_csv(args.output, index_label='Player')
+                print(f"Expectation matrix saved to {args.output}")
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+
+if __name__ == '__main__':
+    main()
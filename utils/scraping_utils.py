@@ -1,13 +1,113 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import os
 import time
+from . import instrumentation
 from .feature_extraction import extract_numbers
+from .snapshots import hash_bytes
+
+# Point the scrapers at a replay server with PDGA_BASE_URL or set_base_url
+PDGA_BASE_URL = os.environ.get('PDGA_BASE_URL', 'https://www.pdga.com').rstrip('/')
+REQUEST_DELAY = 1.5
+
+# Callables invoked as hook(url, content) for every fetched page
+PAGE_HOOKS = []
+
+# Directory of cached pages, enabled with set_page_cache
+PAGE_CACHE_DIR = None
+
+# Tiers kept from results and ratings tables
+SCRAPED_TIERS = ['ES', 'M', 'A', 'B', 'XM']
+
+class CachedPage:
+    """Stand-in for a requests Response served from the page cache."""
+    
+    status_code = 200
+    
+    def __init__(self, content):
+        self.content = content
+
+def set_base_url(url):
+    """Override the PDGA base URL, e.g. 'http://127.0.0.1:8765' for a replay server."""
+    global PDGA_BASE_URL
+    PDGA_BASE_URL = url.rstrip('/')
+
+def set_request_delay(seconds):
+    """Override the polite delay between requests."""
+    global REQUEST_DELAY
+    REQUEST_DELAY = seconds
+
+def set_page_cache(path):
+    """Cache fetched pages under path (None disables the cache)."""
+    global PAGE_CACHE_DIR
+    PAGE_CACHE_DIR = path
+    if path:
+        os.makedirs(path, exist_ok=True)
+
+def player_details_url(pdga_number):
+    """URL of a player's details page (career stats and ratings history)."""
+    return f'{PDGA_BASE_URL}/player/{str(pdga_number)}/details'
+
+def player_stats_url(pdga_number, year):
+    """URL of a player's season results page."""
+    return f'{PDGA_BASE_URL}/player/{str(pdga_number)}/stats/{year}'
+
+def stats_table_id(division='MPO'):
+    """HTML id of a division's results table on a season results page."""
+    return f'player-results-{division.lower()}'
+
+def event_url(event_id):
+    """URL of an event results page."""
+    return f'{PDGA_BASE_URL}/tour/event/{event_id}'
 
 def ratings_date_parse(s):
     """Parse date from PDGA ratings format."""
     return s.split('to')[-1].strip()
 
+def fetch_page(url, max_age=None):
+    """
+    Fetch a PDGA page, recording request count, bytes and time in the run report.
+    
+    With a page cache set, a cached copy younger than max_age seconds is
+    returned without a request, and successful responses are cached.
+    
+    Args:
+        url: URL to fetch
+        max_age: Oldest cached copy to accept in seconds (None = always fetch,
+            float('inf') = any cached copy, e.g. for a completed season)
+        
+    Returns:
+        requests Response object, or CachedPage
+    """
+    cache_path = os.path.join(PAGE_CACHE_DIR, f'{hash_bytes(url.encode())}.html') if PAGE_CACHE_DIR else None
+    if cache_path and max_age is not None and os.path.exists(cache_path) \
+            and time.time() - os.path.getmtime(cache_path) <= max_age:
+        with open(cache_path, 'rb') as f:
+            response = CachedPage(f.read())
+        instrumentation.count('page_cache_hits')
+    else:
+        with instrumentation.stage('network'):
+            response = requests.get(url)
+        instrumentation.count('requests')
+        instrumentation.count('bytes_downloaded', len(response.content))
+        if response.status_code != 200:
+            instrumentation.count('request_errors')
+        elif cache_path:
+            with open(cache_path, 'wb') as f:
+                f.write(response.content)
+    for hook in PAGE_HOOKS:
+        hook(url, response.content)
+    return response
+
+def throttle(seconds=None):
+    """Pause between requests to stay polite to pdga.com."""
+    seconds = REQUEST_DELAY if seconds is None else seconds
+    if seconds <= 0:
+        return
+    with instrumentation.stage('throttle'):
+        time.sleep(seconds)
+
 def scrape_pdga_table(url, table_id, event=False):
     """
     Scrape a table from a PDGA webpage.
@@ -20,29 +120,78 @@ def scrape_pdga_table(url, table_id, event=False):
     Returns:
         pandas DataFrame containing the table data
     """
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    response = fetch_page(url)
 
-    table = soup.find('table', id=table_id)
-    rows = table.find_all('tr')
+    with instrumentation.stage('parse'):
+        soup = BeautifulSoup(response.content, 'html.parser')
+    return parse_pdga_table(soup, table_id, event)
 
-    # Extract headers
-    headers = []
-    counter = 1  # Counter for naming round rating columns
-    for header in rows[0].find_all('th'):
-        header_text = header.text.strip()
-        if event and not header_text:  # If header is empty in event table
-            header_text = f'rating_{counter}'  # Assign custom name
-            counter += 1
-        headers.append(header_text)
+def parse_pdga_table(soup, table_id, event=False):
+    """
+    Parse a table from an already parsed PDGA page.
+    
+    Args:
+        soup: BeautifulSoup of the page
+        table_id: HTML id of the table to parse
+        event: Whether this is an event results table (affects header handling)
+        
+    Returns:
+        pandas DataFrame containing the table data
+
+    Raises:
+        ValueError: If the page has no such table
+    """
+    with instrumentation.stage('parse'):
+        table = soup.find('table', id=table_id)
+        if table is None:
+            raise ValueError(f"No table with id {table_id!r} on the page (unpublished or unknown event?)")
+        rows = table.find_all('tr')
+
+        # Extract headers
+        headers = []
+        counter = 1  # Counter for naming round rating columns
+        for header in rows[0].find_all('th'):
+            header_text = header.text.strip()
+            if event and not header_text:  # If header is empty in event table
+                header_text = f'rating_{counter}'  # Assign custom name
+                counter += 1
+            headers.append(header_text)
+
+        # Extract data
+        data = []
+        for row in rows[1:]:
+            cols = [ele.text.strip() for ele in row.find_all('td')]
+            data.append(cols)
 
-    # Extract data
-    data = []
-    for row in rows[1:]:
-        cols = [ele.text.strip() for ele in row.find_all('td')]
-        data.append(cols)
+        table_df = pd.DataFrame(data, columns=headers)
+
+    instrumentation.count('table_rows_parsed', len(table_df))
+    return table_df
+
+# Career stat elements on a player's details page
+CAREER_SELECTORS = {
+    'career_events_raw': '.career-events',
+    'join_date_raw': '.join-date', 
+    'rating_current_raw': '.current-rating',
+    'career_wins_raw': '.career-wins',
+    'career_earnings_raw': '.career-earnings',
+    'world_rank_raw': '.world-rank'
+}
+
+def career_stats_from_soup(soup, player_pdga):
+    """Career statistics from a parsed player details page."""
+    collection_dict = {'pdga_number': player_pdga}
+    with instrumentation.stage('parse'):
+        for key, selector in CAREER_SELECTORS.items():
+            elements = soup.select(selector)
+            if elements:
+                extracted_text = ' '.join([elem.get_text(strip=True) for elem in elements])
+            else:
+                extracted_text = 'Element not found'
+                
+            collection_dict[key] = extracted_text
 
-    return pd.DataFrame(data, columns=headers)
+    return collection_dict
 
 def get_player_career_stats(player_pdga):
     """
@@ -54,72 +203,147 @@ def get_player_career_stats(player_pdga):
     Returns:
         Dictionary containing career statistics
     """
-    css_selectors = {
-        'career_events_raw': '.career-events',
-        'join_date_raw': '.join-date', 
-        'rating_current_raw': '.current-rating',
-        'career_wins_raw': '.career-wins',
-        'career_earnings_raw': '.career-earnings',
-        'world_rank_raw': '.world-rank'
-    }
-    
-    url = f'https://www.pdga.com/player/{str(player_pdga)}/details'
-    response = requests.get(url)
+    url = player_details_url(player_pdga)
+    response = fetch_page(url)
 
-    collection_dict = {'pdga_number': player_pdga}
-    soup = BeautifulSoup(response.content, 'html.parser')
+    with instrumentation.stage('parse'):
+        soup = BeautifulSoup(response.content, 'html.parser')
+    return career_stats_from_soup(soup, player_pdga)
+
+def clean_stats_table(stats, tiers=SCRAPED_TIERS):
+    """
+    Normalize a results table to 'Place', 'Tier', 'Date' and 'Tournament'.
     
-    for key, selector in css_selectors.items():
-        elements = soup.select(selector)
-        if elements:
-            extracted_text = ' '.join([elem.get_text(strip=True) for elem in elements])
-        else:
-            extracted_text = 'Element not found'
-            
-        collection_dict[key] = extracted_text
+    Args:
+        stats: Results table as scraped
+        tiers: Tiers to keep (None keeps every tier)
+    """
+    if stats.shape[0] == 0:
+        return stats
+    if tiers is not None:
+        stats = stats[stats['Tier'].isin(tiers)]
+    stats['Date'] = pd.to_datetime(stats['Dates'].apply(lambda x: x.split('to')[-1].strip())).dt.strftime('%Y-%m-%d')
+    return stats[['Place', 'Tier', 'Date', 'Tournament']]
 
-    return collection_dict
+def clean_ratings_table(ratings, tiers=SCRAPED_TIERS):
+    """
+    Normalize a ratings table to 'Rating', 'Date', 'Tournament', 'Tier' and 'Round'.
+    
+    Args:
+        ratings: Ratings details table as scraped
+        tiers: Tiers to keep (None keeps every tier)
+    """
+    if tiers is not None:
+        ratings = ratings[ratings['Tier'].isin(tiers)]
+    ratings['Date'] = pd.to_datetime(ratings['Date'].apply(lambda x: x.split('to')[-1].strip())).dt.strftime('%Y-%m-%d')
+    return ratings[['Rating', 'Date', 'Tournament', 'Tier', 'Round']]
 
-def scrape_player_stats(pdga_number, years_list):
+def scrape_player_stats(pdga_number, years_list, division='MPO', tiers=SCRAPED_TIERS):
     """
     Scrape tournament results and ratings history for a player.
     
     Args:
         pdga_number: PDGA number of the player
         years_list: List of years to scrape data for
+        division: Division whose results table to read
+        tiers: Tiers to keep (None keeps every tier)
         
     Returns:
         Tuple of (tournament stats DataFrame, ratings DataFrame)
     """
-    table_id_stats = "player-results-mpo"
+    table_id_stats = stats_table_id(division)
     table_id_ratings = "player-results-details"
     
-    # Get tournament stats
-    stats = pd.DataFrame()
+    # Get tournament stats, concatenating once after all years are fetched
+    stats_years = []
     for year in years_list:
         try:
-            url_stats = f'https://www.pdga.com/player/{str(pdga_number)}/stats/{year}'
-            stats_year = scrape_pdga_table(url=url_stats, table_id=table_id_stats)
-            stats = pd.concat([stats, stats_year])
+            url_stats = player_stats_url(pdga_number, year)
+            stats_years.append(scrape_pdga_table(url=url_stats, table_id=table_id_stats))
         except Exception as e:
             print(e)
-            pass
-        time.sleep(1.5)
-
-    if stats.shape[0] > 0:
-        stats = stats[stats['Tier'].isin(['ES', 'M', 'A', 'B', 'XM'])]
-        stats['Date'] = pd.to_datetime(stats['Dates'].apply(lambda x: x.split('to')[-1].strip())).dt.strftime('%Y-%m-%d')
-        stats = stats[['Place', 'Tier', 'Date', 'Tournament']]
+            instrumentation.count('scrape_errors')
+        throttle()
+    stats = pd.concat(stats_years) if stats_years else pd.DataFrame()
+    stats = clean_stats_table(stats, tiers)
 
     # Get ratings history
-    url_ratings = f'https://www.pdga.com/player/{str(pdga_number)}/details'
+    url_ratings = player_details_url(pdga_number)
     try:
-        ratings = scrape_pdga_table(url=url_ratings, table_id=table_id_ratings)
-        ratings = ratings[ratings['Tier'].isin(['ES', 'M', 'A', 'B', 'XM'])]
-        ratings['Date'] = pd.to_datetime(ratings['Date'].apply(lambda x: x.split('to')[-1].strip())).dt.strftime('%Y-%m-%d')
-        ratings = ratings[['Rating', 'Date', 'Tournament', 'Tier', 'Round']]
+        ratings = clean_ratings_table(scrape_pdga_table(url=url_ratings, table_id=table_id_ratings), tiers)
     except Exception as e:
         ratings = pd.DataFrame()
         print(f'{e}, {pdga_number}')
+        instrumentation.count('scrape_errors')
 
     return stats, ratings
+
+def scrape_player_divisions(pdga_number, years_list, divisions, tiers=SCRAPED_TIERS, max_age=None):
+    """
+    Scrape a player's career stats, ratings and results in several divisions.
+    
+    Every page is fetched and parsed once: career stats and ratings share the
+    details page, and each season page supplies every division's results
+    table. With a page cache set, completed seasons' pages are reused from
+    the cache indefinitely and other pages up to max_age seconds old.
+    
+    Args:
+        pdga_number: PDGA number of the player
+        years_list: List of years to scrape results for
+        divisions: Division codes whose results tables to read, e.g. ['MPO', 'FPO']
+        tiers: Tiers to keep (None keeps every tier)
+        max_age: Oldest cached copy to accept for pages that can still change
+        
+    Returns:
+        Tuple of (career stats dictionary, dictionary mapping divisions to
+        results DataFrames, ratings DataFrame)
+    """
+    current_year = pd.Timestamp.now().year
+    tables = {division: [] for division in divisions}
+    for year in years_list:
+        response = fetch_page(player_stats_url(pdga_number, year),
+                              max_age=float('inf') if year < current_year else max_age)
+        if isinstance(response, requests.Response):
+            throttle()
+        if response.status_code != 200:
+            print(f'{response.status_code} for {pdga_number} stats {year}')
+            instrumentation.count('scrape_errors')
+            continue
+        with instrumentation.stage('parse'):
+            soup = BeautifulSoup(response.content, 'html.parser')
+        for division in divisions:
+            # A missing table means no results in that division this season
+            if soup.find('table', id=stats_table_id(division)) is not None:
+                tables[division].append(parse_pdga_table(soup, stats_table_id(division)))
+    stats = {
+        division: clean_stats_table(pd.concat(frames) if frames else pd.DataFrame(), tiers)
+        for division, frames in tables.items()
+    }
+
+    response = fetch_page(player_details_url(pdga_number), max_age=max_age)
+    if isinstance(response, requests.Response):
+        throttle()
+    with instrumentation.stage('parse'):
+        soup = BeautifulSoup(response.content, 'html.parser')
+    career = career_stats_from_soup(soup, pdga_number)
+    try:
+        ratings = clean_ratings_table(parse_pdga_table(soup, 'player-results-details'), tiers)
+    except Exception as e:
+        ratings = pd.DataFrame()
+        print(f'{e}, {pdga_number}')
+        instrumentation.count('scrape_errors')
+
+    return career, stats, ratings
+
+def scrape_event_results(event_id, table_id='tournament-stats-0'):
+    """
+    Scrape an event's results table.
+    
+    Args:
+        event_id: PDGA event id
+        table_id: HTML id of the division results table
+        
+    Returns:
+        DataFrame of event results with round ratings as rating_N columns
+    """
+    return scrape_pdga_table(url=event_url(event_id), table_id=table_id, event=True)
@@ -0,0 +1,213 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from .feature_extraction import fantasy_points_from_arrays, points_vector, stats_to_arrays
+from .rating_model import VALID_TIERS, ratings_long
+
+SECONDS_PER_YEAR = 365.25 * 24 * 60 * 60
+
+# Rating curve sampled quarterly over the three years up to the end of a season
+CURVE_YEARS = np.linspace(-3.0, 0.0, 13)
+
+# Finish distribution bins: 1st, 2-5, 6-10, 11-20, 21-40, 41+
+FINISH_EDGES = np.array([1, 2, 6, 11, 21, 41, np.iinfo(np.int16).max])
+
+FEATURE_GROUPS = ['curve', 'finish', 'tenure']
+
+def _years(dates):
+    """Convert dates to fractional years since the Unix epoch."""
+    return (pd.to_datetime(dates) - pd.Timestamp(0)).dt.total_seconds().to_numpy() / SECONDS_PER_YEAR
+
+def build_features(df, seasons, points_map=None, min_rounds=8):
+    """
+    Career-stage feature vectors for every player at the end of each season.
+
+    A row describes a player as of December 31 of a season:
+      - curve: their rating trajectory, per-event mean round ratings
+        interpolated onto a quarterly grid over the preceding three years
+      - finish: the fraction of that season's results in each finish band,
+        plus log(1 + events played)
+      - tenure: years since join_date
+
+    Args:
+        df: DataFrame with 'Player', 'join_date', 'ratings_data' and 'stats_data'
+        seasons: Seasons to build rows for
+        points_map: Optional place-to-points mapping; adds each row's
+            fantasy points in the following season
+        min_rounds: Minimum rated rounds in the curve window for a row to be kept
+
+    Returns:
+        Tuple of (meta DataFrame with 'Player', 'season', 'tenure', 'rating',
+        'events' and optionally 'next_points'; feature matrix; dictionary
+        mapping feature groups to column slices)
+    """
+    seasons = sorted(int(s) for s in seasons)
+    ends = np.array([_years(pd.Series([pd.Timestamp(f'{s}-12-31')]))[0] for s in seasons])
+
+    # Per-event mean rating per player, in date order
+    long_df = ratings_long(df)
+    long_df = long_df[long_df['Tier'].isin(VALID_TIERS) & long_df['Rating'].notna()]
+    events = (long_df.groupby(['player', 'Date'])['Rating']
+              .agg(['mean', 'size']).reset_index().sort_values(['player', 'Date']))
+    player = events['player'].to_numpy()
+    t = _years(events['Date'])
+    rating = events['mean'].to_numpy()
+    rounds = events['size'].to_numpy()
+    bounds = np.searchsorted(player, np.arange(len(df) + 1))
+
+    n_bins = len(FINISH_EDGES) - 1
+    n_features = len(CURVE_YEARS) + n_bins + 2
+    groups = {
+        'curve': slice(0, len(CURVE_YEARS)),
+        'finish': slice(len(CURVE_YEARS), len(CURVE_YEARS) + n_bins + 1),
+        'tenure': slice(n_features - 1, n_features)
+    }
+
+    points_vec = points_vector(points_map) if points_map is not None else None
+    join = pd.to_numeric(df['join_date'], errors='coerce').to_numpy()
+
+    meta, rows = [], []
+    for i, stats_data in enumerate(df['stats_data']):
+        try:
+            place, multiplier, year = stats_to_arrays(stats_data)
+        except Exception:
+            place, multiplier, year = np.array([]), np.array([]), np.array([])
+        if points_vec is not None:
+            next_points = fantasy_points_from_arrays(
+                place, multiplier, year, points_vec, [s + 1 for s in seasons]
+            )
+
+        ti, ri, ni = t[bounds[i]:bounds[i + 1]], rating[bounds[i]:bounds[i + 1]], rounds[bounds[i]:bounds[i + 1]]
+        for k, (season, end) in enumerate(zip(seasons, ends)):
+            window = (ti > end + CURVE_YEARS[0]) & (ti <= end)
+            if ni[window].sum() < min_rounds or np.isnan(join[i]):
+                continue
+
+            curve = np.interp(end + CURVE_YEARS, ti[ti <= end], ri[ti <= end])
+
+            season_place = place[(year == season) & (place > 0)]
+            counts = np.histogram(season_place, bins=FINISH_EDGES)[0]
+            finish = counts / max(len(season_place), 1)
+
+            rows.append(np.concatenate([curve, finish, [np.log1p(len(season_place)), season - join[i]]]))
+            row = {
+                'Player': df['Player'].iloc[i],
+                'season': season,
+                'tenure': season - join[i],
+                'rating': round(float(curve[-1]), 1),
+                'events': len(season_place)
+            }
+            if points_vec is not None:
+                # Unknown rather than zero when the next season was not scraped
+                row['next_points'] = next_points[k] if np.any(year == season + 1) else np.nan
+            meta.append(row)
+
+    columns = ['Player', 'season', 'tenure', 'rating', 'events']
+    if points_vec is not None:
+        columns.append('next_points')
+    matrix = np.array(rows, dtype=np.float64).reshape(len(rows), n_features)
+    return pd.DataFrame(meta, columns=columns), matrix, groups
+
+class CompIndex:
+    """
+    Nearest-neighbor index over career-stage feature vectors.
+
+    Columns are standardized and each feature group is scaled to contribute
+    equally (times its weight), so a query is one matrix-vector product
+    against every indexed row followed by a partial sort.
+    """
+
+    def __init__(self, df, seasons, points_map=None, weights=None, min_rounds=8):
+        """
+        Args:
+            df: Player DataFrame as for build_features
+            seasons: Seasons to index
+            points_map: Optional place-to-points mapping for next-season points
+            weights: Optional dictionary of group weights ('curve', 'finish', 'tenure')
+            min_rounds: Minimum rated rounds for a row to be indexed
+        """
+        self.meta, features, groups = build_features(df, seasons, points_map, min_rounds)
+        weights = {**{g: 1.0 for g in FEATURE_GROUPS}, **(weights or {})}
+
+        mean = features.mean(axis=0) if len(features) else np.zeros(features.shape[1])
+        std = features.std(axis=0) if len(features) else np.zeros(features.shape[1])
+        scale = np.divide(1.0, std, out=np.zeros_like(std), where=std > 0)
+        for group, cols in groups.items():
+            n_cols = cols.stop - cols.start
+            scale[cols] *= weights[group] / np.sqrt(n_cols)
+
+        self.mean, self.scale = mean, scale
+        self.vectors = (features - mean) * scale
+        self.norms = (self.vectors ** 2).sum(axis=1)
+        self.tenure = self.meta['tenure'].to_numpy(dtype=float)
+        self.players = self.meta['Player'].to_numpy()
+
+    def row(self, player, season=None):
+        """Index row for a player at a season (defaults to their latest indexed season)."""
+        rows = np.nonzero(self.players == player)[0]
+        if season is not None:
+            rows = rows[self.meta['season'].to_numpy()[rows] == season]
+        if len(rows) == 0:
+            return None
+        return rows[np.argmax(self.meta['season'].to_numpy()[rows])]
+
+    def query(self, player, k=5, season=None, tenure_tolerance=1):
+        """
+        Top-k most similar other players at the same career stage.
+
+        Args:
+            player: Player name
+            k: Number of comps
+            season: Season of the player's row to match (defaults to latest)
+            tenure_tolerance: Maximum difference in years of tenure for a comp
+
+        Returns:
+            DataFrame of comps (meta columns plus 'distance'), closest first,
+            or None if the player has no indexed row
+        """
+        q = self.row(player, season)
+        if q is None:
+            return None
+
+        dist = self.norms - 2 * self.vectors @ self.vectors[q] + self.norms[q]
+        dist[self.players == player] = np.inf
+        dist[np.abs(self.tenure - self.tenure[q]) > tenure_tolerance] = np.inf
+
+        k = min(k, int(np.isfinite(dist).sum()))
+        if k == 0:
+            return self.meta.iloc[[]].assign(distance=[])
+        nearest = np.argpartition(dist, k - 1)[:k]
+        nearest = nearest[np.argsort(dist[nearest])]
+
+        comps = self.meta.iloc[nearest].reset_index(drop=True)
+        comps['distance'] = np.round(np.sqrt(np.maximum(dist[nearest], 0)), 3)
+        return comps
+
+def main():
+    parser = argparse.ArgumentParser(description='Find historical comps for players by career stage')
+    parser.add_argument('dataset_csv', help='Player dataset with ratings_data and stats_data')
+    parser.add_argument('--players-csv', default='data/new_tourcard_holders_25.csv',
+                      help='CSV with a Player column of players to find comps for')
+    parser.add_argument('--seasons', nargs='+', type=int, required=True, help='Seasons to index')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--k', type=int, default=5, help='Number of comps per player')
+    parser.add_argument('--tenure-tolerance', type=float, default=1,
+                      help='Maximum difference in years of tenure for a comp')
+
+    args = parser.parse_args()
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    index = CompIndex(pd.read_csv(args.dataset_csv), args.seasons, points_map)
+    for player in pd.read_csv(args.players_csv)['Player']:
+        comps = index.query(player, k=args.k, tenure_tolerance=args.tenure_tolerance)
+        print(f"\n{player}")
+        print("  not in dataset" if comps is None else comps.to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+from . import instrumentation
+
+DEFAULT_ROOT = 'data/snapshots'
+
+# Directories of the store itself, which snapshots cannot be named after
+RESERVED_NAMES = {'objects', 'stages'}
+
+def hash_bytes(data):
+    """SHA-256 hex digest of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path, block_size=1 << 20):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_json(obj):
+    """SHA-256 hex digest of a JSON-serializable object in canonical form."""
+    return hash_bytes(json.dumps(obj, sort_keys=True, default=str).encode())
+
+def hash_source(*objects):
+    """
+    SHA-256 hex digest of the source code of modules, classes or functions.
+
+    Used in stage keys so that editing the code behind a stage invalidates
+    its cached outputs without anyone having to remember a version bump.
+    """
+    return hash_json([inspect.getsource(obj) for obj in objects])
+
+def check_snapshot_name(name):
+    """Raise ValueError for snapshot names that would clash with the store's own files."""
+    if not name or name in RESERVED_NAMES or name.startswith('.') or os.sep in name or '/' in name:
+        raise ValueError(f"Invalid snapshot name {name!r}: names must be a single directory name "
+                         f"other than {sorted(RESERVED_NAMES)}")
+
+class PageHasher:
+    """Collect content hashes of every page fetched while registered as a scraper hook."""
+
+    def __init__(self):
+        self.pages = {}
+
+    def __call__(self, url, content):
+        self.pages[url] = hash_bytes(content)
+
+class SnapshotManager:
+    """
+    Content-addressed store of pipeline stage outputs and named snapshots.
+
+    Layout under root:
+        objects/<sha>.<ext>       stage outputs, shared between snapshots
+        stages/<stage>-<key>.json record of a completed stage run
+        <name>/manifest.json      stages and outputs making up a snapshot
+
+    A stage's key is the hash of its inputs (file hashes and parameters), so a
+    stage whose inputs are unchanged is skipped and its cached output reused.
+    Directories are created on first write, so reading a snapshot has no
+    side effects.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def stage_key(self, stage, inputs):
+        """Key identifying a stage run by its inputs."""
+        return hash_json({'stage': stage, 'inputs': inputs})
+
+    def object_path(self, sha, ext='csv'):
+        """Path of a stored object."""
+        return os.path.join(self.root, 'objects', f'{sha}.{ext}')
+
+    def store(self, path):
+        """Copy a file into the object store, returning its content hash."""
+        sha = hash_file(path)
+        ext = os.path.splitext(path)[1].lstrip('.') or 'bin'
+        target = self.object_path(sha, ext)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(path, target)
+        return sha
+
+    def lookup(self, stage, key):
+        """
+        Return the recorded run of a stage with this key if all its outputs still exist.
+
+        Returns:
+            Stage record dictionary, or None if the stage must be (re)computed
+        """
+        path = os.path.join(self.root, 'stages', f'{stage}-{key}.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            record = json.load(f)
+        for output in record['outputs'].values():
+            if not os.path.exists(self.object_path(output['sha'], output['ext'])):
+                return None
+        instrumentation.count('snapshot_stage_hits')
+        return record
+
+    def record(self, stage, key, inputs, outputs, extra=None):
+        """
+        Store a completed stage run.
+
+        Args:
+            stage: Stage name
+            key: Stage key from stage_key
+            inputs: Dictionary of input hashes and parameters
+            outputs: Dictionary mapping output names to file paths to store
+            extra: Optional additional metadata (e.g. raw page hashes)
+
+        Returns:
+            Stage record dictionary
+        """
+        record = {
+            'stage': stage,
+            'key': key,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'inputs': inputs,
+            'outputs': {
+                name: {'sha': self.store(path), 'ext': os.path.splitext(path)[1].lstrip('.') or 'bin'}
+                for name, path in outputs.items()
+            }
+        }
+        if extra:
+            record.update(extra)
+        os.makedirs(os.path.join(self.root, 'stages'), exist_ok=True)
+        with open(os.path.join(self.root, 'stages', f'{stage}-{key}.json'), 'w') as f:
+            json.dump(record, f, indent=2)
+        return record
+
+    def output_path(self, record, name):
+        """Path of a named output of a stage record."""
+        output = record['outputs'][name]
+        return self.object_path(output['sha'], output['ext'])
+
+    def write_snapshot(self, name, records):
+        """
+        Write a named snapshot from stage records.
+
+        Args:
+            name: Snapshot name
+            records: Dictionary mapping stage names to stage records
+        """
+        check_snapshot_name(name)
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        manifest = {
+            'name': name,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'stages': {
+                stage: {k: v for k, v in record.items() if k != 'pages'}
+                for stage, record in records.items()
+            }
+        }
+        with open(os.path.join(self.root, name, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def read_snapshot(self, name):
+        """Read a snapshot manifest."""
+        with open(os.path.join(self.root, name, 'manifest.json')) as f:
+            return json.load(f)
+
+    def list_snapshots(self):
+        """Names of all snapshots, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        names = [
+            d for d in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, d, 'manifest.json'))
+        ]
+        return sorted(names, key=lambda d: self.read_snapshot(d)['created'])
+
+def dataset_path(name, root=DEFAULT_ROOT):
+    """Path of the feature dataset in a named snapshot."""
+    manager = SnapshotManager(root)
+    record = manager.read_snapshot(name)['stages']['features']
+    return manager.output_path(record, 'dataset')
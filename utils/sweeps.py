@@ -0,0 +1,307 @@
+import argparse
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from .feature_extraction import fantasy_points_from_arrays, points_vector, stats_to_arrays
+from .rating_model import VALID_TIERS, ratings_long
+
+SECONDS_PER_YEAR = 365.25 * 24 * 60 * 60
+
+DEFAULT_DECAY_RATES = [0.0, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0]
+DEFAULT_WINDOWS = [1, 2, 3, 4]
+DEFAULT_YEAR1_WEIGHTS = list(np.round(np.arange(0.3, 1.0 + 1e-9, 0.05), 2))
+
+# Current hand-picked settings, used as the baseline each setting is compared to
+DEFAULT_SETTINGS = {
+    'rating': {'decay_rate': 0.1, 'window_years': 3},
+    'season': {'year1_weight': 0.65}
+}
+
+def prepare_sweep_data(df, points_map, target_years):
+    """
+    Precompute everything the sweep needs as flat arrays.
+
+    Each sample is a (player, target season) pair for players with at least one
+    result in the target season. Rounds before January 1 of the target season
+    are kept with their "years ago" relative to that date, so every decay rate
+    and window is evaluated from the same arrays.
+
+    Args:
+        df: DataFrame with 'ratings_data' and 'stats_data' columns
+        points_map: Dictionary mapping places to point values
+        target_years: Seasons whose realized points are predicted
+
+    Returns:
+        Dictionary of arrays: 'sample', 'rating', 'years_ago' (one entry per
+        round), 'fp_prev' (samples x [previous season, the one before]),
+        'target' (realized points per sample), and 'player' and 'season'
+        labelling each sample
+    """
+    years = sorted({y - k for y in target_years for k in (0, 1, 2)})
+    points_vec = points_vector(points_map)
+
+    fp = np.zeros((len(df), len(years)))
+    events = np.zeros((len(df), len(years)), dtype=int)
+    for i, stats_data in enumerate(df['stats_data']):
+        try:
+            place, multiplier, year = stats_to_arrays(stats_data)
+        except Exception:
+            continue
+        fp[i] = fantasy_points_from_arrays(place, multiplier, year, points_vec, years)
+        events[i] = [np.count_nonzero(year == y) for y in years]
+
+    long_df = ratings_long(df)
+    long_df = long_df[long_df['Tier'].isin(VALID_TIERS) & long_df['Rating'].notna()]
+    round_player = long_df['player'].to_numpy()
+    round_rating = long_df['Rating'].to_numpy()
+    round_date = long_df['Date']
+
+    col = {y: k for k, y in enumerate(years)}
+    samples, ratings, years_ago, fp_prev, target, players, seasons = [], [], [], [], [], [], []
+    n_samples = 0
+    for season in target_years:
+        included = np.nonzero(events[:, col[season]] > 0)[0]
+        sample_of = np.full(len(df), -1)
+        sample_of[included] = np.arange(n_samples, n_samples + len(included))
+
+        ref = pd.Timestamp(f'{season}-01-01')
+        ago = ((ref - round_date).dt.total_seconds() / SECONDS_PER_YEAR).to_numpy()
+        keep = (ago > 0) & (sample_of[round_player] >= 0)
+
+        samples.append(sample_of[round_player[keep]])
+        ratings.append(round_rating[keep])
+        years_ago.append(ago[keep])
+        fp_prev.append(fp[included][:, [col[season - 1], col[season - 2]]])
+        target.append(fp[included, col[season]])
+        players.append(included)
+        seasons.append(np.full(len(included), season))
+        n_samples += len(included)
+
+    return {
+        'sample': np.concatenate(samples),
+        'rating': np.concatenate(ratings),
+        'years_ago': np.concatenate(years_ago),
+        'fp_prev': np.concatenate(fp_prev),
+        'target': np.concatenate(target),
+        'player': np.concatenate(players),
+        'season': np.concatenate(seasons)
+    }
+
+def predict(data, family, decay_rate=None, window_years=None, year1_weight=None):
+    """
+    Predictor values for one setting.
+
+    'rating' settings give the decayed composite rating of ratings_composite
+    (-inf for players with no rounds in the window); 'season' settings give
+    the composite of the two previous seasons' fantasy points.
+
+    Returns:
+        numpy array with one prediction per sample
+    """
+    if family == 'season':
+        return year1_weight * data['fp_prev'][:, 0] + (1 - year1_weight) * data['fp_prev'][:, 1]
+
+    n_samples = len(data['target'])
+    ago = data['years_ago']
+    w = np.exp(-decay_rate * ago) * (ago <= window_years)
+    sw = np.bincount(data['sample'], weights=w, minlength=n_samples)
+    swx = np.bincount(data['sample'], weights=w * data['rating'], minlength=n_samples)
+    return np.divide(swx, sw, out=np.full(n_samples, -np.inf), where=sw > 0)
+
+def _centered_ranks(values):
+    """
+    Ranks along the last axis, centered and scaled to unit norm.
+
+    Constant rows have no ranking and come back as zeros, so their
+    correlation with anything is 0 rather than NaN.
+    """
+    ranks = rankdata(values, axis=-1)
+    ranks -= ranks.mean(axis=-1, keepdims=True)
+    norm = np.sqrt((ranks ** 2).sum(axis=-1, keepdims=True))
+    return np.divide(ranks, norm, out=np.zeros_like(ranks), where=norm > 0)
+
+def score(pred, target_ranks, boot=None):
+    """
+    Spearman correlation between predictions and realized points (0 when
+    either is constant).
+
+    Args:
+        pred: Predictions per sample
+        target_ranks: _centered_ranks of the target, shaped like the resamples
+        boot: Optional (n_boot, n_samples) resample indices
+
+    Returns:
+        Scalar correlation, or an array of one correlation per resample
+    """
+    if boot is not None:
+        pred = pred[boot]
+    return (_centered_ranks(pred) * target_ranks).sum(axis=-1)
+
+def _sweep_shard(args):
+    """Process pool worker: score a shard of settings on the full sample and resamples."""
+    settings, data, boot, baselines = args
+    target_ranks = _centered_ranks(data['target'])
+    boot_target_ranks = _centered_ranks(data['target'][boot])
+
+    rows = []
+    for setting in settings:
+        pred = predict(data, **setting)
+        estimate = score(pred, target_ranks)
+        resampled = score(pred, boot_target_ranks, boot)
+        baseline_estimate, baseline_resampled = baselines[setting['family']]
+        delta = resampled - baseline_resampled
+        rows.append({
+            **setting,
+            'spearman': estimate,
+            'ci_low': np.percentile(resampled, 2.5),
+            'ci_high': np.percentile(resampled, 97.5),
+            'delta_vs_default': estimate - baseline_estimate,
+            'delta_ci_low': np.percentile(delta, 2.5),
+            'delta_ci_high': np.percentile(delta, 97.5)
+        })
+    return rows
+
+def check_settings(decay_rates, windows, year1_weights):
+    """
+    Validate sweep settings.
+
+    Raises:
+        ValueError: If a value is out of range or there is nothing to sweep
+    """
+    if not (len(decay_rates) and len(windows)) and not len(year1_weights):
+        raise ValueError('Nothing to sweep: give decay rates and windows, or year-1 weights')
+    if any(d < 0 for d in decay_rates):
+        raise ValueError(f'Decay rates must be non-negative, got {list(decay_rates)}')
+    if any(w <= 0 for w in windows):
+        raise ValueError(f'Windows must be positive, got {list(windows)}')
+    if any(not 0 <= w <= 1 for w in year1_weights):
+        raise ValueError(f'Year-1 weights must be between 0 and 1, got {list(year1_weights)}')
+
+def run_sweep(df, points_map, target_years, decay_rates=DEFAULT_DECAY_RATES,
+              windows=DEFAULT_WINDOWS, year1_weights=DEFAULT_YEAR1_WEIGHTS,
+              n_boot=1000, workers=None, seed=0, progress=None):
+    """
+    Evaluate decay rates, cutoff windows and season weights against realized points.
+
+    Every setting is scored by the Spearman correlation between its predictor
+    and the next season's realized fantasy points, with 95% bootstrap
+    confidence intervals over players. The same resamples are used for every
+    setting, so the interval on 'delta_vs_default' is a paired comparison
+    with the current defaults (decay 0.1, 3-year window, 0.65/0.35 weights).
+
+    Args:
+        df: DataFrame with 'ratings_data' and 'stats_data' columns
+        points_map: Dictionary mapping places to point values
+        target_years: Seasons to predict (each needs the two previous seasons)
+        decay_rates: Decay rates for ratings_composite
+        windows: Cutoff windows in years for ratings_composite
+        year1_weights: Weights on the most recent season (the previous season gets 1 - w)
+        n_boot: Number of bootstrap resamples
+        workers: Number of worker processes (None = run in this process)
+        seed: Random seed for the resamples
+        progress: Optional callback called with the fraction of settings scored
+
+    Returns:
+        DataFrame with one row per setting, best first within each family;
+        a family with no settings (e.g. empty year1_weights) is left out
+
+    Raises:
+        ValueError: If the settings are invalid (see check_settings) or no
+            player has results in the target seasons
+    """
+    check_settings(decay_rates, windows, year1_weights)
+    data = prepare_sweep_data(df, points_map, target_years)
+    n_samples = len(data['target'])
+    if n_samples == 0:
+        raise ValueError(f'No player has results in the target seasons {list(target_years)}')
+    boot = np.random.default_rng(seed).integers(0, n_samples, (n_boot, n_samples))
+
+    # Baseline scores on the full sample and on every resample, for paired deltas
+    target_ranks = _centered_ranks(data['target'])
+    boot_target_ranks = _centered_ranks(data['target'][boot])
+    baselines = {}
+    for family, setting in DEFAULT_SETTINGS.items():
+        pred = predict(data, family=family, **setting)
+        baselines[family] = (score(pred, target_ranks), score(pred, boot_target_ranks, boot))
+
+    settings = [
+        {'family': 'rating', 'decay_rate': float(d), 'window_years': float(w)}
+        for d, w in itertools.product(decay_rates, windows)
+    ] + [
+        {'family': 'season', 'year1_weight': float(w)}
+        for w in year1_weights
+    ]
+
+    n_shards = min(len(settings), (workers or 1) * 4)
+    bounds = np.linspace(0, len(settings), n_shards + 1).astype(int)
+    shards = [(settings[lo:hi], data, boot, baselines) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) if workers else nullcontext() as executor:
+        scored = executor.map(_sweep_shard, shards) if workers else map(_sweep_shard, shards)
+        for k, shard_rows in enumerate(scored):
+            rows.extend(shard_rows)
+            if progress is not None:
+                progress((k + 1) / n_shards)
+
+    columns = ['family', 'decay_rate', 'window_years', 'year1_weight', 'year2_weight',
+               'spearman', 'ci_low', 'ci_high', 'delta_vs_default', 'delta_ci_low',
+               'delta_ci_high', 'n_samples']
+    # Columns of a family with no settings are absent from rows; fill them with NaN
+    results = pd.DataFrame(rows).reindex(columns=columns)
+    results['year2_weight'] = 1 - results['year1_weight']
+    results['n_samples'] = n_samples
+    return (results
+            .sort_values(['family', 'spearman'], ascending=[True, False], ignore_index=True))
+
+def best_settings(results):
+    """Best setting per family from run_sweep results."""
+    return results.groupby('family', sort=False).head(1).reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sweep decay rate, cutoff window and season weights against realized points'
+    )
+    parser.add_argument('dataset_csv', help='Player dataset with ratings_data and stats_data')
+    parser.add_argument('--target-years', nargs='+', type=int, required=True,
+                      help='Seasons whose realized points are predicted')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--decay-rates', nargs='+', type=float, default=DEFAULT_DECAY_RATES,
+                      help='Decay rates to evaluate')
+    parser.add_argument('--windows', nargs='+', type=float, default=DEFAULT_WINDOWS,
+                      help='Cutoff windows in years to evaluate')
+    parser.add_argument('--year1-weights', nargs='+', type=float, default=DEFAULT_YEAR1_WEIGHTS,
+                      help='Weights on the most recent season to evaluate')
+    parser.add_argument('--bootstrap', type=int, default=1000, help='Number of bootstrap resamples')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--output', type=str, help='Write the full results to this CSV')
+
+    args = parser.parse_args()
+    try:
+        check_settings(args.decay_rates, args.windows, args.year1_weights)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+
+    results = run_sweep(pd.read_csv(args.dataset_csv), points_map, args.target_years,
+                        args.decay_rates, args.windows, args.year1_weights,
+                        n_boot=args.bootstrap, workers=args.workers, seed=args.seed)
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"Sweep results saved to {args.output}")
+
+    print(f"Best settings ({results['n_samples'].iloc[0]} player-seasons, 95% bootstrap CIs):")
+    print(best_settings(results).round(4).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
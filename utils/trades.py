@@ -0,0 +1,297 @@
+import argparse
+import itertools
+import json
+
+import numpy as np
+import pandas as pd
+
+from .expected_points import expected_points, load_points_table
+from .feature_extraction import tier_multiplier
+from .rating_model import add_rating_posterior
+from .schedule import ScheduleProjections, load_calendar
+
+# Players starting per event under the league's lineup rule
+STARTERS = 6
+
+def projection_matrix(df, event_tiers, table, attendance=None):
+    """
+    Expected fantasy points per player for each remaining event.
+
+    Args:
+        df: DataFrame with 'rating_mu' and 'rating_sigma' columns (added with
+            add_rating_posterior when missing)
+        event_tiers: Tier codes of the remaining events, in schedule order
+        table: Points table from expected_points.load_points_table
+        attendance: Optional (n_players, n_events) array of probabilities that
+            each player plays each event (defaults to everyone playing)
+
+    Returns:
+        numpy array of shape (n_players, n_events)
+    """
+    if 'rating_mu' not in df.columns or 'rating_sigma' not in df.columns:
+        df = add_rating_posterior(df.copy())
+
+    base = np.nan_to_num(expected_points(
+        table, df['rating_mu'].to_numpy(dtype=float), df['rating_sigma'].to_numpy(dtype=float)
+    ))
+    multipliers = np.array([tier_multiplier(t) for t in event_tiers], dtype=np.float64)
+    matrix = np.outer(base, multipliers)
+    if attendance is not None:
+        matrix *= attendance
+    return matrix
+
+class TradeEvaluator:
+    """
+    Rest-of-season trade scoring from cached per-player, per-event projections.
+
+    For every team the evaluator caches its best STARTERS + 2 projections per
+    event and each rostered player's rank among them. A trade of up to two
+    players per side changes only the two rosters involved, and each side's
+    new lineup is found from the cached values with a partition over at most
+    STARTERS + 4 candidates per event, so the season is never re-scored.
+    """
+
+    def __init__(self, projections, rosters, players, starters=STARTERS):
+        """
+        Args:
+            projections: (n_players, n_events) array from projection_matrix
+            rosters: Dictionary mapping team names to lists of player names
+            players: Player names labelling the rows of projections
+            starters: Players starting per event
+        """
+        # A copy, so update_player never writes into the caller's array
+        self.projections = np.array(projections, dtype=np.float64)
+        self.players = list(players)
+        self.starters = starters
+        self.depth = starters + 2
+
+        index = {name: i for i, name in enumerate(self.players)}
+        self.rosters = {team: np.array([index[name] for name in names], dtype=np.intp)
+                        for team, names in rosters.items()}
+        self.top, self.rank, self.totals = {}, {}, {}
+        for team in self.rosters:
+            self._index_team(team)
+
+    def _index_team(self, team):
+        """Cache a team's sorted top projections, member ranks and lineup total."""
+        values = self.projections[self.rosters[team]]
+        n_members, n_events = values.shape
+
+        order = np.argsort(-values, axis=0, kind='stable')
+        top = np.zeros((n_events, self.depth))
+        kept = min(n_members, self.depth)
+        top[:, :kept] = np.take_along_axis(values, order[:kept], axis=0).T
+
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(n_members)[:, None], axis=0)
+
+        self.top[team] = top
+        self.rank[team] = np.minimum(rank, self.depth)
+        self.totals[team] = top[:, :self.starters].sum()
+
+    def _positions(self, team, names):
+        """Roster positions of named players on a team."""
+        roster = list(self.rosters[team])
+        return [roster.index(self.players.index(name)) for name in names]
+
+    def _side_totals(self, team, removed, added, chunk_size=20000):
+        """
+        Season totals for a team after batches of roster changes.
+
+        Args:
+            team: Team name
+            removed: (n, k) roster positions leaving the team, -1 for none
+            added: (n, k) player rows joining the team, -1 for none
+            chunk_size: Candidates evaluated per batch
+
+        Returns:
+            numpy array of n projected season totals
+        """
+        top, rank = self.top[team], self.rank[team]
+        totals = np.empty(len(removed))
+
+        for start in range(0, len(removed), chunk_size):
+            rem = removed[start:start + chunk_size]
+            add = added[start:start + chunk_size]
+            n = len(rem)
+
+            candidates = np.empty((n, top.shape[0], self.depth + add.shape[1]))
+            candidates[:, :, :self.depth] = top
+
+            # Projections are non-negative, so a departed player's slot is zeroed
+            # rather than deleted: an empty slot never displaces a real starter
+            for col in range(rem.shape[1]):
+                rows = np.nonzero(rem[:, col] >= 0)[0]
+                ranks = rank[rem[rows, col]]
+                hit_row, hit_event = np.nonzero(ranks < self.depth)
+                candidates[rows[hit_row], hit_event, ranks[hit_row, hit_event]] = 0.0
+
+            for col in range(add.shape[1]):
+                incoming = add[:, col]
+                candidates[:, :, self.depth + col] = np.where(
+                    (incoming >= 0)[:, None], self.projections[np.maximum(incoming, 0)], 0.0
+                )
+
+            best = np.partition(candidates, -self.starters, axis=-1)[..., -self.starters:]
+            totals[start:start + n] = best.sum(axis=(1, 2))
+
+        return totals
+
+    def evaluate(self, team_a, give_a, team_b, give_b):
+        """
+        Projected rest-of-season change for both sides of a trade.
+
+        Args:
+            team_a, team_b: Team names
+            give_a: Names of players team_a sends (one or two)
+            give_b: Names of players team_b sends (one or two)
+
+        Returns:
+            Dictionary with 'delta_a' and 'delta_b' projected point changes
+        """
+        width = max(len(give_a), len(give_b))
+        pad = lambda values: np.array([list(values) + [-1] * (width - len(values))])
+        rows_a = [self.players.index(name) for name in give_a]
+        rows_b = [self.players.index(name) for name in give_b]
+
+        total_a = self._side_totals(team_a, pad(self._positions(team_a, give_a)), pad(rows_b))[0]
+        total_b = self._side_totals(team_b, pad(self._positions(team_b, give_b)), pad(rows_a))[0]
+        return {
+            'delta_a': total_a - self.totals[team_a],
+            'delta_b': total_b - self.totals[team_b]
+        }
+
+    def _pair_trades(self, team_a, team_b, n_give_a, n_give_b):
+        """All trades where team_a sends n_give_a players and team_b sends n_give_b."""
+        roster_a, roster_b = self.rosters[team_a], self.rosters[team_b]
+        combos_a = np.array(list(itertools.combinations(range(len(roster_a)), n_give_a)), dtype=np.intp)
+        combos_b = np.array(list(itertools.combinations(range(len(roster_b)), n_give_b)), dtype=np.intp)
+        if len(combos_a) == 0 or len(combos_b) == 0:
+            return None
+
+        ia, ib = np.meshgrid(np.arange(len(combos_a)), np.arange(len(combos_b)), indexing='ij')
+        pos_a, pos_b = combos_a[ia.ravel()], combos_b[ib.ravel()]
+
+        width = max(n_give_a, n_give_b)
+        pad = lambda x: np.pad(x, ((0, 0), (0, width - x.shape[1])), constant_values=-1)
+        total_a = self._side_totals(team_a, pad(pos_a), pad(roster_b[pos_b]))
+        total_b = self._side_totals(team_b, pad(pos_b), pad(roster_a[pos_a]))
+
+        names = np.array(self.players, dtype=object)
+        return pd.DataFrame({
+            'team_a': team_a,
+            'gives_a': [' + '.join(x) for x in names[roster_a[pos_a]]],
+            'team_b': team_b,
+            'gives_b': [' + '.join(x) for x in names[roster_b[pos_b]]],
+            'delta_a': total_a - self.totals[team_a],
+            'delta_b': total_b - self.totals[team_b]
+        })
+
+    def rank_trades(self, team=None, two_for_one=True):
+        """
+        Score every 1-for-1 (and optionally 2-for-1) trade between teams.
+
+        Args:
+            team: Only consider trades involving this team, reported as team_a
+            two_for_one: Whether to include 2-for-1 trades in both directions
+
+        Returns:
+            DataFrame of trades with projected changes for both sides. With a
+            team, sorted by its gain; otherwise by 'mutual', the smaller of the
+            two gains, so trades that help both sides come first.
+        """
+        shapes = [(1, 1)] + ([(2, 1), (1, 2)] if two_for_one else [])
+        frames = []
+        for team_a, team_b in itertools.permutations(self.rosters, 2):
+            if team is not None and team_a != team:
+                continue
+            for n_give_a, n_give_b in shapes:
+                # Without a focus team, each trade is scored once: 1-for-1 per
+                # unordered pair of teams, 2-for-1 with the sending team as team_a
+                if team is None and (n_give_a < n_give_b or
+                                     (n_give_a == n_give_b and team_a > team_b)):
+                    continue
+                trades = self._pair_trades(team_a, team_b, n_give_a, n_give_b)
+                if trades is not None:
+                    frames.append(trades)
+
+        trades = pd.concat(frames, ignore_index=True)
+        trades['mutual'] = trades[['delta_a', 'delta_b']].min(axis=1)
+        sort_by = 'delta_a' if team is not None else 'mutual'
+        return trades.sort_values(sort_by, ascending=False, ignore_index=True)
+
+    def apply_trade(self, team_a, give_a, team_b, give_b):
+        """Move players between rosters and refresh both teams' cached lineups."""
+        rows_a = [self.players.index(name) for name in give_a]
+        rows_b = [self.players.index(name) for name in give_b]
+        self.rosters[team_a] = np.array([r for r in self.rosters[team_a] if r not in rows_a] + rows_b,
+                                        dtype=np.intp)
+        self.rosters[team_b] = np.array([r for r in self.rosters[team_b] if r not in rows_b] + rows_a,
+                                        dtype=np.intp)
+        self._index_team(team_a)
+        self._index_team(team_b)
+
+    def update_player(self, name, values):
+        """
+        Replace one player's per-event projections, e.g. after new results.
+
+        Only the team rostering the player has its cached lineup refreshed.
+        """
+        row = self.players.index(name)
+        self.projections[row] = values
+        for team, roster in self.rosters.items():
+            if row in roster:
+                self._index_team(team)
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank trades by projected rest-of-season points')
+    parser.add_argument('dataset_csv', help='Player dataset with ratings_data')
+    parser.add_argument('rosters', help='JSON file mapping team names to lists of players')
+    parser.add_argument('--events', nargs='+',
+                      help='Tier codes of the remaining events, e.g. ES ES M XM')
+    parser.add_argument('--calendar', type=str,
+                      help='Remaining event calendar (see schedule.load_calendar); weights each '
+                           'event by players\' attendance probability')
+    parser.add_argument('--seasons', nargs='+', type=int,
+                      help='Past seasons to learn attendance from (with --calendar)')
+    parser.add_argument('--points-map', default='data/points_map_2025.json',
+                      help='Path to JSON file containing place-to-points mapping')
+    parser.add_argument('--points-table', default='data/points_table.npz',
+                      help='Cached rating-to-points lookup table')
+    parser.add_argument('--team', type=str, help='Only rank trades involving this team')
+    parser.add_argument('--one-for-one', action='store_true', help='Skip 2-for-1 trades')
+    parser.add_argument('--top', type=int, default=25, help='Number of trades to show')
+
+    args = parser.parse_args()
+    if (args.events is None) == (args.calendar is None):
+        parser.error("give exactly one of --events and --calendar")
+    if args.calendar and not args.seasons:
+        parser.error("--calendar requires --seasons")
+
+    with open(args.points_map) as f:
+        points_map = json.load(f)
+    with open(args.rosters) as f:
+        rosters = json.load(f)
+
+    # Fit the rating model on the whole player pool, then keep rostered players
+    df = add_rating_posterior(pd.read_csv(args.dataset_csv))
+    rostered = df['Player'].isin({name for names in rosters.values() for name in names}).to_numpy()
+
+    events, attendance = args.events, None
+    if args.calendar:
+        # Attendance rates are relative to the whole pool's schedule history
+        schedule = ScheduleProjections(df, points_map, args.seasons)
+        schedule.update(load_calendar(args.calendar))
+        events, attendance = list(schedule.calendar['Tier']), schedule.attendance[rostered]
+    df = df[rostered].reset_index(drop=True)
+
+    table = load_points_table(args.points_table, points_map)
+    projections = projection_matrix(df, events, table, attendance)
+    evaluator = TradeEvaluator(projections, rosters, df['Player'])
+
+    trades = evaluator.rank_trades(team=args.team, two_for_one=not args.one_for_one)
+    print(f"Scored {len(trades)} trades")
+    print(trades.head(args.top).round(1).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .feature_extraction import parse_player_data
+from .scraping_utils import SCRAPED_TIERS
+
+# Places that are legitimately not numbers
+NON_NUMERIC_PLACES = ['DNF', 'DNS', 'DQ']
+
+# Plausible PDGA ratings, for both round ratings and current player ratings
+RATING_BOUNDS = (400, 1200)
+
+# Earliest plausible round date
+EARLIEST_DATE = pd.Timestamp('1980-01-01')
+
+STATS_COLUMNS = ['Place', 'Tier', 'Date', 'Tournament']
+RATINGS_COLUMNS = ['Rating', 'Date', 'Tournament', 'Tier', 'Round']
+
+# Largest share of players a run may quarantine before validation fails the run
+MAX_QUARANTINED_SHARE = 0.5
+
+# Check name -> (severity, description). Players with any error are quarantined.
+CHECKS = {
+    'invalid_pdga_number': ('error', 'pdga_number is not a positive integer'),
+    'duplicate_player': ('error', 'pdga_number appears on an earlier row'),
+    'unparsed_blob': ('error', 'stats_data or ratings_data could not be decoded'),
+    'malformed_blob': ('error', 'blob is missing columns or has columns of unequal length'),
+    'no_results': ('warning', 'no tournament results in the scraped years (e.g. a new tour card holder)'),
+    'no_ratings': ('error', 'no rated rounds'),
+    'invalid_tier': ('error', 'tier code is not one the scraper keeps'),
+    'unparsed_place': ('error', 'place is neither a number nor DNF/DNS/DQ'),
+    'invalid_date': ('error', 'date is not YYYY-MM-DD'),
+    'date_out_of_range': ('error', f'date before {EARLIEST_DATE.date()} or in the future'),
+    'result_outside_years': ('warning', 'result outside the scraped years (not scored)'),
+    'duplicate_event': ('error', 'same tournament and date appears twice in results'),
+    'unparsed_rating': ('error', 'round rating is not a number'),
+    'rating_out_of_bounds': ('error', f'round rating outside {RATING_BOUNDS}'),
+    'rating_current_out_of_bounds': ('error', f'current rating outside {RATING_BOUNDS}'),
+    'rating_current_missing': ('warning', 'current rating not found on the profile')
+}
+
+ISSUE_COLUMNS = ['pdga_number', 'Player', 'check', 'severity', 'count', 'example']
+
+def _long(blobs, columns):
+    """
+    Decode blobs once into long-format columns.
+
+    Returns:
+        Tuple of (DataFrame with a 'player' positional index and the given
+        columns as strings, boolean array of unparseable blobs, boolean array
+        of malformed blobs)
+    """
+    unparsed = np.zeros(len(blobs), dtype=bool)
+    malformed = np.zeros(len(blobs), dtype=bool)
+    values = {col: [] for col in columns}
+    counts = np.zeros(len(blobs), dtype=np.int64)
+
+    for i, blob in enumerate(blobs):
+        try:
+            data = parse_player_data(blob) if not pd.isna(blob) else None
+        except (ValueError, SyntaxError):
+            data = None
+        if not isinstance(data, dict):
+            unparsed[i] = True
+            continue
+        if not data:
+            # The scraper's empty DataFrame: no rows rather than a bad blob
+            continue
+        lengths = {len(data.get(col, ())) for col in columns}
+        if len(lengths) != 1 or any(col not in data for col in columns):
+            malformed[i] = True
+            continue
+        counts[i] = lengths.pop()
+        for col in columns:
+            values[col].extend(data[col])
+
+    long_df = pd.DataFrame({col: pd.Series(v, dtype=object).astype('string')
+                            for col, v in values.items()})
+    long_df.insert(0, 'player', np.repeat(np.arange(len(blobs)), counts))
+    return long_df, unparsed, malformed
+
+def _row_issues(long_df, mask, check, value_col):
+    """Per-player counts and first example of rows failing a check."""
+    failing = long_df.loc[mask, ['player', value_col]]
+    grouped = failing.groupby('player')[value_col]
+    return pd.DataFrame({'player': grouped.size().index, 'check': check,
+                         'count': grouped.size().to_numpy(),
+                         'example': grouped.first().astype(str).to_numpy()})
+
+def _player_issues(mask, check, examples=None):
+    """Issues for players flagged by a boolean array."""
+    players = np.nonzero(np.asarray(mask))[0]
+    return pd.DataFrame({'player': players, 'check': check, 'count': 1,
+                         'example': '' if examples is None else np.asarray(examples)[players].astype(str)})
+
+def validate_scraped(df, stats_years, today=None, tiers=SCRAPED_TIERS):
+    """
+    Check scraped player rows before feature computation.
+
+    Blobs are decoded once into long-format columns, then every check runs
+    as a vectorized operation over all players' rows at once: types, tier
+    codes, place parsing, date formats and ranges, duplicate events and
+    rating bounds (see CHECKS).
+
+    Args:
+        df: Scraped DataFrame with 'pdga_number', 'stats_data', 'ratings_data'
+            and optionally 'Player' and 'rating_current'
+        stats_years: Years whose results pages were scraped
+        today: Latest plausible round date (defaults to now)
+        tiers: Tier codes the scraper kept (None skips the tier check)
+
+    Returns:
+        Tuple of (clean DataFrame, quarantined DataFrame, issues DataFrame with
+        one row per player and check: 'pdga_number', 'Player', 'check',
+        'severity', 'count' and 'example')
+    """
+    today = pd.Timestamp.now().normalize() if today is None else pd.Timestamp(today)
+    df = df.reset_index(drop=True)
+    frames = []
+
+    pdga = pd.to_numeric(df['pdga_number'], errors='coerce')
+    frames.append(_player_issues(pdga.isna() | (pdga <= 0) | (pdga % 1 != 0),
+                                 'invalid_pdga_number', df['pdga_number']))
+    frames.append(_player_issues(pdga.notna() & pdga.duplicated(), 'duplicate_player', df['pdga_number']))
+
+    if 'rating_current' in df.columns:
+        current = pd.to_numeric(df['rating_current'], errors='coerce')
+        frames.append(_player_issues(current.isna(), 'rating_current_missing'))
+        frames.append(_player_issues(
+            (current < RATING_BOUNDS[0]) | (current > RATING_BOUNDS[1]),
+            'rating_current_out_of_bounds', current
+        ))
+
+    # Tournament results
+    results, unparsed, malformed = _long(df['stats_data'].to_numpy(), STATS_COLUMNS)
+    n_results = np.bincount(results['player'], minlength=len(df))
+    frames.append(_player_issues(unparsed, 'unparsed_blob'))
+    frames.append(_player_issues(malformed, 'malformed_blob'))
+    frames.append(_player_issues(~unparsed & ~malformed & (n_results == 0), 'no_results'))
+
+    place = results['Place'].str.strip()
+    date = pd.to_datetime(results['Date'], format='%Y-%m-%d', errors='coerce')
+    if tiers is not None:
+        frames.append(_row_issues(results, ~results['Tier'].isin(tiers).fillna(False).to_numpy(dtype=bool),
+                                  'invalid_tier', 'Tier'))
+    frames.append(_row_issues(results, ~(place.str.isdigit() | place.isin(NON_NUMERIC_PLACES))
+                              .fillna(False).to_numpy(dtype=bool), 'unparsed_place', 'Place'))
+    frames.append(_row_issues(results, date.isna().to_numpy(), 'invalid_date', 'Date'))
+    frames.append(_row_issues(results, ((date < EARLIEST_DATE) | (date > today)).to_numpy(),
+                              'date_out_of_range', 'Date'))
+    frames.append(_row_issues(results, (date.notna() & ~date.dt.year.isin(list(stats_years))).to_numpy(),
+                              'result_outside_years', 'Date'))
+    frames.append(_row_issues(results, results.duplicated(['player', 'Tournament', 'Date']).to_numpy(),
+                              'duplicate_event', 'Tournament'))
+
+    # Round ratings
+    rounds, unparsed, malformed = _long(df['ratings_data'].to_numpy(), RATINGS_COLUMNS)
+    n_rounds = np.bincount(rounds['player'], minlength=len(df))
+    frames.append(_player_issues(unparsed, 'unparsed_blob'))
+    frames.append(_player_issues(malformed, 'malformed_blob'))
+    frames.append(_player_issues(~unparsed & ~malformed & (n_rounds == 0), 'no_ratings'))
+
+    rating = pd.to_numeric(rounds['Rating'], errors='coerce')
+    date = pd.to_datetime(rounds['Date'], format='%Y-%m-%d', errors='coerce')
+    if tiers is not None:
+        frames.append(_row_issues(rounds, ~rounds['Tier'].isin(tiers).fillna(False).to_numpy(dtype=bool),
+                                  'invalid_tier', 'Tier'))
+    frames.append(_row_issues(rounds, rating.isna().to_numpy(), 'unparsed_rating', 'Rating'))
+    frames.append(_row_issues(rounds, ((rating < RATING_BOUNDS[0]) | (rating > RATING_BOUNDS[1])).to_numpy(),
+                              'rating_out_of_bounds', 'Rating'))
+    frames.append(_row_issues(rounds, date.isna().to_numpy(), 'invalid_date', 'Date'))
+    frames.append(_row_issues(rounds, ((date < EARLIEST_DATE) | (date > today)).to_numpy(),
+                              'date_out_of_range', 'Date'))
+
+    issues = pd.concat([f for f in frames if len(f)], ignore_index=True) if any(len(f) for f in frames) \
+        else pd.DataFrame(columns=['player', 'check', 'count', 'example'])
+    issues = issues.groupby(['player', 'check'], as_index=False, sort=False).agg(
+        count=('count', 'sum'), example=('example', 'first')
+    )
+    player = issues['player'].to_numpy(dtype=np.intp)
+    issues.insert(0, 'pdga_number', df['pdga_number'].to_numpy()[player])
+    issues.insert(1, 'Player', df['Player'].to_numpy()[player] if 'Player' in df.columns else '')
+    issues['severity'] = issues['check'].map(lambda c: CHECKS[c][0])
+
+    bad = np.zeros(len(df), dtype=bool)
+    bad[player[(issues['severity'] == 'error').to_numpy()]] = True
+
+    issues = issues[ISSUE_COLUMNS].sort_values(['severity', 'check', 'pdga_number'], ignore_index=True)
+    return df[~bad].reset_index(drop=True), df[bad].reset_index(drop=True), issues
+
+def summarize(issues, n_players):
+    """
+    Per-check summary of validation issues.
+
+    Returns:
+        DataFrame with 'check', 'severity', 'players', 'rows', 'pct_players'
+        and 'description', one row per check that fired
+    """
+    summary = (issues.groupby(['check', 'severity'], as_index=False)
+               .agg(players=('pdga_number', 'nunique'), rows=('count', 'sum')))
+    summary['pct_players'] = np.round(100 * summary['players'] / max(n_players, 1), 1)
+    summary['description'] = summary['check'].map(lambda c: CHECKS[c][1])
+    return summary.sort_values(['severity', 'players'], ascending=[True, False], ignore_index=True)
+
+def report_paths(output):
+    """Issue report and quarantine list paths next to an output CSV, or inside an output directory."""
+    if os.path.isdir(output):
+        base = os.path.join(output, 'validation')
+    else:
+        base = os.path.splitext(output)[0]
+    return f'{base}.issues.csv', f'{base}.quarantine.csv'
+
+def write_report(output, issues, quarantined):
+    """
+    Write the issue report and the quarantine list.
+
+    The quarantine list has the input CSV's 'Player' and 'pdga_number'
+    columns, so it can be passed straight back to the scraper to re-scrape
+    only those players.
+
+    Returns:
+        Tuple of (issues path, quarantine path)
+    """
+    issues_path, quarantine_path = report_paths(output)
+    issues.to_csv(issues_path, index=False)
+    columns = [c for c in ['Player', 'pdga_number'] if c in quarantined.columns]
+    quarantined[columns].to_csv(quarantine_path, index=False)
+    return issues_path, quarantine_path
+
+def check_quarantined(n_quarantined, n_players, max_share=MAX_QUARANTINED_SHARE):
+    """
+    Fail when validation quarantined more than max_share of the players.
+
+    A quarantine that large points at a broken scrape or wrong --years rather
+    than at bad players, and computing features for what is left would
+    silently produce a near-empty dataset.
+    """
+    if n_players and n_quarantined > max_share * n_players:
+        raise ValueError(
+            f"Validation quarantined {n_quarantined} of {n_players} players "
+            f"(more than {max_share:.0%}); check the issue report, or rerun with --skip-validation"
+        )
+
+def run_validation(df, stats_years, output=None, tiers=SCRAPED_TIERS, max_quarantined=MAX_QUARANTINED_SHARE):
+    """
+    Validate scraped rows as a pipeline stage, recording counts in the run report.
+
+    Args:
+        df: Scraped DataFrame
+        stats_years: Years whose results pages were scraped
+        output: Optional output path to write the issue report and quarantine list next to
+        tiers: Tier codes the scraper kept (None skips the tier check)
+        max_quarantined: Largest share of players that may be quarantined (see
+            check_quarantined); None skips the check
+
+    Returns:
+        Tuple of (clean DataFrame, quarantined DataFrame, issues DataFrame)
+    """
+    with instrumentation.stage('validate'):
+        clean, quarantined, issues = validate_scraped(df, stats_years, tiers=tiers)
+    instrumentation.count('players_validated', len(df))
+    instrumentation.count('players_quarantined', len(quarantined))
+    instrumentation.count('validation_warnings', int((issues['severity'] == 'warning').sum()))
+
+    summary = summarize(issues, len(df))
+    instrumentation.get_report().info.setdefault('validation', []).extend(
+        summary.drop(columns='description').to_dict(orient='records')
+    )
+    print(f"Validated {len(df)} players: {len(quarantined)} quarantined, "
+          f"{len(issues)} issues across {summary['check'].nunique()} checks")
+    if output is not None:
+        issues_path, quarantine_path = write_report(output, issues, quarantined)
+        print(f"Validation issues saved to {issues_path}, quarantined players to {quarantine_path}")
+    if max_quarantined is not None:
+        check_quarantined(len(quarantined), len(df), max_quarantined)
+    return clean, quarantined, issues
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate scraped player data before feature computation')
+    parser.add_argument('scraped_csv', help='Scraped player data, e.g. data/scraped_temp.csv')
+    parser.add_argument('--years', nargs='+', type=int, required=True,
+                      help='Years whose results pages were scraped')
+    parser.add_argument('--output', type=str,
+                      help='Write the clean rows to this CSV (the report and quarantine '
+                           'list are written next to it)')
+
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.scraped_csv)
+    clean, quarantined, issues = validate_scraped(df, args.years)
+
+    print(f"{len(clean)} clean and {len(quarantined)} quarantined of {len(df)} players")
+    if len(quarantined) > MAX_QUARANTINED_SHARE * len(df):
+        print(f"WARNING: more than {MAX_QUARANTINED_SHARE:.0%} of players quarantined; "
+              f"the dataset pipeline would stop here")
+    if len(issues):
+        print(summarize(issues, len(df)).to_string(index=False))
+    if args.output:
+        clean.to_csv(args.output, index=False)
+        issues_path, quarantine_path = write_report(args.output, issues, quarantined)
+        print(f"Clean rows saved to {args.output}")
+        print(f"Issues saved to {issues_path}, quarantined players to {quarantine_path}")
+
+if __name__ == '__main__':
+    main()